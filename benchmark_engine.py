@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""Benchmark the batch evaluation engine against per-room evaluation.
+
+Builds a synthetic house (fil pilote rooms with and without hysteresis,
+bathrooms, corridors, thermostats, windows, schedules, setpoint inputs,
+external control...), drives it through the same seeded sequence of state
+changes with both evaluation engines and a virtual clock, checks that both
+produce the same service calls and the same mode / priority / hysteresis
+decisions for every room at every tick, and reports the time per refresh.
+
+Usage:
+    python3 benchmark_engine.py
+    python3 benchmark_engine.py --rooms 2000 --ticks 500 --seed 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent / "custom_components"))
+
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.core import Context, HomeAssistant, ServiceCall  # noqa: E402
+from homeassistant.util import dt as dt_util  # noqa: E402
+from smart_room_manager.batch_engine import BatchEvaluator  # noqa: E402
+from smart_room_manager.clock import VirtualClock  # noqa: E402
+from smart_room_manager.const import (  # noqa: E402
+    CONF_ALARM_ENTITY,
+    CONF_EVALUATION_ENGINE,
+    CONF_SEASON_CALENDAR,
+    CONF_VMC_ENTITY,
+    DOMAIN,
+    ENGINE_BATCH,
+    ENGINE_PER_ROOM,
+    UPDATE_INTERVAL,
+)
+from smart_room_manager.coordinator import SmartRoomCoordinator  # noqa: E402
+
+START = datetime(2026, 1, 12, 5, 0, tzinfo=timezone.utc)
+FIL_PILOTE_PRESETS = ["comfort", "eco", "away", "none"]
+
+
+def build_rooms(count: int, rng: random.Random) -> list[dict[str, Any]]:
+    """Generate a varied set of room configurations."""
+    rooms = []
+    for index in range(count):
+        room_id = f"room_{index}"
+        kind = rng.random()
+        room: dict[str, Any] = {
+            "room_id": room_id,
+            "room_name": f"Room {index}",
+            "room_type": "normal",
+            "door_window_sensors": [f"binary_sensor.window_{index}"],
+            "lights": [f"light.room_{index}"],
+            "climate_entity": f"climate.room_{index}",
+            "climate_mode": "fil_pilote",
+        }
+        if kind < 0.1:
+            room["room_type"] = "bathroom"
+        elif kind < 0.2:
+            room["room_type"] = "corridor"
+            room["climate_mode"] = "none"
+            room.pop("climate_entity")
+        elif kind < 0.25:
+            room["climate_mode"] = "thermostat_heat"
+
+        if rng.random() < 0.6:
+            room["temperature_sensor"] = f"sensor.temperature_{index}"
+            if rng.random() < 0.3:
+                room["temperature_smoothing"] = rng.choice([5, 10])
+        if rng.random() < 0.1:
+            room["setpoint_input"] = f"input_number.setpoint_{index}"
+        if rng.random() < 0.3:
+            room["schedule_entity"] = f"calendar.schedule_{index}"
+            room["preset_schedule_on"] = rng.choice(["comfort", "night"])
+        if rng.random() < 0.2:
+            room["comfort_time_ranges"] = [{"start": "06:30", "end": "08:00"}]
+        if rng.random() < 0.05:
+            room["external_control_switch"] = f"switch.external_{index}"
+        if rng.random() < 0.05:
+            room["climate_bypass_switch"] = f"input_boolean.bypass_{index}"
+        if rng.random() < 0.2:
+            room["window_delay_open"] = rng.choice([0, 1, 5])
+            room["window_delay_close"] = rng.choice([0, 1, 5])
+        rooms.append(room)
+    return rooms
+
+
+class Simulation:
+    """One Home Assistant core + coordinator driven by a virtual clock."""
+
+    def __init__(self, engine: str, rooms: list[dict[str, Any]]) -> None:
+        """Initialize the simulation."""
+        self.engine = engine
+        self.rooms = rooms
+        self.clock = VirtualClock(START)
+        self.calls: list[tuple[str, str, str, Any]] = []
+        self.hass: HomeAssistant | None = None
+        self.coordinator: SmartRoomCoordinator | None = None
+
+    def set_state(
+        self, entity_id: str, state: str, attributes: dict | None = None
+    ) -> None:
+        """Set a state timestamped with the virtual clock."""
+        self.hass.states.async_set(entity_id, state, attributes, context=Context())
+
+    async def _async_handle_service(self, call: ServiceCall) -> None:
+        """Record a call and reflect it into the simulated device."""
+        entity_id = call.data["entity_id"]
+        self.calls.append(
+            (
+                self.clock.utcnow().isoformat(),
+                call.service,
+                entity_id,
+                call.data.get("preset_mode") or call.data.get("temperature"),
+            )
+        )
+        state = self.hass.states.get(entity_id)
+        attributes = dict(state.attributes) if state else {}
+        current = state.state if state else "off"
+        if call.service == "set_preset_mode":
+            attributes["preset_mode"] = call.data["preset_mode"]
+        elif call.service == "set_hvac_mode":
+            current = str(call.data["hvac_mode"])
+        elif call.service == "set_temperature":
+            attributes["temperature"] = call.data["temperature"]
+        elif call.service in ("turn_on", "turn_off"):
+            current = "on" if call.service == "turn_on" else "off"
+        self.set_state(entity_id, current, attributes)
+
+    async def async_setup(self) -> None:
+        """Create the core, the simulated devices and the coordinator."""
+        self.hass = HomeAssistant(tempfile.mkdtemp(prefix="srm_bench_"))
+        for domain, services in {
+            "climate": ["set_preset_mode", "set_hvac_mode", "set_temperature"],
+            "light": ["turn_on", "turn_off"],
+            "switch": ["turn_on", "turn_off"],
+        }.items():
+            for service in services:
+                self.hass.services.async_register(
+                    domain, service, self._async_handle_service
+                )
+
+        self.set_state("alarm_control_panel.home", "disarmed")
+        self.set_state("calendar.season", "off")
+        for room in self.rooms:
+            index = room["room_id"].split("_")[1]
+            if "climate_entity" in room:
+                self.set_state(
+                    room["climate_entity"],
+                    "heat",
+                    {"preset_modes": FIL_PILOTE_PRESETS, "preset_mode": "eco"},
+                )
+            self.set_state(f"binary_sensor.window_{index}", "off")
+            self.set_state(f"light.room_{index}", "off")
+            self.set_state(f"sensor.temperature_{index}", "19.0")
+            self.set_state(f"input_number.setpoint_{index}", "19.5")
+            self.set_state(f"calendar.schedule_{index}", "off")
+            self.set_state(f"switch.external_{index}", "off")
+            self.set_state(f"input_boolean.bypass_{index}", "off")
+
+        entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="Benchmark",
+            data={
+                CONF_ALARM_ENTITY: "alarm_control_panel.home",
+                CONF_SEASON_CALENDAR: "calendar.season",
+                CONF_VMC_ENTITY: "switch.vmc",
+                CONF_EVALUATION_ENGINE: self.engine,
+            },
+            source="user",
+            options={"rooms": self.rooms},
+            entry_id=self.engine,
+        )
+        self.coordinator = SmartRoomCoordinator(self.hass, entry, clock=self.clock)
+        # Event-driven helpers (window trackers, light timers, VMC)
+        await self.coordinator.async_setup()
+
+    def mutate(self, rng: random.Random) -> None:
+        """Apply a random batch of state changes (same for both engines)."""
+        count = len(self.rooms)
+        for _ in range(max(1, count // 50)):
+            index = rng.randrange(count)
+            change = rng.random()
+            if change < 0.25:
+                value = f"{rng.uniform(16.0, 22.0):.1f}"
+                if rng.random() < 0.02:
+                    value = "unavailable"
+                self.set_state(f"sensor.temperature_{index}", value)
+            elif change < 0.4:
+                self.set_state(
+                    f"binary_sensor.window_{index}", rng.choice(["on", "off"])
+                )
+            elif change < 0.6:
+                self.set_state(f"light.room_{index}", rng.choice(["on", "off"]))
+            elif change < 0.7:
+                self.set_state(f"calendar.schedule_{index}", rng.choice(["on", "off"]))
+            elif change < 0.75:
+                self.set_state(
+                    f"input_number.setpoint_{index}", f"{rng.uniform(15, 25):.1f}"
+                )
+            elif change < 0.8:
+                self.set_state(f"switch.external_{index}", rng.choice(["on", "off"]))
+            elif change < 0.83:
+                self.set_state(
+                    f"input_boolean.bypass_{index}", rng.choice(["on", "off"])
+                )
+            elif change < 0.85:
+                # Preset changed by hand on the device
+                entity_id = f"climate.room_{index}"
+                state = self.hass.states.get(entity_id)
+                if state:
+                    self.set_state(
+                        entity_id,
+                        state.state,
+                        {
+                            **state.attributes,
+                            "preset_mode": rng.choice(FIL_PILOTE_PRESETS),
+                        },
+                    )
+        if rng.random() < 0.01:
+            self.set_state(
+                "alarm_control_panel.home", rng.choice(["disarmed", "armed_away"])
+            )
+        if rng.random() < 0.005:
+            self.set_state("calendar.season", rng.choice(["on", "off"]))
+
+    def decisions(self, data: dict[str, Any]) -> list[tuple]:
+        """Extract the decisions to compare from the coordinator data."""
+        return [
+            (
+                room_id,
+                room["current_mode"],
+                room["climate_state"]["current_priority"],
+                room["climate_state"].get("hysteresis_state"),
+                room["windows_open"],
+            )
+            for room_id, room in sorted(data.items())
+        ]
+
+
+async def async_run(
+    engine: str, rooms: list[dict[str, Any]], ticks: int, seed: int
+) -> tuple[list, list, list[float], int]:
+    """Run a simulation, returning calls, decisions and refresh timings."""
+    simulation = Simulation(engine, rooms)
+    with patch.object(dt_util, "utcnow", simulation.clock.utcnow):
+        await simulation.async_setup()
+        rng = random.Random(seed)
+        decisions = []
+        timings = []
+        evaluated = 0
+        for _ in range(ticks):
+            simulation.mutate(rng)
+            # Let the event listeners see the changes before time moves on
+            await simulation.hass.async_block_till_done()
+            await simulation.clock.async_advance(timedelta(seconds=UPDATE_INTERVAL))
+            start = time.perf_counter()
+            data = await simulation.coordinator._async_update_data()
+            timings.append(time.perf_counter() - start)
+            decisions.append(simulation.decisions(data))
+            batch = simulation.coordinator.batch_evaluator
+            if batch is not None:
+                evaluated += batch.last_evaluated
+        await simulation.hass.async_stop(force=True)
+    return simulation.calls, decisions, timings, evaluated
+
+
+def summarize(timings: list[float]) -> str:
+    """Format refresh timings (first tick excluded: layout build)."""
+    steady = sorted(timings[1:]) or timings
+    average = sum(steady) / len(steady)
+    p95 = steady[int(len(steady) * 0.95) - 1]
+    return f"avg {average * 1000:.2f} ms, p95 {p95 * 1000:.2f} ms per refresh"
+
+
+async def async_main(args: argparse.Namespace) -> int:
+    """Run both engines and compare them."""
+    rooms = build_rooms(args.rooms, random.Random(args.seed))
+
+    calls_ref, decisions_ref, timings_ref, _ = await async_run(
+        ENGINE_PER_ROOM, rooms, args.ticks, args.seed
+    )
+    calls_batch, decisions_batch, timings_batch, evaluated = await async_run(
+        ENGINE_BATCH, rooms, args.ticks, args.seed
+    )
+
+    print(f"🏠 {args.rooms} rooms, {args.ticks} ticks (seed {args.seed})")
+    print(f"   per_room: {summarize(timings_ref)}")
+    print(f"   batch:    {summarize(timings_batch)}")
+    print(
+        f"   batch re-evaluated {evaluated / args.ticks:.0f} rooms per tick on average"
+    )
+
+    identical = True
+    if calls_ref != calls_batch:
+        identical = False
+        print(f"❌ Service calls differ ({len(calls_ref)} vs {len(calls_batch)})")
+        for ref, batch in zip(calls_ref, calls_batch):
+            if ref != batch:
+                print(f"   first difference: {ref} != {batch}")
+                break
+    for tick, (ref, batch) in enumerate(zip(decisions_ref, decisions_batch)):
+        if ref != batch:
+            identical = False
+            diff = next(r for r, b in zip(ref, batch) if r != b)
+            other = next(b for r, b in zip(ref, batch) if r != b)
+            print(f"❌ Decisions differ at tick {tick}: {diff} != {other}")
+            break
+
+    if identical:
+        print(f"✅ Identical decisions and service calls ({len(calls_ref)} calls)")
+    return 0 if identical else 1
+
+
+def main() -> None:
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rooms", type=int, default=1000, help="Number of rooms")
+    parser.add_argument("--ticks", type=int, default=200, help="Refresh cycles")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    args = parser.parse_args()
+
+    if not BatchEvaluator.available():
+        raise SystemExit("❌ numpy is required for the batch evaluation engine")
+
+    logging.basicConfig(level=logging.ERROR)
+    sys.exit(asyncio.run(async_main(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,39 @@
 from __future__ import annotations
 
 import logging
+from datetime import timedelta
 
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
-
-from .const import CONF_ROOM_ID, CONF_ROOMS, DOMAIN, VERSION
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_ROOM_ID,
+    CONF_ROOMS,
+    DEFAULT_PROFILE_CYCLES,
+    DOMAIN,
+    MODE_COMFORT,
+    MODE_ECO,
+    MODE_FROST_PROTECTION,
+    MODE_NIGHT,
+    PROFILE_ENGINE_CPROFILE,
+    PROFILE_ENGINE_YAPPI,
+    PROFILE_FORMAT_CALLGRIND,
+    PROFILE_FORMAT_PSTATS,
+    SERVICE_CANCEL_ROOM_MODE,
+    SERVICE_FORCE_GROUP_MODE,
+    SERVICE_PAUSE_GROUP,
+    SERVICE_PROFILE,
+    SERVICE_RESUME_GROUP,
+    SERVICE_SET_ROOM_MODE,
+    VERSION,
+)
 from .coordinator import SmartRoomCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -21,6 +46,64 @@ PLATFORMS: list[Platform] = [
     Platform.SWITCH,
 ]
 
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("cycles", default=DEFAULT_PROFILE_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1000)
+        ),
+        vol.Optional("duration"): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=86400)
+        ),
+        vol.Optional("engine", default=PROFILE_ENGINE_CPROFILE): vol.In(
+            [PROFILE_ENGINE_CPROFILE, PROFILE_ENGINE_YAPPI]
+        ),
+        vol.Optional("output_format", default=PROFILE_FORMAT_PSTATS): vol.In(
+            [PROFILE_FORMAT_PSTATS, PROFILE_FORMAT_CALLGRIND]
+        ),
+    }
+)
+
+GROUP_SCHEMA = vol.Schema({vol.Required("group"): cv.string})
+
+PAUSE_GROUP_SCHEMA = GROUP_SCHEMA.extend(
+    {
+        vol.Optional("duration"): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+    }
+)
+
+MODES = [MODE_COMFORT, MODE_ECO, MODE_NIGHT, MODE_FROST_PROTECTION]
+
+FORCE_GROUP_MODE_SCHEMA = GROUP_SCHEMA.extend(
+    {
+        vol.Required("mode"): vol.In(MODES),
+        vol.Required("duration"): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+    }
+)
+
+ROOMS_SCHEMA = {
+    vol.Optional("rooms"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("group"): cv.string,
+}
+
+SET_ROOM_MODE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **ROOMS_SCHEMA,
+            vol.Required("mode"): vol.In(MODES),
+            vol.Exclusive("duration", "expiry"): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=10080)
+            ),
+            vol.Exclusive("until", "expiry"): cv.datetime,
+        }
+    ),
+    cv.has_at_least_one_key("rooms", "group"),
+    cv.has_at_least_one_key("duration", "until"),
+)
+
+CANCEL_ROOM_MODE_SCHEMA = vol.All(
+    vol.Schema(ROOMS_SCHEMA), cv.has_at_least_one_key("rooms", "group")
+)
+
 
 def _clean_none_values_from_config(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Clean None values from room configurations (migration from v0.2.1).
@@ -148,6 +231,8 @@ async def async_cleanup_orphaned_entities(
     configured_room_ids = {
         room.get(CONF_ROOM_ID) for room in rooms if room.get(CONF_ROOM_ID)
     }
+    # House-level device and entities (heat demand) use the entry_id as id
+    configured_room_ids.add(entry.entry_id)
 
     # Find all entities belonging to this integration
     entities_to_remove = []
@@ -252,8 +337,82 @@ def register_services(hass: HomeAssistant, entry: ConfigEntry) -> None:
             },
         )
 
+    async def handle_profile(call: ServiceCall) -> None:
+        """Handle the profile service call (profile the next refresh cycles)."""
+        coordinator: SmartRoomCoordinator = hass.data[DOMAIN][entry.entry_id]
+        coordinator.profiler.async_start(
+            cycles=call.data.get("cycles"),
+            duration=call.data.get("duration"),
+            engine=call.data["engine"],
+            output_format=call.data["output_format"],
+        )
+
+    def group_rooms(call: ServiceCall) -> tuple[SmartRoomCoordinator, list[str]]:
+        """Return the coordinator and the rooms of the group of a call."""
+        coordinator: SmartRoomCoordinator = hass.data[DOMAIN][entry.entry_id]
+        room_ids = coordinator.get_group_room_ids(call.data["group"])
+        if not room_ids:
+            raise HomeAssistantError(f"No room in group {call.data['group']}")
+        return coordinator, room_ids
+
+    async def handle_pause_group(call: ServiceCall) -> None:
+        """Handle the pause_group service call (pause every room of a group)."""
+        coordinator, room_ids = group_rooms(call)
+        await coordinator.async_pause_rooms(room_ids, call.data.get("duration"))
+
+    async def handle_resume_group(call: ServiceCall) -> None:
+        """Handle the resume_group service call (end pause and forced mode)."""
+        coordinator, room_ids = group_rooms(call)
+        await coordinator.async_resume_rooms(room_ids)
+
+    async def handle_force_group_mode(call: ServiceCall) -> None:
+        """Handle the force_group_mode service call (mode for N minutes)."""
+        coordinator, room_ids = group_rooms(call)
+        until = coordinator.clock.now() + timedelta(minutes=call.data["duration"])
+        await coordinator.async_force_mode(room_ids, call.data["mode"], until)
+
+    def target_rooms(call: ServiceCall) -> tuple[SmartRoomCoordinator, list[str]]:
+        """Return the coordinator and the rooms (ids/names and group) of a call."""
+        coordinator: SmartRoomCoordinator = hass.data[DOMAIN][entry.entry_id]
+        room_ids = coordinator.resolve_room_ids(call.data.get("rooms") or [])
+        if "group" in call.data:
+            _coordinator, group_ids = group_rooms(call)
+            room_ids += [room_id for room_id in group_ids if room_id not in room_ids]
+        return coordinator, room_ids
+
+    async def handle_set_room_mode(call: ServiceCall) -> None:
+        """Handle the set_room_mode service call (mode until an expiry)."""
+        coordinator, room_ids = target_rooms(call)
+        if "until" in call.data:
+            until = dt_util.as_utc(call.data["until"])
+        else:
+            until = coordinator.clock.now() + timedelta(minutes=call.data["duration"])
+        if until <= coordinator.clock.now():
+            raise HomeAssistantError(f"Override expiry {until} is in the past")
+        await coordinator.async_force_mode(room_ids, call.data["mode"], until)
+
+    async def handle_cancel_room_mode(call: ServiceCall) -> None:
+        """Handle the cancel_room_mode service call."""
+        coordinator, room_ids = target_rooms(call)
+        await coordinator.async_cancel_mode(room_ids)
+
     # Register the service if not already registered
     if not hass.services.has_service(DOMAIN, "cleanup_entities"):
         hass.services.async_register(
             DOMAIN, "cleanup_entities", handle_cleanup_entities
         )
+
+    if not hass.services.has_service(DOMAIN, SERVICE_PROFILE):
+        hass.services.async_register(
+            DOMAIN, SERVICE_PROFILE, handle_profile, schema=PROFILE_SCHEMA
+        )
+
+    for service, handler, schema in (
+        (SERVICE_PAUSE_GROUP, handle_pause_group, PAUSE_GROUP_SCHEMA),
+        (SERVICE_RESUME_GROUP, handle_resume_group, GROUP_SCHEMA),
+        (SERVICE_FORCE_GROUP_MODE, handle_force_group_mode, FORCE_GROUP_MODE_SCHEMA),
+        (SERVICE_SET_ROOM_MODE, handle_set_room_mode, SET_ROOM_MODE_SCHEMA),
+        (SERVICE_CANCEL_ROOM_MODE, handle_cancel_room_mode, CANCEL_ROOM_MODE_SCHEMA),
+    ):
+        if not hass.services.has_service(DOMAIN, service):
+            hass.services.async_register(DOMAIN, service, handler, schema=schema)
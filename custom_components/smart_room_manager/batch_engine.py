@@ -0,0 +1,912 @@
+"""Vectorised batch evaluation engine for Smart Room Manager."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.climate import ATTR_PRESET_MODE
+from homeassistant.const import STATE_ON
+from homeassistant.util import dt as dt_util
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional (batch evaluation engine only)
+    np = None
+
+from .const import (
+    ALARM_STATE_ARMED_AWAY,
+    CLIMATE_TYPE_FIL_PILOTE,
+    CONF_ALARM_ENTITY,
+    CONF_ALLOW_EXTERNAL_IN_AWAY,
+    CONF_CLIMATE_BYPASS_SWITCH,
+    CONF_CLIMATE_ENTITY,
+    CONF_CLIMATE_WINDOW_CHECK,
+    CONF_COMFORT_TIME_RANGES,
+    CONF_EXTERNAL_CONTROL_SWITCH,
+    CONF_HYSTERESIS,
+    CONF_IGNORE_IN_AWAY,
+    CONF_LIGHTS,
+    CONF_MAX_SETPOINT,
+    CONF_MIN_SETPOINT,
+    CONF_NIGHT_START,
+    CONF_PRESET_AWAY,
+    CONF_PRESET_COMFORT,
+    CONF_PRESET_ECO,
+    CONF_PRESET_HEAT,
+    CONF_PRESET_IDLE,
+    CONF_PRESET_NIGHT,
+    CONF_PRESET_SCHEDULE_OFF,
+    CONF_PRESET_SCHEDULE_ON,
+    CONF_PRESET_WINDOW,
+    CONF_SCHEDULE_ENTITY,
+    CONF_SEASON_CALENDAR,
+    CONF_SETPOINT_INPUT,
+    CONF_SOLAR_BOOST,
+    CONF_SUMMER_POLICY,
+    CONF_TEMP_COMFORT,
+    CONF_TEMP_ECO,
+    CONF_TEMP_NIGHT,
+    CONF_TEMPERATURE_SENSOR,
+    DEFAULT_ALLOW_EXTERNAL_IN_AWAY,
+    DEFAULT_DAY_START,
+    DEFAULT_HYSTERESIS,
+    DEFAULT_MAX_SETPOINT,
+    DEFAULT_MIN_SETPOINT,
+    DEFAULT_NIGHT_START,
+    DEFAULT_PRESET_AWAY,
+    DEFAULT_PRESET_COMFORT,
+    DEFAULT_PRESET_ECO,
+    DEFAULT_PRESET_HEAT,
+    DEFAULT_PRESET_IDLE,
+    DEFAULT_PRESET_NIGHT,
+    DEFAULT_PRESET_WINDOW,
+    DEFAULT_SUMMER_POLICY,
+    DEFAULT_TEMP_COMFORT,
+    DEFAULT_TEMP_ECO,
+    DEFAULT_TEMP_NIGHT,
+    FP_PRESET_AWAY,
+    FP_PRESET_ECO,
+    FP_PRESET_OFF,
+    HYSTERESIS_DEADBAND,
+    HYSTERESIS_HEATING,
+    HYSTERESIS_IDLE,
+    MODE_COMFORT,
+    MODE_ECO,
+    MODE_FROST_PROTECTION,
+    MODE_NIGHT,
+    PRIORITY_AWAY,
+    PRIORITY_BYPASS,
+    PRIORITY_EXTERNAL_CONTROL,
+    PRIORITY_NORMAL,
+    PRIORITY_OVERRIDE,
+    PRIORITY_PAUSED,
+    PRIORITY_SCHEDULE,
+    PRIORITY_VACANT,
+    PRIORITY_WINDOWS_OPEN,
+    ROOM_TYPE_BATHROOM,
+    ROOM_TYPE_CORRIDOR,
+    TEMPERATURE_TREND_THRESHOLD,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import SmartRoomCoordinator
+    from .room_manager import RoomManager
+
+_LOGGER = logging.getLogger(__name__)
+
+# Every room is still re-evaluated by its own controllers at least once per
+# this many ticks (a rolling slice of the rooms each tick, no burst), which
+# refreshes diagnostics such as the measured temperature
+FULL_REFRESH_TICKS = 10
+
+# Integer codes used in the column arrays (index in these tuples)
+MODES = (MODE_COMFORT, MODE_ECO, MODE_NIGHT, MODE_FROST_PROTECTION)
+PRIORITIES = (
+    PRIORITY_NORMAL,
+    PRIORITY_PAUSED,
+    PRIORITY_BYPASS,
+    PRIORITY_WINDOWS_OPEN,
+    PRIORITY_EXTERNAL_CONTROL,
+    PRIORITY_AWAY,
+    PRIORITY_SCHEDULE,
+    PRIORITY_OVERRIDE,
+    PRIORITY_VACANT,
+)
+HYSTERESIS_STATES = (HYSTERESIS_DEADBAND, HYSTERESIS_HEATING, HYSTERESIS_IDLE)
+UNKNOWN = -1
+
+FLOAT_COLUMNS = (
+    "night_start",
+    "min_setpoint",
+    "max_setpoint",
+    "temp_comfort",
+    "temp_eco",
+    "temp_night",
+    "hysteresis",
+)
+
+COMFORT, ECO, NIGHT, FROST = range(4)
+(
+    P_NORMAL,
+    P_PAUSED,
+    P_BYPASS,
+    P_WINDOWS_OPEN,
+    P_EXTERNAL,
+    P_AWAY,
+    P_SCHEDULE,
+    P_OVERRIDE,
+    P_VACANT,
+) = range(9)
+H_DEADBAND, H_HEATING, H_IDLE = range(3)
+
+# Climate actions decided for a room
+ACTION_NONE, ACTION_APPLY, ACTION_FROST_WINDOW, ACTION_FROST_AWAY, ACTION_EXTERNAL = (
+    range(5)
+)
+
+
+def _code(values: tuple[str, ...], value: Any) -> int:
+    """Return the integer code of a value (UNKNOWN if not in values)."""
+    try:
+        return values.index(value)
+    except ValueError:
+        return UNKNOWN
+
+
+def _seconds_of_day(value: Any) -> float:
+    """Convert a time string to seconds since midnight (NaN if invalid)."""
+    try:
+        parsed = dt_util.parse_time(value)
+    except (AttributeError, TypeError, ValueError):
+        parsed = None
+    if parsed is None:
+        return float("nan")
+    return (
+        parsed.hour * 3600
+        + parsed.minute * 60
+        + parsed.second
+        + parsed.microsecond / 1_000_000
+    )
+
+
+class BatchEvaluator:
+    """Evaluate all rooms as column arrays in one vectorised pass.
+
+    Inputs of every room (window/light flags, delay timestamps, schedule,
+    setpoints, temperatures, hysteresis thresholds...) are laid out as numpy
+    arrays and the mode, climate priority and hysteresis decisions of the
+    room rules (rules.RULES) and ClimateController are computed for all
+    rooms at once. Only rooms whose outcome changed, or that
+    need a command, a light/VMC timer or an input the batch pass does not
+    model (thermostats, external control, invalid sensor values...), are
+    handed to their own RoomManager, which takes the actual decision and
+    sends the commands. The other rooms keep their previous state.
+    """
+
+    def __init__(self, coordinator: SmartRoomCoordinator) -> None:
+        """Initialize the evaluator."""
+        self.coordinator = coordinator
+        self.hass = coordinator.hass
+
+        self._room_ids: list[str] = []
+        self._room_index: dict[str, int] = {}
+        self._static: dict[str, Any] = {}
+        self._previous: dict[str, Any] = {}
+        self._data: dict[str, dict[str, Any]] = {}
+        self._preset_codes: dict[Any, int] = {None: UNKNOWN}
+        self._alarm_state: str | None = None
+        self._ticks = 0
+
+        # Number of rooms handed to their RoomManager on the last tick
+        self.last_evaluated = 0
+
+    @staticmethod
+    def available() -> bool:
+        """Return True if numpy is installed."""
+        return np is not None
+
+    def _preset_code(self, preset: Any) -> int:
+        """Return the integer code of a preset name."""
+        code = self._preset_codes.get(preset)
+        if code is None:
+            code = self._preset_codes[preset] = len(self._preset_codes)
+        return code
+
+    def _build_layout(self, rooms: list[RoomManager]) -> None:
+        """Build the static columns from the room configurations."""
+        self._room_ids = [room.room_id for room in rooms]
+        self._room_index = {
+            room_id: index for index, room_id in enumerate(self._room_ids)
+        }
+        self._data = {}
+        count = len(rooms)
+
+        static: dict[str, Any] = {
+            "lights": [],
+            "pause_switch": [],
+            "climate_entity": [],
+            "bypass": [],
+            "schedule": [],
+            "external": [],
+            "solar_boost": [],
+            "temperature_sensor": [],
+            "setpoint_input": [],
+            "timer_rooms": [],
+            "preheat_rooms": [],
+        }
+        columns: dict[str, list[Any]] = {
+            name: []
+            for name in (
+                "has_lights",
+                "bathroom",
+                "window_check",
+                "ignore_in_away",
+                "schedule_on_mode",
+                "schedule_off_mode",
+                "night_start",
+                "has_climate",
+                "fil_pilote",
+                "hysteresis_control",
+                "allow_external_in_away",
+                "min_setpoint",
+                "max_setpoint",
+                "temp_comfort",
+                "temp_eco",
+                "temp_night",
+                "hysteresis",
+                "preset_away",
+                "preset_window",
+                "preset_comfort",
+                "preset_night",
+                "preset_eco",
+                "preset_heat",
+                "preset_idle",
+                "preset_summer",
+                "static_fallback",
+            )
+        }
+        comfort_ranges: list[list[tuple[float, float]]] = []
+
+        for index, room in enumerate(rooms):
+            config = room.room_config
+            fallback = False
+
+            lights = config.get(CONF_LIGHTS) or []
+            static["lights"].append(lights)
+            static["pause_switch"].append(f"switch.smart_room_{room.room_id}_pause")
+            static["schedule"].append(config.get(CONF_SCHEDULE_ENTITY))
+            static["bypass"].append(config.get(CONF_CLIMATE_BYPASS_SWITCH))
+            static["external"].append(config.get(CONF_EXTERNAL_CONTROL_SWITCH))
+            static["solar_boost"].append(bool(config.get(CONF_SOLAR_BOOST)))
+            static["setpoint_input"].append(config.get(CONF_SETPOINT_INPUT))
+            static["temperature_sensor"].append(config.get(CONF_TEMPERATURE_SENSOR))
+            if room.room_type in (ROOM_TYPE_CORRIDOR, ROOM_TYPE_BATHROOM):
+                static["timer_rooms"].append(index)
+            if room.preheat.enabled:
+                static["preheat_rooms"].append(index)
+
+            columns["has_lights"].append(bool(lights))
+            columns["bathroom"].append(room.room_type == ROOM_TYPE_BATHROOM)
+            columns["window_check"].append(
+                bool(config.get(CONF_CLIMATE_WINDOW_CHECK, True))
+            )
+            columns["ignore_in_away"].append(
+                bool(config.get(CONF_IGNORE_IN_AWAY, False))
+            )
+
+            # Schedule modes outside the known modes are left to the room
+            on_mode = _code(MODES, config.get(CONF_PRESET_SCHEDULE_ON, MODE_COMFORT))
+            off_mode = _code(MODES, config.get(CONF_PRESET_SCHEDULE_OFF, MODE_ECO))
+            columns["schedule_on_mode"].append(on_mode)
+            columns["schedule_off_mode"].append(off_mode)
+            if static["schedule"][-1] and UNKNOWN in (on_mode, off_mode):
+                fallback = True
+
+            # Time strings are parsed once here instead of on every tick
+            night_start = _seconds_of_day(
+                config.get(CONF_NIGHT_START, DEFAULT_NIGHT_START)
+            )
+            columns["night_start"].append(night_start)
+            if night_start != night_start:  # NaN: invalid configuration
+                fallback = True
+
+            ranges = []
+            for time_range in config.get(CONF_COMFORT_TIME_RANGES) or []:
+                if not time_range.get("start") or not time_range.get("end"):
+                    continue
+                start = _seconds_of_day(time_range.get("start"))
+                end = _seconds_of_day(time_range.get("end"))
+                if start != start or end != end:
+                    # Invalid range: the room logs it on every evaluation
+                    fallback = True
+                    continue
+                ranges.append((start, end))
+            comfort_ranges.append(ranges)
+
+            # Climate
+            climate_entity = config.get(CONF_CLIMATE_ENTITY)
+            static["climate_entity"].append(climate_entity)
+            climate_controller = room.climate_controller
+            climate_type = climate_controller.climate_type
+            if climate_entity and climate_type is None:
+                climate_type = climate_controller._detect_climate_type(climate_entity)
+            fil_pilote = bool(climate_entity) and climate_type == (
+                CLIMATE_TYPE_FIL_PILOTE
+            )
+            if climate_entity and not fil_pilote:
+                # Thermostats are always evaluated by their own controller
+                fallback = True
+            columns["has_climate"].append(bool(climate_entity))
+            columns["fil_pilote"].append(fil_pilote)
+            columns["hysteresis_control"].append(
+                config.get(CONF_TEMPERATURE_SENSOR) is not None
+            )
+            columns["allow_external_in_away"].append(
+                bool(
+                    config.get(
+                        CONF_ALLOW_EXTERNAL_IN_AWAY, DEFAULT_ALLOW_EXTERNAL_IN_AWAY
+                    )
+                )
+            )
+            columns["min_setpoint"].append(
+                config.get(CONF_MIN_SETPOINT, DEFAULT_MIN_SETPOINT)
+            )
+            columns["max_setpoint"].append(
+                config.get(CONF_MAX_SETPOINT, DEFAULT_MAX_SETPOINT)
+            )
+            columns["temp_comfort"].append(
+                config.get(CONF_TEMP_COMFORT, DEFAULT_TEMP_COMFORT)
+            )
+            columns["temp_eco"].append(config.get(CONF_TEMP_ECO, DEFAULT_TEMP_ECO))
+            columns["temp_night"].append(
+                config.get(CONF_TEMP_NIGHT, DEFAULT_TEMP_NIGHT)
+            )
+            columns["hysteresis"].append(
+                config.get(CONF_HYSTERESIS, DEFAULT_HYSTERESIS)
+            )
+
+            for column, key, default in (
+                ("preset_away", CONF_PRESET_AWAY, DEFAULT_PRESET_AWAY),
+                ("preset_window", CONF_PRESET_WINDOW, DEFAULT_PRESET_WINDOW),
+                ("preset_comfort", CONF_PRESET_COMFORT, DEFAULT_PRESET_COMFORT),
+                ("preset_night", CONF_PRESET_NIGHT, DEFAULT_PRESET_NIGHT),
+                ("preset_eco", CONF_PRESET_ECO, DEFAULT_PRESET_ECO),
+                ("preset_heat", CONF_PRESET_HEAT, DEFAULT_PRESET_HEAT),
+                ("preset_idle", CONF_PRESET_IDLE, DEFAULT_PRESET_IDLE),
+            ):
+                columns[column].append(self._preset_code(config.get(key, default)))
+            summer_policy = config.get(CONF_SUMMER_POLICY, DEFAULT_SUMMER_POLICY)
+            columns["preset_summer"].append(
+                self._preset_code(
+                    FP_PRESET_ECO if summer_policy == "eco" else FP_PRESET_OFF
+                )
+            )
+            columns["static_fallback"].append(fallback)
+
+        for name, values in columns.items():
+            static[name] = np.array(
+                values, dtype=float if name in FLOAT_COLUMNS else None
+            )
+
+        # Comfort ranges as a (rooms x max ranges) matrix padded with NaN
+        width = max((len(ranges) for ranges in comfort_ranges), default=0)
+        starts = np.full((count, width), np.nan)
+        ends = np.full((count, width), np.nan)
+        for index, ranges in enumerate(comfort_ranges):
+            for position, (start, end) in enumerate(ranges):
+                starts[index, position] = start
+                ends[index, position] = end
+        static["comfort_starts"] = starts
+        static["comfort_ends"] = ends
+        static["day_start"] = _seconds_of_day(DEFAULT_DAY_START)
+        static["frost_preset"] = self._preset_code(FP_PRESET_AWAY)
+        static["timer_rooms"] = np.array(static["timer_rooms"], dtype=int)
+        static["preheat_rooms"] = np.array(static["preheat_rooms"], dtype=int)
+        self._static = static
+
+        # Dynamic state mirrored from the room objects
+        self._previous = {
+            "windows_open": np.array(
+                [room.window_tracker.windows_open for room in rooms]
+            ),
+        }
+        self._previous.update(self._read_back(rooms, np.arange(count), None))
+
+        _LOGGER.debug("Batch evaluation layout built for %d rooms", count)
+
+    def _read_back(
+        self,
+        rooms: list[RoomManager],
+        indices: Any,
+        previous: dict[str, Any] | None,
+    ) -> dict[str, Any]:
+        """Read the decisions of the room objects back into the columns."""
+        count = len(rooms)
+        if previous is None:
+            previous = {
+                "mode": np.full(count, UNKNOWN),
+                "priority": np.full(count, UNKNOWN),
+                "hysteresis_state": np.full(count, UNKNOWN),
+                "external_active": np.zeros(count, dtype=bool),
+            }
+        for index in indices:
+            room = rooms[index]
+            climate_controller = room.climate_controller
+            fil_pilote = climate_controller.fil_pilote
+            previous["mode"][index] = _code(MODES, room._current_mode)
+            previous["priority"][index] = _code(PRIORITIES, climate_controller.priority)
+            previous["hysteresis_state"][index] = (
+                _code(HYSTERESIS_STATES, fil_pilote.hysteresis_state)
+                if fil_pilote
+                else H_DEADBAND
+            )
+            previous["external_active"][
+                index
+            ] = climate_controller.external_control_active
+        return previous
+
+    def _read_inputs(self, rooms: list[RoomManager], now: datetime) -> dict[str, Any]:
+        """Read the current entity states into column arrays."""
+        static = self._static
+        get_state = self.hass.states.get
+        count = len(rooms)
+        cache = self.coordinator.state_cache
+        is_on = cache.is_on
+        any_on = cache.any_on
+
+        # Door/window states come from the event-driven trackers (delays included)
+        windows_now = np.fromiter(
+            (room.window_tracker.windows_open for room in rooms), bool, count
+        )
+        windows_delayed = np.fromiter(
+            (room.window_tracker.open_delayed for room in rooms), bool, count
+        )
+        light_on = np.fromiter(map(any_on, static["lights"]), bool, count)
+        # Occupancy comes from the event-driven trackers (timeouts included)
+        occupied = np.fromiter((room.occupancy.occupied for room in rooms), bool, count)
+        vacant = np.fromiter((room.occupancy.vacant for room in rooms), bool, count)
+        paused = np.fromiter(map(is_on, static["pause_switch"]), bool, count)
+        bypass = np.fromiter(map(is_on, static["bypass"]), bool, count)
+        automation_disabled = np.fromiter(
+            (not room._automation_enabled for room in rooms), bool, count
+        )
+
+        has_schedule = np.zeros(count, dtype=bool)
+        schedule_on = np.zeros(count, dtype=bool)
+        external = np.zeros(count, dtype=bool)
+        solar_surplus = self.coordinator.solar_surplus
+        temperature = np.full(count, np.nan)
+        temperature_invalid = np.zeros(count, dtype=bool)
+        trend = np.full(count, np.nan)
+        setpoint = np.full(count, np.nan)
+        setpoint_invalid = np.zeros(count, dtype=bool)
+        actual_preset = np.full(count, UNKNOWN)
+
+        for index in range(count):
+            schedule_entity = static["schedule"][index]
+            if schedule_entity:
+                schedule_state = cache.get_state(schedule_entity)
+                if schedule_state is not None:
+                    has_schedule[index] = True
+                    schedule_on[index] = rooms[index].is_schedule_event_active(
+                        schedule_state, now
+                    )
+
+            external_switch = static["external"][index]
+            if external_switch:
+                state = get_state(external_switch)
+                if state:
+                    is_active = state.attributes.get("is_active", False)
+                    if not is_active:
+                        is_active = state.state.lower() == STATE_ON.lower()
+                    external[index] = bool(is_active)
+            if static["solar_boost"][index] and solar_surplus.is_boosted(
+                rooms[index].room_id
+            ):
+                external[index] = True
+
+            climate_entity = static["climate_entity"][index]
+            if not climate_entity:
+                continue
+            state = get_state(climate_entity)
+            if state:
+                actual_preset[index] = self._preset_code(
+                    state.attributes.get(ATTR_PRESET_MODE)
+                )
+
+            if static["hysteresis_control"][index]:
+                value = cache.get_float(
+                    static["temperature_sensor"][index], "temperature"
+                )
+                if value is None:
+                    temperature_invalid[index] = True
+                else:
+                    temperature[index] = value
+                    temperature_filter = rooms[index].temperature_filter
+                    if temperature_filter.enabled:
+                        smoothed = temperature_filter.value(now)
+                        if smoothed is not None:
+                            temperature[index] = smoothed
+                            trend[index] = temperature_filter.trend(now)
+
+            setpoint_entity = static["setpoint_input"][index]
+            if setpoint_entity:
+                value = cache.get_float(setpoint_entity, "setpoint")
+                # NaN is left to the room (clamped by the controller)
+                if value is None or value != value:
+                    setpoint_invalid[index] = True
+                else:
+                    setpoint[index] = value
+
+        # Pre-heating starts come from the learned models of the rooms
+        preheat = np.zeros(count, dtype=bool)
+        for index in static["preheat_rooms"]:
+            preheat[index] = rooms[index].preheat.is_preheating(now)
+
+        # Forced modes (few rooms): UNKNOWN where the room is not forced
+        override = np.full(count, UNKNOWN)
+        for room_id, forced in self.coordinator.mode_overrides.active(now).items():
+            index = self._room_index.get(room_id)
+            if index is not None:
+                override[index] = _code(MODES, forced)
+
+        # Light auto-off timers still run in the light controllers; bathrooms
+        # also refresh while the shared VMC runs (remaining time is reported)
+        timers_running = np.zeros(count, dtype=bool)
+        vmc_active = self.coordinator.vmc_arbiter.active
+        for index in static["timer_rooms"]:
+            room = rooms[index]
+            timers_running[index] = bool(room.light_controller._light_on_times) or (
+                vmc_active and room.room_type == ROOM_TYPE_BATHROOM
+            )
+
+        # Global inputs
+        entry_data = self.coordinator.entry.data
+        alarm_state = None
+        alarm_entity = entry_data.get(CONF_ALARM_ENTITY)
+        if alarm_entity:
+            alarm_state = cache.get_state(alarm_entity)
+
+        return {
+            "windows_now": windows_now,
+            "windows_delayed": windows_delayed,
+            "light_on": light_on,
+            "occupied": occupied,
+            "vacant": vacant,
+            "paused": paused,
+            "bypass": bypass,
+            "automation_disabled": automation_disabled,
+            "has_schedule": has_schedule,
+            "schedule_on": schedule_on,
+            "external": external,
+            "temperature": temperature,
+            "temperature_invalid": temperature_invalid,
+            "trend": trend,
+            "setpoint": setpoint,
+            "setpoint_invalid": setpoint_invalid,
+            "actual_preset": actual_preset,
+            "timers_running": timers_running,
+            "preheat": preheat,
+            "override": override,
+            "alarm_state": alarm_state,
+            "away": alarm_state == ALARM_STATE_ARMED_AWAY,
+            "summer": is_on(entry_data.get(CONF_SEASON_CALENDAR)),
+        }
+
+    def _decide(self, inputs: dict[str, Any], now: datetime) -> dict[str, Any]:
+        """Compute the decisions of all rooms in one vectorised pass."""
+        static = self._static
+        previous = self._previous
+        away = inputs["away"]
+        summer = inputs["summer"]
+        local = now.time()
+        now_seconds = (
+            local.hour * 3600
+            + local.minute * 60
+            + local.second
+            + local.microsecond / 1_000_000
+        )
+
+        # Windows open past their delays (debounced by the window trackers)
+        windows_now = inputs["windows_now"]
+        windows_frost = static["window_check"] & inputs["windows_delayed"]
+
+        # Night period and comfort time ranges
+        is_night = (now_seconds >= static["night_start"]) | (
+            now_seconds < static["day_start"]
+        )
+        starts = static["comfort_starts"]
+        ends = static["comfort_ends"]
+        with np.errstate(invalid="ignore"):
+            in_range = np.where(
+                starts <= ends,
+                (starts <= now_seconds) & (now_seconds <= ends),
+                (now_seconds >= starts) | (now_seconds <= ends),
+            ) & ~np.isnan(starts)
+        comfort_range = in_range.any(axis=1)
+
+        # Room mode (mode rules of rules.RULES), lowest priority first
+        has_schedule = inputs["has_schedule"]
+        schedule_mode = np.where(
+            inputs["schedule_on"],
+            static["schedule_on_mode"],
+            static["schedule_off_mode"],
+        )
+        light_on = inputs["light_on"]
+        bathroom = static["bathroom"]
+        mode = np.full(len(windows_now), ECO)
+        mode = np.where(comfort_range, COMFORT, mode)
+        mode = np.where(is_night, NIGHT, mode)
+        mode = np.where(inputs["preheat"], COMFORT, mode)
+        mode = np.where(has_schedule, schedule_mode, mode)
+        mode = np.where(
+            bathroom & static["has_lights"], np.where(light_on, COMFORT, ECO), mode
+        )
+        vacant = inputs["vacant"]
+        mode = np.where(vacant, ECO, mode)
+        away_schedule = away & static["ignore_in_away"] & has_schedule
+        if away:
+            mode = np.where(away_schedule, schedule_mode, FROST)
+        override = inputs["override"]
+        overridden = override != UNKNOWN
+        mode = np.where(overridden, override, mode)
+        mode = np.where(windows_frost, FROST, mode)
+
+        # Climate priority (climate rules of rules.RULES), lowest first
+        use_schedule = has_schedule & ~bathroom
+        climate_mode = np.where(use_schedule, schedule_mode, mode)
+        priority = np.where(use_schedule, P_SCHEDULE, P_NORMAL)
+        action = np.full(len(windows_now), ACTION_APPLY)
+        priority = np.where(vacant, P_VACANT, priority)
+        climate_mode = np.where(vacant, ECO, climate_mode)
+        if away:
+            priority = np.where(away_schedule, P_SCHEDULE, P_AWAY)
+            climate_mode = np.where(away_schedule, schedule_mode, climate_mode)
+            action = np.where(away_schedule, action, ACTION_FROST_AWAY)
+        external = inputs["external"]
+        if not away:
+            external = external & ~static["allow_external_in_away"]
+        priority = np.where(external, P_EXTERNAL, priority)
+        action = np.where(external, ACTION_EXTERNAL, action)
+        priority = np.where(overridden, P_OVERRIDE, priority)
+        action = np.where(overridden, ACTION_APPLY, action)
+        climate_mode = np.where(overridden, override, climate_mode)
+        priority = np.where(windows_frost, P_WINDOWS_OPEN, priority)
+        action = np.where(windows_frost, ACTION_FROST_WINDOW, action)
+        priority = np.where(inputs["bypass"], P_BYPASS, priority)
+        action = np.where(inputs["bypass"], ACTION_NONE, action)
+        priority = np.where(inputs["paused"], P_PAUSED, priority)
+        action = np.where(inputs["paused"], ACTION_NONE, action)
+
+        has_climate = static["has_climate"]
+        priority = np.where(has_climate, priority, P_NORMAL)
+        action = np.where(has_climate, action, ACTION_NONE)
+
+        # The external control flag is only refreshed when priority 3 is reached
+        reached_external = has_climate & ~(
+            inputs["paused"] | inputs["bypass"] | windows_frost | overridden
+        )
+        external_active = np.where(
+            reached_external, external, previous["external_active"]
+        )
+
+        # Fil pilote target presets and hysteresis (FilPiloteController)
+        fallback = np.zeros(len(windows_now), dtype=bool)
+        fil_pilote = static["fil_pilote"]
+        apply = fil_pilote & (action == ACTION_APPLY)
+        hysteresis_control = apply & static["hysteresis_control"]
+        target = np.full(len(windows_now), UNKNOWN)
+        command = np.zeros(len(windows_now), dtype=bool)
+        hysteresis_state = previous["hysteresis_state"].copy()
+
+        frost_preset = static["frost_preset"]
+        if summer:
+            normal_target = np.where(
+                climate_mode != FROST, static["preset_summer"], frost_preset
+            )
+        else:
+            normal_target = np.select(
+                [
+                    climate_mode == FROST,
+                    climate_mode == COMFORT,
+                    climate_mode == NIGHT,
+                ],
+                [
+                    static["preset_away"],
+                    static["preset_comfort"],
+                    static["preset_night"],
+                ],
+                static["preset_eco"],
+            )
+        target = np.where(apply & ~static["hysteresis_control"], normal_target, target)
+
+        hysteresis_frost = hysteresis_control & (climate_mode == FROST)
+        target = np.where(hysteresis_frost, static["preset_away"], target)
+        if summer:
+            hysteresis_summer = hysteresis_control & ~hysteresis_frost
+            target = np.where(hysteresis_summer, static["preset_summer"], target)
+            hysteresis_winter = np.zeros(len(windows_now), dtype=bool)
+        else:
+            hysteresis_summer = np.zeros(len(windows_now), dtype=bool)
+            hysteresis_winter = hysteresis_control & ~hysteresis_frost
+        hysteresis_state = np.where(
+            hysteresis_frost | hysteresis_summer, H_DEADBAND, hysteresis_state
+        )
+
+        # Winter hysteresis: rooms with unusable inputs fall back to the
+        # controller (preset-only control, warnings)
+        mode_setpoint = np.select(
+            [
+                climate_mode == COMFORT,
+                climate_mode == NIGHT,
+                climate_mode == ECO,
+            ],
+            [static["temp_comfort"], static["temp_night"], static["temp_eco"]],
+            np.nan,
+        )
+        has_input = ~np.isnan(inputs["setpoint"])
+        setpoint = np.where(
+            has_input,
+            np.maximum(
+                static["min_setpoint"],
+                np.minimum(static["max_setpoint"], inputs["setpoint"]),
+            ),
+            mode_setpoint,
+        )
+        fallback |= hysteresis_winter & (
+            inputs["temperature_invalid"]
+            | inputs["setpoint_invalid"]
+            | np.isnan(setpoint)
+        )
+        temperature = inputs["temperature"]
+        trend = inputs["trend"]
+        hysteresis = static["hysteresis"]
+        with np.errstate(invalid="ignore"):
+            # Smoothed rooms already heading back into the band keep their preset
+            recovering = hysteresis_winter & (
+                (
+                    (temperature > setpoint - 2 * hysteresis)
+                    & (temperature <= setpoint - hysteresis)
+                    & (trend >= TEMPERATURE_TREND_THRESHOLD)
+                )
+                | (
+                    (temperature >= setpoint + hysteresis)
+                    & (temperature < setpoint + 2 * hysteresis)
+                    & (trend <= -TEMPERATURE_TREND_THRESHOLD)
+                )
+            )
+            heating = (
+                hysteresis_winter & ~recovering & (temperature <= setpoint - hysteresis)
+            )
+            idle = (
+                hysteresis_winter
+                & ~recovering
+                & ~heating
+                & (temperature >= setpoint + hysteresis)
+            )
+        deadband = hysteresis_winter & ~heating & ~idle
+        target = np.where(heating, static["preset_heat"], target)
+        target = np.where(idle, static["preset_idle"], target)
+        hysteresis_state = np.select(
+            [heating, idle, deadband],
+            [H_HEATING, H_IDLE, H_DEADBAND],
+            hysteresis_state,
+        )
+
+        frost_window = fil_pilote & (action == ACTION_FROST_WINDOW)
+        frost_away = fil_pilote & (action == ACTION_FROST_AWAY)
+        target = np.where(frost_window, static["preset_window"], target)
+        target = np.where(frost_away, static["preset_away"], target)
+
+        command = ((apply & ~deadband) | frost_window | frost_away) & (
+            target != inputs["actual_preset"]
+        )
+
+        # External control presets are compared with the controller's own
+        # tracking, left to the room (nothing to do in summer)
+        if not summer:
+            fallback |= fil_pilote & (action == ACTION_EXTERNAL)
+
+        return {
+            "mode": mode,
+            "priority": priority,
+            "hysteresis_state": hysteresis_state,
+            "external_active": external_active,
+            "is_night": is_night,
+            "windows_open": windows_now,
+            "command": command,
+            "fallback": fallback,
+        }
+
+    def _select_rooms(
+        self,
+        inputs: dict[str, Any],
+        decisions: dict[str, Any],
+        rooms: list[RoomManager],
+    ) -> tuple[Any, Any]:
+        """Return the rooms to hand to their RoomManager and those to force.
+
+        Rooms whose vectorised decision changed (or that need a command) run
+        the full pass; the others still go through their input fingerprint,
+        which skips them when nothing they read has changed.
+        """
+        previous = self._previous
+        count = len(rooms)
+
+        if inputs["alarm_state"] != self._alarm_state or "is_night" not in previous:
+            # Global change (alarm) or first pass: every room is reported again
+            return np.arange(count), np.zeros(count, dtype=bool)
+
+        changed = (
+            decisions["command"]
+            | (decisions["mode"] != previous["mode"])
+            | (decisions["priority"] != previous["priority"])
+            | (decisions["hysteresis_state"] != previous["hysteresis_state"])
+            | (decisions["external_active"] != previous["external_active"])
+        )
+        selected = (
+            changed
+            | self._static["static_fallback"]
+            | decisions["fallback"]
+            | inputs["timers_running"]
+            | inputs["automation_disabled"]
+            | (decisions["is_night"] != previous["is_night"])
+            | (decisions["windows_open"] != previous["windows_open"])
+            | (inputs["light_on"] != previous["light_on"])
+            | (inputs["occupied"] != previous["occupied"])
+            | (inputs["paused"] != previous["paused"])
+            | (inputs["has_schedule"] != previous["has_schedule"])
+        )
+        # Rolling full refresh
+        selected[self._ticks % FULL_REFRESH_TICKS :: FULL_REFRESH_TICKS] = True
+
+        missing = [
+            index
+            for index, room_id in enumerate(self._room_ids)
+            if room_id not in self._data
+        ]
+        selected[missing] = True
+        return np.flatnonzero(selected), changed
+
+    async def async_evaluate(self, now: datetime) -> dict[str, Any]:
+        """Evaluate every room, delegating only the changed ones."""
+        rooms = self.coordinator.get_all_room_managers()
+        if not rooms:
+            return {}
+
+        with self.coordinator.watchdog.measure("all rooms", "batch_evaluation"):
+            if [room.room_id for room in rooms] != self._room_ids:
+                self._build_layout(rooms)
+            inputs = self._read_inputs(rooms, now)
+            decisions = self._decide(inputs, now)
+            selected, changed = self._select_rooms(inputs, decisions, rooms)
+
+        for index in selected:
+            room = rooms[index]
+            self._data[room.room_id] = await room.async_update(
+                now, force=bool(changed[index])
+            )
+
+        # The selected rooms took the real decision: mirror their state
+        previous = self._previous
+        previous["windows_open"] = decisions["windows_open"]
+        previous["is_night"] = decisions["is_night"]
+        previous["light_on"] = inputs["light_on"]
+        previous["occupied"] = inputs["occupied"]
+        previous["paused"] = inputs["paused"]
+        previous["has_schedule"] = inputs["has_schedule"]
+        previous["mode"] = decisions["mode"]
+        previous["priority"] = decisions["priority"]
+        previous["hysteresis_state"] = decisions["hysteresis_state"]
+        previous["external_active"] = decisions["external_active"]
+        self._read_back(rooms, selected, previous)
+        self._alarm_state = inputs["alarm_state"]
+        self._ticks += 1
+        self.last_evaluated = len(selected)
+
+        _LOGGER.debug(
+            "Batch evaluation: %d/%d rooms re-evaluated", len(selected), len(rooms)
+        )
+        return {room_id: self._data[room_id] for room_id in self._room_ids}
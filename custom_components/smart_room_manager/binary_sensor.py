@@ -69,6 +69,13 @@ class SmartRoomOccupiedSensor(SmartRoomEntity, BinarySensorEntity):
             return self.coordinator.data[self._room_id].get("occupied", False)
         return None
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the occupancy sensor details (if the room has sensors)."""
+        if not self.coordinator.data or self._room_id not in self.coordinator.data:
+            return {}
+        return self.coordinator.data[self._room_id].get("occupancy", {})
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
@@ -0,0 +1,264 @@
+"""Calendar event lookahead for Smart Room Manager schedules."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CALENDAR_LOOKAHEAD_HORIZON,
+    CALENDAR_REFRESH_INTERVAL,
+    CONF_SCHEDULE_ENTITY,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import SmartRoomCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+CALENDAR_DOMAIN = "calendar"
+SERVICE_GET_EVENTS = "get_events"
+
+
+def _parse_event_time(value: Any) -> datetime | None:
+    """Parse an event start/end (date-time, or date for all-day events)."""
+    if not isinstance(value, str):
+        return None
+    day = dt_util.parse_date(value)
+    if day is not None:
+        return dt_util.start_of_local_day(day)
+    parsed = dt_util.parse_datetime(value)
+    if parsed is not None:
+        return dt_util.as_local(parsed)
+    return None
+
+
+class _CalendarWindow:
+    """Events of one calendar known from now up to fetched_until."""
+
+    __slots__ = ("events", "intervals", "fetched_until", "timer")
+
+    def __init__(self) -> None:
+        """Initialize an empty window."""
+        self.events: set[tuple[datetime, datetime]] = set()
+        # Merged busy intervals, sorted (overlapping events are one interval)
+        self.intervals: list[tuple[datetime, datetime]] = []
+        self.fetched_until: datetime | None = None
+        self.timer: CALLBACK_TYPE | None = None
+
+
+class CalendarLookahead:
+    """Upcoming events of the schedule calendars, shared by all rooms.
+
+    Each calendar used as CONF_SCHEDULE_ENTITY is fetched once for every
+    room that uses it, through the calendar get_events service, over a
+    rolling horizon. Every refresh interval only the newly uncovered end of
+    the horizon is fetched and past events are dropped; a calendar state
+    change (event start/end, edited next event) triggers a full re-fetch.
+
+    Rooms read whether an event is active from the cached events, and one
+    timer per calendar re-evaluates its rooms at the exact next on/off
+    transition. Calendars that cannot be fetched (no calendar integration,
+    offline replays) fall back to the calendar entity state.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: SmartRoomCoordinator) -> None:
+        """Initialize the lookahead."""
+        self.hass = hass
+        self.coordinator = coordinator
+
+        self._windows: dict[str, _CalendarWindow] = {}
+        self._calendar_rooms: dict[str, list[str]] = {}  # calendar -> room_ids
+        self._unsub_calendars: CALLBACK_TYPE | None = None
+        self._refresh_timer: CALLBACK_TYPE | None = None
+
+    @property
+    def horizon(self) -> timedelta:
+        """Return how far ahead events are fetched."""
+        return timedelta(seconds=CALENDAR_LOOKAHEAD_HORIZON)
+
+    async def async_setup(self) -> None:
+        """Fetch the schedule calendars and follow their state changes."""
+        self._calendar_rooms = {}
+        for room_manager in self.coordinator.get_all_room_managers():
+            calendar = room_manager.room_config.get(CONF_SCHEDULE_ENTITY)
+            if calendar:
+                self._calendar_rooms.setdefault(calendar, []).append(
+                    room_manager.room_id
+                )
+        if not self._calendar_rooms:
+            return
+
+        self._unsub_calendars = async_track_state_change_event(
+            self.hass, list(self._calendar_rooms), self._async_calendar_changed
+        )
+        await self._async_refresh(full=True)
+
+    async def _async_calendar_changed(self, event: Event) -> None:
+        """Re-fetch a calendar whose current or next event changed."""
+        calendar = event.data["entity_id"]
+        await self._async_fetch(calendar, self.coordinator.clock.now(), full=True)
+
+    async def _async_refresh_interval(self, _now: Any) -> None:
+        """Extend every calendar window to the rolling horizon."""
+        self._refresh_timer = None
+        await self._async_refresh(full=False)
+
+    async def _async_refresh(self, full: bool) -> None:
+        """Fetch every calendar and arm the next periodic refresh."""
+        now = self.coordinator.clock.now()
+        for calendar in self._calendar_rooms:
+            await self._async_fetch(calendar, now, full)
+        self._refresh_timer = self.coordinator.clock.async_call_later(
+            self.hass, CALENDAR_REFRESH_INTERVAL, self._async_refresh_interval
+        )
+
+    async def _async_fetch(self, calendar: str, now: datetime, full: bool) -> None:
+        """Fetch the events of a calendar missing from its window."""
+        if not self.hass.services.has_service(CALENDAR_DOMAIN, SERVICE_GET_EVENTS):
+            return
+
+        window = self._windows.setdefault(calendar, _CalendarWindow())
+        end = now + self.horizon
+        start = now
+        if not full and window.fetched_until is not None:
+            start = max(now, window.fetched_until)
+            if start >= end:
+                return
+
+        try:
+            response = await self.hass.services.async_call(
+                CALENDAR_DOMAIN,
+                SERVICE_GET_EVENTS,
+                {
+                    "entity_id": calendar,
+                    "start_date_time": start.isoformat(),
+                    "end_date_time": end.isoformat(),
+                },
+                blocking=True,
+                return_response=True,
+            )
+        except Exception as err:
+            _LOGGER.warning("Error fetching events of %s: %s", calendar, err)
+            return
+
+        events = set()
+        for item in (response or {}).get(calendar, {}).get("events", []):
+            event_start = _parse_event_time(item.get("start"))
+            event_end = _parse_event_time(item.get("end"))
+            if event_start is not None and event_end is not None:
+                events.add((event_start, event_end))
+
+        if full:
+            window.events = events
+        else:
+            # Events overlapping both slices come back twice: the set merges them
+            window.events = {e for e in window.events if e[1] > now} | events
+        window.fetched_until = end
+        window.intervals = []
+        for event_start, event_end in sorted(window.events):
+            if window.intervals and event_start <= window.intervals[-1][1]:
+                last_start, last_end = window.intervals[-1]
+                window.intervals[-1] = (last_start, max(last_end, event_end))
+            else:
+                window.intervals.append((event_start, event_end))
+
+        _LOGGER.debug(
+            "📅 %s: %d event(s) until %s (%s fetch)",
+            calendar,
+            len(window.events),
+            end.strftime("%d/%m %H:%M"),
+            "full" if full else "incremental",
+        )
+        self._arm_transition(calendar, now)
+
+    def _arm_transition(self, calendar: str, now: datetime) -> None:
+        """Arm a single timer at the next on/off transition of a calendar."""
+        window = self._windows[calendar]
+        if window.timer:
+            window.timer()
+            window.timer = None
+        transition = self.next_transition(calendar, now)
+        if transition is None:
+            return
+        window.timer = self.coordinator.clock.async_call_at(
+            self.hass, transition, partial(self._async_transition, calendar)
+        )
+
+    async def _async_transition(self, calendar: str, now: datetime) -> None:
+        """Re-evaluate the rooms of a calendar at its transition."""
+        window = self._windows.get(calendar)
+        if window is None:
+            return
+        window.timer = None
+        for room_id in self._calendar_rooms.get(calendar, []):
+            await self.coordinator.async_refresh_room(room_id)
+        self._arm_transition(calendar, self.coordinator.clock.now())
+
+    def _known(self, calendar: str, now: datetime) -> _CalendarWindow | None:
+        """Return the window of a calendar if it covers now."""
+        window = self._windows.get(calendar)
+        if window is None or window.fetched_until is None:
+            return None
+        if now >= window.fetched_until:
+            return None
+        return window
+
+    def is_active(self, calendar: str | None, now: datetime) -> bool | None:
+        """Return True if an event is active (None if the calendar is unknown)."""
+        if not calendar:
+            return None
+        window = self._known(calendar, now)
+        if window is None:
+            return None
+        return any(start <= now < end for start, end in window.intervals)
+
+    def next_start(self, calendar: str | None, now: datetime) -> datetime | None:
+        """Return when the next event period starts after now (if known)."""
+        window = self._known(calendar, now) if calendar else None
+        if window is None:
+            return None
+        return next((start for start, _end in window.intervals if start > now), None)
+
+    def next_transition(self, calendar: str, now: datetime) -> datetime | None:
+        """Return the next time an event period starts or ends (if known)."""
+        window = self._known(calendar, now)
+        if window is None:
+            return None
+        for start, end in window.intervals:
+            if start > now:
+                return start
+            if end > now:
+                return end if end <= window.fetched_until else None
+        return None
+
+    def get_state(self, calendar: str | None, now: datetime) -> dict[str, Any]:
+        """Get the lookahead state of a calendar for the room attributes."""
+        if not calendar or self._known(calendar, now) is None:
+            return {}
+        transition = self.next_transition(calendar, now)
+        return {
+            "schedule_next_transition": (
+                transition.isoformat() if transition else None
+            ),
+        }
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Unsubscribe and cancel the timers."""
+        if self._unsub_calendars:
+            self._unsub_calendars()
+            self._unsub_calendars = None
+        if self._refresh_timer:
+            self._refresh_timer()
+            self._refresh_timer = None
+        for window in self._windows.values():
+            if window.timer:
+                window.timer()
+                window.timer = None
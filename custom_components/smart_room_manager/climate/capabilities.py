@@ -0,0 +1,105 @@
+"""Climate entity capability profiles."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.core import State
+
+from ..const import MODE_COMFORT, MODE_ECO, MODE_FROST_PROTECTION, MODE_NIGHT
+
+# Standard thermostat presets (common across many thermostats)
+PRESET_AWAY = "away"
+PRESET_HOME = "home"
+PRESET_COMFORT = "comfort"
+PRESET_ECO = "eco"
+PRESET_SLEEP = "sleep"
+PRESET_BOOST = "boost"
+
+# SRM mode -> thermostat presets, by order of preference
+MODE_PRESET_FALLBACKS: dict[str, tuple[str, ...]] = {
+    MODE_COMFORT: (PRESET_COMFORT, PRESET_HOME, PRESET_BOOST),
+    MODE_ECO: (PRESET_ECO, PRESET_HOME),
+    MODE_NIGHT: (PRESET_SLEEP, PRESET_ECO, PRESET_HOME),
+    # For frost protection, only "away" makes sense
+    MODE_FROST_PROTECTION: (PRESET_AWAY,),
+}
+
+# Attributes a profile is built from (anything else can change freely)
+CAPABILITY_ATTRIBUTES = (
+    "preset_modes",
+    "hvac_modes",
+    "min_temp",
+    "max_temp",
+    "target_temp_step",
+)
+
+
+def capability_key(state: State) -> tuple[Any, ...]:
+    """Return the capability attributes of a state, in a comparable form."""
+    key: list[Any] = []
+    for attribute in CAPABILITY_ATTRIBUTES:
+        value = state.attributes.get(attribute)
+        key.append(tuple(value) if isinstance(value, (list, tuple)) else value)
+    return tuple(key)
+
+
+class ClimateCapabilities:
+    """What a climate entity supports, resolved once per attribute change.
+
+    Mode mapping decisions (best preset for an SRM mode, reversibility,
+    which hvac mode to turn on with) become table lookups instead of list
+    scans on every control cycle.
+    """
+
+    __slots__ = (
+        "preset_modes",
+        "presets",
+        "hvac_modes",
+        "reversible",
+        "min_temp",
+        "max_temp",
+        "temp_step",
+        "mode_presets",
+    )
+
+    def __init__(self, state: State) -> None:
+        """Build the profile from the climate state attributes."""
+        attributes = state.attributes
+        self.preset_modes: list[str] = list(attributes.get("preset_modes") or [])
+        self.presets: frozenset[str] = frozenset(self.preset_modes)
+        self.hvac_modes: frozenset[str] = frozenset(attributes.get("hvac_modes") or [])
+        self.reversible: bool = HVACMode.COOL in self.hvac_modes
+        self.min_temp: float | None = attributes.get("min_temp")
+        self.max_temp: float | None = attributes.get("max_temp")
+        self.temp_step: float | None = attributes.get("target_temp_step")
+
+        self.mode_presets: dict[str, str | None] = {
+            mode: next((p for p in presets if p in self.presets), None)
+            for mode, presets in MODE_PRESET_FALLBACKS.items()
+        }
+
+    def supports_preset(self, preset: str) -> bool:
+        """Check if the entity supports a specific preset."""
+        return preset in self.presets
+
+    def best_preset(self, mode: str) -> str | None:
+        """Return the best available preset for an SRM mode."""
+        return self.mode_presets.get(mode)
+
+    def heat_mode(self) -> HVACMode | None:
+        """Return the hvac mode used to heat (HEAT, else HEAT_COOL)."""
+        if HVACMode.HEAT in self.hvac_modes:
+            return HVACMode.HEAT
+        if HVACMode.HEAT_COOL in self.hvac_modes:
+            return HVACMode.HEAT_COOL
+        return None
+
+    def clamp_temperature(self, temperature: float) -> float:
+        """Limit a target temperature to the range accepted by the entity."""
+        if self.min_temp is not None and temperature < self.min_temp:
+            return self.min_temp
+        if self.max_temp is not None and temperature > self.max_temp:
+            return self.max_temp
+        return temperature
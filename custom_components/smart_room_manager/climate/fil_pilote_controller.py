@@ -51,6 +51,7 @@ from ..const import (
     MODE_ECO,
     MODE_FROST_PROTECTION,
     MODE_NIGHT,
+    TEMPERATURE_TREND_THRESHOLD,
 )
 
 if TYPE_CHECKING:
@@ -77,6 +78,33 @@ class FilPiloteController:
         self._hysteresis_state: str = HYSTERESIS_DEADBAND
         self._hysteresis_current_temp: float | None = None
         self._hysteresis_setpoint: float | None = None
+        self._hysteresis_trend: float | None = None  # °C/h (smoothed rooms)
+
+    @property
+    def hysteresis_state(self) -> str:
+        """Return the hysteresis state (heating, idle or deadband)."""
+        return self._hysteresis_state
+
+    @property
+    def hysteresis_setpoint(self) -> float | None:
+        """Return the setpoint of the hysteresis (None if not controlled)."""
+        return self._hysteresis_setpoint
+
+    def heat_demand(self) -> bool | None:
+        """Return True if the hysteresis asks for heat (None without setpoint).
+
+        In the deadband the radiator asks for heat while it holds the heat
+        preset.
+        """
+        if self._hysteresis_setpoint is None:
+            return None
+        if self._hysteresis_state == HYSTERESIS_HEATING:
+            return True
+        if self._hysteresis_state == HYSTERESIS_IDLE:
+            return False
+        return self._current_preset == self.room_config.get(
+            CONF_PRESET_HEAT, DEFAULT_PRESET_HEAT
+        )
 
     async def control(self, climate_entity: str, mode: str, is_summer: bool) -> None:
         """Control Fil Pilote climate entity via preset_mode."""
@@ -108,6 +136,11 @@ class FilPiloteController:
             # Winter: map mode to preset
             target_preset = self._get_preset_for_mode(mode)
 
+        # Power budget: a shed heater waits for its turn in eco
+        shed = self._shed(climate_entity, mode == MODE_COMFORT and not is_summer, 0.0)
+        if shed:
+            target_preset = self.room_config.get(CONF_PRESET_ECO, DEFAULT_PRESET_ECO)
+
         # Get actual preset from entity state (not just internal tracking)
         # This handles cases where preset was changed externally or after HA restart
         state = self.hass.states.get(climate_entity)
@@ -128,6 +161,15 @@ class FilPiloteController:
         if actual_preset == target_preset:
             return
 
+        # Anti-short-cycle (frost protection and shedding are never deferred)
+        dwell_guard = self.room_manager.coordinator.dwell_guard
+        if (
+            mode != MODE_FROST_PROTECTION
+            and not shed
+            and not dwell_guard.allow(climate_entity, self.room_manager)
+        ):
+            return
+
         _LOGGER.debug(
             "Setting Fil Pilote preset for %s in %s to %s (mode: %s, summer: %s)",
             climate_entity,
@@ -138,16 +180,16 @@ class FilPiloteController:
         )
 
         try:
-            await self.hass.services.async_call(
+            await self.room_manager.coordinator.dispatcher.async_call(
                 CLIMATE_DOMAIN,
                 SERVICE_SET_PRESET_MODE,
                 {
                     "entity_id": climate_entity,
                     ATTR_PRESET_MODE: target_preset,
                 },
-                blocking=True,
             )
             self._current_preset = target_preset
+            dwell_guard.record(climate_entity, self.room_manager)
         except Exception as err:
             _LOGGER.error(
                 "Error setting preset mode for %s: %s",
@@ -167,10 +209,13 @@ class FilPiloteController:
         1. setpoint_input (input_number) if configured - for dynamic setpoint control
         2. Configured temperatures based on current mode (comfort, eco, night)
         """
+        shed = False
+
         # Frost protection mode bypasses hysteresis - always use the configured preset
         if mode == MODE_FROST_PROTECTION:
             target_preset = self.room_config.get(CONF_PRESET_AWAY, DEFAULT_PRESET_AWAY)
             self._hysteresis_state = HYSTERESIS_DEADBAND
+            self._shed(climate_entity, False, 0.0)
 
             # Get actual preset and apply if different
             state = self.hass.states.get(climate_entity)
@@ -190,16 +235,18 @@ class FilPiloteController:
             )
 
             try:
-                await self.hass.services.async_call(
+                await self.room_manager.coordinator.dispatcher.async_call(
                     CLIMATE_DOMAIN,
                     SERVICE_SET_PRESET_MODE,
                     {
                         "entity_id": climate_entity,
                         ATTR_PRESET_MODE: target_preset,
                     },
-                    blocking=True,
                 )
                 self._current_preset = target_preset
+                self.room_manager.coordinator.dwell_guard.record(
+                    climate_entity, self.room_manager
+                )
             except Exception as err:
                 _LOGGER.error(
                     "Error setting frost protection preset for %s: %s",
@@ -218,12 +265,13 @@ class FilPiloteController:
             else:  # "off"
                 target_preset = FP_PRESET_OFF
             self._hysteresis_state = HYSTERESIS_DEADBAND
+            self._shed(climate_entity, False, 0.0)
         else:
             # Winter: use hysteresis control
             # Get current temperature
             temp_sensor = self.room_config.get(CONF_TEMPERATURE_SENSOR)
-            temp_state = self.hass.states.get(temp_sensor)
-            if not temp_state:
+            state_cache = self.room_manager.coordinator.state_cache
+            if state_cache.get_state(temp_sensor) is None:
                 _LOGGER.warning(
                     "Temperature sensor %s not found for %s",
                     temp_sensor,
@@ -233,14 +281,9 @@ class FilPiloteController:
                 await self._control_normal(climate_entity, mode, is_summer)
                 return
 
-            try:
-                current_temp = float(temp_state.state)
-            except (ValueError, TypeError):
-                _LOGGER.warning(
-                    "Invalid temperature value from %s: %s",
-                    temp_sensor,
-                    temp_state.state,
-                )
+            # Invalid values are logged once per state change by the cache
+            current_temp = state_cache.get_float(temp_sensor, "temperature")
+            if current_temp is None:
                 await self._control_normal(climate_entity, mode, is_summer)
                 return
 
@@ -251,29 +294,61 @@ class FilPiloteController:
                 await self._control_normal(climate_entity, mode, is_summer)
                 return
 
+            # Smoothed temperature and trend (the raw reading is still
+            # required above: an unavailable sensor falls back to presets)
+            trend = None
+            temperature_filter = self.room_manager.temperature_filter
+            if temperature_filter.enabled:
+                smoothed = temperature_filter.value(self.room_manager.now)
+                if smoothed is not None:
+                    current_temp = smoothed
+                    trend = temperature_filter.trend(self.room_manager.now)
+
             # Get hysteresis
             hysteresis = self.room_config.get(CONF_HYSTERESIS, DEFAULT_HYSTERESIS)
 
             # Store for debug sensor
             self._hysteresis_current_temp = current_temp
             self._hysteresis_setpoint = setpoint
+            self._hysteresis_trend = trend
 
             # Calculate hysteresis
-            if current_temp <= setpoint - hysteresis:
+            preset_heat = self.room_config.get(CONF_PRESET_HEAT, DEFAULT_PRESET_HEAT)
+            preset_idle = self.room_config.get(CONF_PRESET_IDLE, DEFAULT_PRESET_IDLE)
+            load_shedder = self.room_manager.coordinator.load_shedder
+            if self._is_recovering(current_temp, setpoint, hysteresis, trend):
+                # Already moving back towards the band - keep current preset
+                self._hysteresis_state = HYSTERESIS_DEADBAND
+                target_preset = None
+            elif current_temp <= setpoint - hysteresis:
                 # Too cold - heat
-                target_preset = self.room_config.get(
-                    CONF_PRESET_HEAT, DEFAULT_PRESET_HEAT
-                )
+                target_preset = preset_heat
                 self._hysteresis_state = HYSTERESIS_HEATING
             elif current_temp >= setpoint + hysteresis:
                 # Too hot - idle
-                target_preset = self.room_config.get(
-                    CONF_PRESET_IDLE, DEFAULT_PRESET_IDLE
-                )
+                target_preset = preset_idle
                 self._hysteresis_state = HYSTERESIS_IDLE
             else:
                 # In deadband - keep current preset
                 self._hysteresis_state = HYSTERESIS_DEADBAND
+                target_preset = None
+
+            # Power budget: a shed heater idles until its turn, through the
+            # deadband too (where a granted heater resumes heating)
+            if self._hysteresis_state == HYSTERESIS_HEATING:
+                shed = self._shed(climate_entity, True, setpoint - current_temp)
+            elif self._hysteresis_state == HYSTERESIS_IDLE:
+                shed = self._shed(climate_entity, False, 0.0)
+            elif load_shedder.is_shed(climate_entity):
+                shed = True
+            elif load_shedder.is_granted(climate_entity):
+                shed = False
+                target_preset = preset_heat
+            else:
+                shed = False
+            if shed:
+                target_preset = preset_idle
+            if target_preset is None:
                 return
 
         # Get actual preset from entity state (sync with reality)
@@ -288,6 +363,11 @@ class FilPiloteController:
         if actual_preset == target_preset:
             return
 
+        # Anti-short-cycle (shedding is never deferred)
+        dwell_guard = self.room_manager.coordinator.dwell_guard
+        if not shed and not dwell_guard.allow(climate_entity, self.room_manager):
+            return
+
         _LOGGER.debug(
             "Setting Fil Pilote hysteresis preset for %s to %s (temp: %.1f°C, setpoint: %.1f°C, state: %s)",
             self.room_manager.room_name,
@@ -298,16 +378,16 @@ class FilPiloteController:
         )
 
         try:
-            await self.hass.services.async_call(
+            await self.room_manager.coordinator.dispatcher.async_call(
                 CLIMATE_DOMAIN,
                 SERVICE_SET_PRESET_MODE,
                 {
                     "entity_id": climate_entity,
                     ATTR_PRESET_MODE: target_preset,
                 },
-                blocking=True,
             )
             self._current_preset = target_preset
+            dwell_guard.record(climate_entity, self.room_manager)
         except Exception as err:
             _LOGGER.error(
                 "Error setting hysteresis preset for %s: %s",
@@ -315,6 +395,37 @@ class FilPiloteController:
                 err,
             )
 
+    def _shed(self, climate_entity: str, heating: bool, deficit: float) -> bool:
+        """Ask the power budget for a heater, return True if it must wait.
+
+        Args:
+            climate_entity: The climate entity to control
+            heating: The heater asks for comfort (False gives its power back)
+            deficit: Setpoint - temperature (°C, 0 if unknown)
+        """
+        load_shedder = self.room_manager.coordinator.load_shedder
+        if not heating:
+            load_shedder.release(climate_entity)
+            return False
+        return not load_shedder.request(self.room_manager, climate_entity, deficit)
+
+    @staticmethod
+    def _is_recovering(
+        temperature: float, setpoint: float, hysteresis: float, trend: float | None
+    ) -> bool:
+        """Check if a room outside the band is already heading back into it.
+
+        Only applies within one more hysteresis width, so a room far from
+        the setpoint is always corrected.
+        """
+        if trend is None:
+            return False
+        if setpoint - 2 * hysteresis < temperature <= setpoint - hysteresis:
+            return trend >= TEMPERATURE_TREND_THRESHOLD
+        if setpoint + hysteresis <= temperature < setpoint + 2 * hysteresis:
+            return trend <= -TEMPERATURE_TREND_THRESHOLD
+        return False
+
     def _get_setpoint(self, mode: str) -> float | None:
         """Get the setpoint temperature for hysteresis control.
 
@@ -325,25 +436,18 @@ class FilPiloteController:
         # Try setpoint_input first (for dynamic control)
         setpoint_input = self.room_config.get(CONF_SETPOINT_INPUT)
         if setpoint_input:
-            setpoint_state = self.hass.states.get(setpoint_input)
-            if setpoint_state:
-                try:
-                    setpoint = float(setpoint_state.state)
-                    # Clamp to min/max
-                    min_setpoint = self.room_config.get(
-                        CONF_MIN_SETPOINT, DEFAULT_MIN_SETPOINT
-                    )
-                    max_setpoint = self.room_config.get(
-                        CONF_MAX_SETPOINT, DEFAULT_MAX_SETPOINT
-                    )
-                    return max(min_setpoint, min(max_setpoint, setpoint))
-                except (ValueError, TypeError):
-                    _LOGGER.warning(
-                        "Invalid setpoint value from %s: %s",
-                        setpoint_input,
-                        setpoint_state.state,
-                    )
-            else:
+            state_cache = self.room_manager.coordinator.state_cache
+            setpoint = state_cache.get_float(setpoint_input, "setpoint")
+            if setpoint is not None:
+                # Clamp to min/max
+                min_setpoint = self.room_config.get(
+                    CONF_MIN_SETPOINT, DEFAULT_MIN_SETPOINT
+                )
+                max_setpoint = self.room_config.get(
+                    CONF_MAX_SETPOINT, DEFAULT_MAX_SETPOINT
+                )
+                return max(min_setpoint, min(max_setpoint, setpoint))
+            elif state_cache.get_state(setpoint_input) is None:
                 _LOGGER.warning(
                     "Setpoint input %s not found for %s",
                     setpoint_input,
@@ -400,16 +504,18 @@ class FilPiloteController:
         )
 
         try:
-            await self.hass.services.async_call(
+            await self.room_manager.coordinator.dispatcher.async_call(
                 CLIMATE_DOMAIN,
                 SERVICE_SET_PRESET_MODE,
                 {
                     "entity_id": climate_entity,
                     ATTR_PRESET_MODE: target_preset,
                 },
-                blocking=True,
             )
             self._current_preset = target_preset
+            self.room_manager.coordinator.dwell_guard.record(
+                climate_entity, self.room_manager
+            )
         except Exception as err:
             _LOGGER.error(
                 "Error setting frost protection for %s: %s",
@@ -448,7 +554,7 @@ class FilPiloteController:
 
         # Add hysteresis details if active
         if self._hysteresis_current_temp is not None:
-            state["hysteresis_current_temp"] = self._hysteresis_current_temp
+            state["hysteresis_current_temp"] = round(self._hysteresis_current_temp, 2)
             state["hysteresis_setpoint"] = self._hysteresis_setpoint
             hysteresis = self.room_config.get(CONF_HYSTERESIS, DEFAULT_HYSTERESIS)
             state["hysteresis_value"] = hysteresis
@@ -462,5 +568,7 @@ class FilPiloteController:
                 if self._hysteresis_setpoint
                 else None
             )
+            if self._hysteresis_trend is not None:
+                state["hysteresis_trend"] = round(self._hysteresis_trend, 2)
 
         return state
@@ -35,20 +35,12 @@ from ..const import (
     DEFAULT_TEMP_NIGHT,
     DEFAULT_THERMOSTAT_CONTROL_MODE,
     MODE_COMFORT,
-    MODE_ECO,
     MODE_FROST_PROTECTION,
     MODE_NIGHT,
     THERMOSTAT_CONTROL_PRESET,
     THERMOSTAT_CONTROL_TEMPERATURE,
 )
-
-# Standard thermostat presets (common across many thermostats)
-PRESET_AWAY = "away"
-PRESET_HOME = "home"
-PRESET_COMFORT = "comfort"
-PRESET_ECO = "eco"
-PRESET_SLEEP = "sleep"
-PRESET_BOOST = "boost"
+from .capabilities import PRESET_AWAY, ClimateCapabilities
 
 if TYPE_CHECKING:
     from ..room_manager import RoomManager
@@ -74,72 +66,51 @@ class ThermostatController:
         self._current_hvac_mode: str | None = None
         self._current_preset: str | None = None
 
-        # Preset support detection
-        self._preset_modes: list[str] = []
-        self._presets_detected: bool = False
+        # Capability profile (presets, hvac modes, temperature range)
+        self._capabilities: ClimateCapabilities | None = None
 
-    def _detect_preset_support(self, climate_entity: str) -> None:
-        """Detect which presets the thermostat supports."""
-        if self._presets_detected:
-            return  # Already detected
+        # Mode commands wait for the minimum dwell time (not frost protection)
+        self._dwell_guarded: bool = True
 
-        state = self.hass.states.get(climate_entity)
-        if not state:
-            self._preset_modes = []
-            self._presets_detected = True
-            return
-
-        self._preset_modes = state.attributes.get("preset_modes", []) or []
-        self._presets_detected = True
-
-        if self._preset_modes:
-            _LOGGER.info(
-                "Thermostat %s supports presets: %s",
-                climate_entity,
-                self._preset_modes,
-            )
+    def _load_capabilities(self, climate_entity: str) -> None:
+        """Get the thermostat profile (rebuilt only when its attributes change)."""
+        self._capabilities = self.room_manager.coordinator.state_cache.get_capabilities(
+            climate_entity
+        )
 
     def _supports_preset(self, preset: str) -> bool:
         """Check if thermostat supports a specific preset."""
-        return preset in self._preset_modes
+        return self._capabilities is not None and self._capabilities.supports_preset(
+            preset
+        )
 
     def _get_best_preset_for_mode(self, mode: str) -> str | None:
         """Get the best available preset for a given SRM mode.
 
-        Maps SRM modes to thermostat presets with fallbacks:
+        Maps SRM modes to thermostat presets with fallbacks
+        (resolved once per profile, see MODE_PRESET_FALLBACKS):
         - MODE_COMFORT → comfort, home, boost
         - MODE_ECO → eco, home
         - MODE_NIGHT → sleep, eco, home
         - MODE_FROST_PROTECTION → away
         """
-        if mode == MODE_FROST_PROTECTION:
-            # For frost protection, only "away" makes sense
-            if self._supports_preset(PRESET_AWAY):
-                return PRESET_AWAY
-            return None
-
-        if mode == MODE_COMFORT:
-            # Comfort: prefer comfort, then home, then boost
-            for preset in [PRESET_COMFORT, PRESET_HOME, PRESET_BOOST]:
-                if self._supports_preset(preset):
-                    return preset
+        if self._capabilities is None:
             return None
+        return self._capabilities.best_preset(mode)
 
-        if mode == MODE_ECO:
-            # Eco: prefer eco, then home
-            for preset in [PRESET_ECO, PRESET_HOME]:
-                if self._supports_preset(preset):
-                    return preset
-            return None
-
-        if mode == MODE_NIGHT:
-            # Night: prefer sleep, then eco, then home
-            for preset in [PRESET_SLEEP, PRESET_ECO, PRESET_HOME]:
-                if self._supports_preset(preset):
-                    return preset
-            return None
+    def _dwell_allows(self, climate_entity: str) -> bool:
+        """Check the anti-short-cycle guard before sending a command."""
+        if not self._dwell_guarded:
+            return True
+        return self.room_manager.coordinator.dwell_guard.allow(
+            climate_entity, self.room_manager
+        )
 
-        return None
+    def _dwell_record(self, climate_entity: str) -> None:
+        """Start a new dwell period after a command."""
+        self.room_manager.coordinator.dwell_guard.record(
+            climate_entity, self.room_manager
+        )
 
     async def _set_preset(self, climate_entity: str, preset: str) -> bool:
         """Set thermostat preset if supported. Returns True if preset was set."""
@@ -151,6 +122,8 @@ class ThermostatController:
         actual_preset = state.attributes.get(ATTR_PRESET_MODE)
         if actual_preset == preset:
             return True  # Already at target preset
+        if not self._dwell_allows(climate_entity):
+            return False
 
         _LOGGER.debug(
             "Setting thermostat preset for %s in %s to %s",
@@ -159,16 +132,16 @@ class ThermostatController:
             preset,
         )
         try:
-            await self.hass.services.async_call(
+            await self.room_manager.coordinator.dispatcher.async_call(
                 CLIMATE_DOMAIN,
                 SERVICE_SET_PRESET_MODE,
                 {
                     "entity_id": climate_entity,
                     ATTR_PRESET_MODE: preset,
                 },
-                blocking=True,
             )
             self._current_preset = preset
+            self._dwell_record(climate_entity)
             return True
         except Exception as err:
             _LOGGER.error(
@@ -186,8 +159,8 @@ class ThermostatController:
         - temperature: Control via hvac_mode + temperature (legacy)
         - preset_and_temp: Use both presets and temperature
         """
-        # Detect preset support on first call
-        self._detect_preset_support(climate_entity)
+        self._load_capabilities(climate_entity)
+        self._dwell_guarded = mode != MODE_FROST_PROTECTION
 
         # Get control mode from config
         control_mode = self.room_config.get(
@@ -220,15 +193,13 @@ class ThermostatController:
         User configures temperatures in the thermostat app.
         """
         state = self.hass.states.get(climate_entity)
-        if not state:
+        capabilities = self._capabilities
+        if not state or capabilities is None:
             return
 
-        hvac_modes = state.attributes.get("hvac_modes", [])
-
         # In summer with non-reversible thermostat, just turn off
         if is_summer and mode != MODE_FROST_PROTECTION:
-            is_reversible = HVACMode.COOL in hvac_modes
-            if not is_reversible:
+            if not capabilities.reversible:
                 if state.state != HVACMode.OFF:
                     await self._set_hvac_mode(climate_entity, HVACMode.OFF)
                 return
@@ -249,12 +220,10 @@ class ThermostatController:
             # Ensure thermostat is ON (not OFF)
             if state.state == HVACMode.OFF:
                 # Turn on - prefer HEAT in winter, COOL in summer
-                if is_summer and HVACMode.COOL in hvac_modes:
+                if is_summer and capabilities.reversible:
                     await self._set_hvac_mode(climate_entity, HVACMode.COOL)
-                elif HVACMode.HEAT in hvac_modes:
-                    await self._set_hvac_mode(climate_entity, HVACMode.HEAT)
-                elif HVACMode.HEAT_COOL in hvac_modes:
-                    await self._set_hvac_mode(climate_entity, HVACMode.HEAT_COOL)
+                elif heat_mode := capabilities.heat_mode():
+                    await self._set_hvac_mode(climate_entity, heat_mode)
         else:
             # No suitable preset found, fallback to hvac_mode control
             _LOGGER.warning(
@@ -266,26 +235,24 @@ class ThermostatController:
                 # Turn off or set very low temperature
                 await self._set_hvac_mode(climate_entity, HVACMode.OFF)
             elif is_summer:
-                if HVACMode.COOL in hvac_modes:
+                if capabilities.reversible:
                     await self._set_hvac_mode(climate_entity, HVACMode.COOL)
                 else:
                     await self._set_hvac_mode(climate_entity, HVACMode.OFF)
             else:
-                if HVACMode.HEAT in hvac_modes:
-                    await self._set_hvac_mode(climate_entity, HVACMode.HEAT)
-                elif HVACMode.HEAT_COOL in hvac_modes:
-                    await self._set_hvac_mode(climate_entity, HVACMode.HEAT_COOL)
+                if heat_mode := capabilities.heat_mode():
+                    await self._set_hvac_mode(climate_entity, heat_mode)
 
     async def _control_temperature(
         self, climate_entity: str, mode: str, is_summer: bool
     ) -> None:
         """Control thermostat via hvac_mode + temperature (legacy mode)."""
         state = self.hass.states.get(climate_entity)
-        if not state:
+        capabilities = self._capabilities
+        if not state or capabilities is None:
             return
 
-        hvac_modes = state.attributes.get("hvac_modes", [])
-        is_reversible = HVACMode.COOL in hvac_modes
+        is_reversible = capabilities.reversible
 
         if is_summer:
             if mode == MODE_FROST_PROTECTION:
@@ -323,11 +290,14 @@ class ThermostatController:
 
         # Set temperature if needed
         if target_temp is not None:
+            target_temp = capabilities.clamp_temperature(target_temp)
             if current_temp is None or abs(current_temp - target_temp) >= 0.5:
                 await self._set_temperature(climate_entity, target_temp)
 
     async def _set_hvac_mode(self, climate_entity: str, hvac_mode: HVACMode) -> None:
         """Set HVAC mode."""
+        if not self._dwell_allows(climate_entity):
+            return
         _LOGGER.debug(
             "Setting HVAC mode for %s in %s to %s",
             climate_entity,
@@ -335,16 +305,16 @@ class ThermostatController:
             hvac_mode,
         )
         try:
-            await self.hass.services.async_call(
+            await self.room_manager.coordinator.dispatcher.async_call(
                 CLIMATE_DOMAIN,
                 SERVICE_SET_HVAC_MODE,
                 {
                     "entity_id": climate_entity,
                     ATTR_HVAC_MODE: hvac_mode,
                 },
-                blocking=True,
             )
             self._current_hvac_mode = hvac_mode
+            self._dwell_record(climate_entity)
         except Exception as err:
             _LOGGER.error(
                 "Error setting HVAC mode for %s: %s",
@@ -354,6 +324,8 @@ class ThermostatController:
 
     async def _set_temperature(self, climate_entity: str, temperature: float) -> None:
         """Set target temperature."""
+        if not self._dwell_allows(climate_entity):
+            return
         _LOGGER.debug(
             "Setting temperature for %s in %s to %.1f°C",
             climate_entity,
@@ -361,16 +333,16 @@ class ThermostatController:
             temperature,
         )
         try:
-            await self.hass.services.async_call(
+            await self.room_manager.coordinator.dispatcher.async_call(
                 CLIMATE_DOMAIN,
                 SERVICE_SET_TEMPERATURE,
                 {
                     "entity_id": climate_entity,
                     ATTR_TEMPERATURE: temperature,
                 },
-                blocking=True,
             )
             self._target_temperature = temperature
+            self._dwell_record(climate_entity)
         except Exception as err:
             _LOGGER.error(
                 "Error setting temperature for %s: %s",
@@ -387,8 +359,8 @@ class ThermostatController:
             climate_entity: The climate entity to control
             reason: "window" for windows open, "away" for away mode
         """
-        # Detect preset support on first call
-        self._detect_preset_support(climate_entity)
+        self._load_capabilities(climate_entity)
+        self._dwell_guarded = False
 
         # Get control mode
         control_mode = self.room_config.get(
@@ -456,5 +428,7 @@ class ThermostatController:
             "target_temperature": self._target_temperature,
             "current_hvac_mode": self._current_hvac_mode,
             "current_preset": self._current_preset,
-            "available_presets": self._preset_modes,
+            "available_presets": (
+                self._capabilities.preset_modes if self._capabilities else []
+            ),
         }
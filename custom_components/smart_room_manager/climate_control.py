@@ -23,24 +23,19 @@ from homeassistant.core import HomeAssistant
 from .climate.fil_pilote_controller import FilPiloteController
 from .climate.thermostat_controller import ThermostatController
 from .const import (
-    ALARM_STATE_ARMED_AWAY,
     CLIMATE_MODE_FIL_PILOTE,
     CLIMATE_MODE_THERMOSTAT_COOL,
     CLIMATE_MODE_THERMOSTAT_HEAT,
     CLIMATE_MODE_THERMOSTAT_HEAT_COOL,
     CLIMATE_TYPE_FIL_PILOTE,
     CLIMATE_TYPE_THERMOSTAT,
-    CONF_ALARM_ENTITY,
     CONF_ALLOW_EXTERNAL_IN_AWAY,
-    CONF_CLIMATE_BYPASS_SWITCH,
     CONF_CLIMATE_ENTITY,
     CONF_CLIMATE_MODE,
-    CONF_CLIMATE_WINDOW_CHECK,
     CONF_EXTERNAL_CONTROL_PRESET,
     CONF_EXTERNAL_CONTROL_SWITCH,
     CONF_EXTERNAL_CONTROL_TEMP,
     CONF_EXTERNAL_CONTROL_TEMP_SUMMER,
-    CONF_IGNORE_IN_AWAY,
     CONF_SEASON_CALENDAR,
     CONF_TEMP_COOL_COMFORT,
     DEFAULT_ALLOW_EXTERNAL_IN_AWAY,
@@ -48,21 +43,19 @@ from .const import (
     DEFAULT_EXTERNAL_CONTROL_PRESET,
     DEFAULT_EXTERNAL_CONTROL_TEMP,
     DEFAULT_EXTERNAL_CONTROL_TEMP_SUMMER,
-    PRIORITY_AWAY,
-    PRIORITY_BYPASS,
-    PRIORITY_EXTERNAL_CONTROL,
     PRIORITY_NORMAL,
-    PRIORITY_PAUSED,
-    PRIORITY_SCHEDULE,
-    PRIORITY_WINDOWS_OPEN,
-    ROOM_TYPE_BATHROOM,
 )
+from .rules import ACTION_APPLY, ACTION_EXTERNAL, ACTION_FROST_AWAY, ACTION_FROST_WINDOW
 
 if TYPE_CHECKING:
     from .room_manager import RoomManager
+    from .rules import RuleDecision
 
 _LOGGER = logging.getLogger(__name__)
 
+# Frost protection actions of the room rules -> reason
+FROST_REASONS = {ACTION_FROST_WINDOW: "window", ACTION_FROST_AWAY: "away"}
+
 
 class ClimateController:
     """Control climate/heating in a room - Refactored orchestrator."""
@@ -96,128 +89,78 @@ class ClimateController:
         self._fil_pilote_controller = None
         self._thermostat_controller = None
 
-    async def async_update(self) -> None:
-        """Update climate control logic with v0.3.0 priority system."""
-        climate_entity = self.room_config.get(CONF_CLIMATE_ENTITY)
+    @property
+    def climate_type(self) -> str | None:
+        """Return the climate type (None until the first update)."""
+        return self._climate_type
 
-        if not climate_entity:
-            self._current_priority = PRIORITY_NORMAL
-            return
+    @property
+    def priority(self) -> str:
+        """Return the priority of the last climate decision."""
+        return self._current_priority
 
-        # Detect climate type if not already done
-        if self._climate_type is None:
-            climate_mode = self.room_config.get(CONF_CLIMATE_MODE, DEFAULT_CLIMATE_MODE)
-            self._climate_type = self._detect_climate_type(climate_entity)
-            _LOGGER.info(
-                "Climate type for %s: %s (configured: %s, entity: %s)",
-                self.room_manager.room_name,
-                self._climate_type,
-                climate_mode,
-                climate_entity,
-            )
+    @property
+    def external_control_active(self) -> bool:
+        """Return True if external control held the room at the last check."""
+        return self._external_control_active
 
-        # PRIORITY 0.5: Check manual pause
-        if self.room_manager.is_paused():
-            _LOGGER.debug(
-                "⏸️ Manual pause active in %s - skipping automation",
-                self.room_manager.room_name,
-            )
-            self._current_priority = PRIORITY_PAUSED
-            return
-
-        # PRIORITY 1: Check bypass switch
-        bypass_switch = self.room_config.get(CONF_CLIMATE_BYPASS_SWITCH)
-        if bypass_switch:
-            bypass_state = self.hass.states.get(bypass_switch)
-            if bypass_state and bypass_state.state == STATE_ON:
-                _LOGGER.debug(
-                    "🔌 Climate bypass active (%s ON) in %s - skipping control",
-                    bypass_switch,
-                    self.room_manager.room_name,
-                )
-                self._current_priority = PRIORITY_BYPASS
-                return
+    @property
+    def fil_pilote(self) -> FilPiloteController | None:
+        """Return the Wire Pilot controller (None until it is used)."""
+        return self._fil_pilote_controller
 
-        # PRIORITY 2: Check windows
-        if self.room_config.get(CONF_CLIMATE_WINDOW_CHECK, True):
-            if self.room_manager.is_windows_open_delayed():
-                _LOGGER.debug(
-                    "🪟 Windows open in %s - setting frost protection",
-                    self.room_manager.room_name,
-                )
-                self._current_priority = PRIORITY_WINDOWS_OPEN
-                await self._set_frost_protection(climate_entity, reason="window")
-                return
+    async def async_update(self, decision: RuleDecision) -> None:
+        """Carry out the climate part of the room rules decision.
 
-        # PRIORITY 3: Check External Control (Solar Optimizer, etc.)
-        if await self._is_external_control_active():
-            _LOGGER.debug(
-                "🌞 External control active in %s - applying external control",
-                self.room_manager.room_name,
-            )
-            self._current_priority = PRIORITY_EXTERNAL_CONTROL
-            await self._apply_external_control(climate_entity)
-            return
+        Args:
+            decision: Outcome of the room rules, evaluated with the climate
+        """
+        watchdog = self.room_manager.coordinator.watchdog
+        with watchdog.measure(self.room_manager.room_name, "climate"):
+            climate_entity = self.room_config.get(CONF_CLIMATE_ENTITY)
 
-        # PRIORITY 4: Check away mode (alarm armed_away)
-        if self._is_away_mode():
-            # Check if schedule should be used even in away mode
-            ignore_in_away = self.room_config.get(CONF_IGNORE_IN_AWAY, False)
-            schedule_mode = self.room_manager.get_schedule_mode()
+            if not climate_entity:
+                self._current_priority = PRIORITY_NORMAL
+                return
 
-            if ignore_in_away and schedule_mode is not None:
-                # User wants schedule to work even when away
-                _LOGGER.debug(
-                    "🏠 Away mode in %s but ignore_in_away=True, using schedule: %s",
+            # Detect climate type if not already done
+            if self._climate_type is None:
+                climate_mode = self.room_config.get(
+                    CONF_CLIMATE_MODE, DEFAULT_CLIMATE_MODE
+                )
+                self._climate_type = self._detect_climate_type(climate_entity)
+                _LOGGER.info(
+                    "Climate type for %s: %s (configured: %s, entity: %s)",
                     self.room_manager.room_name,
-                    schedule_mode,
+                    self._climate_type,
+                    climate_mode,
+                    climate_entity,
                 )
-                self._current_priority = PRIORITY_SCHEDULE
-                is_summer = self._is_summer_mode()
-                await self._apply_mode(climate_entity, schedule_mode, is_summer)
-                return
 
+            # The room rules decided the priority (see rules.RULES)
+            rule = decision.climate_rule
             _LOGGER.debug(
-                "🏠 Away mode active in %s - setting frost protection",
+                "%s in %s (priority: %s, mode: %s)",
+                rule.label,
                 self.room_manager.room_name,
+                rule.priority,
+                decision.climate_mode,
             )
-            self._current_priority = PRIORITY_AWAY
-            await self._set_frost_protection(climate_entity, reason="away")
-            return
-
-        # PRIORITY 4.5: Bathroom special logic (light controls heating)
-        # For bathrooms, light state takes priority over schedule
-        if self.room_manager.room_type == ROOM_TYPE_BATHROOM:
-            mode = self.room_manager.get_current_mode()
-            _LOGGER.debug(
-                "🛁 Bathroom %s - light-based mode: %s",
-                self.room_manager.room_name,
-                mode,
-            )
-            self._current_priority = PRIORITY_NORMAL
-            is_summer = self._is_summer_mode()
-            await self._apply_mode(climate_entity, mode, is_summer)
-            return
-
-        # PRIORITY 5: Check schedule (calendar)
-        schedule_mode = self.room_manager.get_schedule_mode()
-        if schedule_mode is not None:
-            _LOGGER.debug(
-                "📅 Schedule active in %s - mode: %s",
-                self.room_manager.room_name,
-                schedule_mode,
-            )
-            self._current_priority = PRIORITY_SCHEDULE
-            is_summer = self._is_summer_mode()
-            await self._apply_mode(climate_entity, schedule_mode, is_summer)
-            return
+            self._current_priority = rule.priority
 
-        # PRIORITY 6: Normal logic
-        self._current_priority = PRIORITY_NORMAL
-        is_summer = self._is_summer_mode()
-        mode = self.room_manager.get_current_mode()
+            # Only the room mode may hold comfort power (frost, external control...)
+            if rule.action != ACTION_APPLY:
+                self.room_manager.coordinator.load_shedder.release(climate_entity)
 
-        await self._apply_mode(climate_entity, mode, is_summer)
+        if rule.action in FROST_REASONS:
+            await self._set_frost_protection(
+                climate_entity, reason=FROST_REASONS[rule.action]
+            )
+        elif rule.action == ACTION_EXTERNAL:
+            await self._apply_external_control(climate_entity)
+        elif rule.action == ACTION_APPLY:
+            is_summer = self.is_summer_mode()
+            await self._apply_mode(climate_entity, decision.climate_mode, is_summer)
 
     def _detect_climate_type(self, climate_entity: str) -> str:
         """Detect if climate entity is Fil Pilote (preset_mode) or thermostat (hvac_mode).
@@ -240,21 +183,23 @@ class ClimateController:
             return CLIMATE_TYPE_THERMOSTAT
 
         # Fallback: check entity state if climate_mode is not set or is "none"
-        state = self.hass.states.get(climate_entity)
-        if not state:
+        state_cache = self.room_manager.coordinator.state_cache
+        if state_cache.get_state(climate_entity) is None:
             _LOGGER.warning("Climate entity %s not found", climate_entity)
             return CLIMATE_TYPE_THERMOSTAT
 
         # Check if entity has Fil Pilote-style preset modes
-        preset_modes = state.attributes.get("preset_modes", [])
+        capabilities = state_cache.get_capabilities(climate_entity)
 
         # Fil Pilote has "comfort" and/or "eco" preset modes
-        if "comfort" in preset_modes or "eco" in preset_modes:
+        if capabilities.supports_preset("comfort") or capabilities.supports_preset(
+            "eco"
+        ):
             return CLIMATE_TYPE_FIL_PILOTE
 
         return CLIMATE_TYPE_THERMOSTAT
 
-    def _is_summer_mode(self) -> bool:
+    def is_summer_mode(self) -> bool:
         """Check if summer mode is active (from calendar)."""
         # Get season calendar from global config (entry.data)
         season_calendar = self.room_manager.coordinator.entry.data.get(
@@ -264,8 +209,7 @@ class ClimateController:
         if not season_calendar:
             return False
 
-        calendar_state = self.hass.states.get(season_calendar)
-        return calendar_state and calendar_state.state == STATE_ON
+        return self.room_manager.coordinator.state_cache.is_on(season_calendar)
 
     async def _apply_mode(
         self, climate_entity: str, mode: str, is_summer: bool
@@ -294,30 +238,33 @@ class ClimateController:
             controller = self._get_thermostat_controller()
             await controller.set_frost_protection(climate_entity, reason=reason)
 
-    async def _is_external_control_active(self) -> bool:
-        """Check if external control (Solar Optimizer, etc.) is active."""
-        external_switch = self.room_config.get(CONF_EXTERNAL_CONTROL_SWITCH)
-        if not external_switch:
-            self._external_control_active = False
-            return False
+    def is_external_control_active(self, is_away: bool) -> bool:
+        """Check if external control (Solar Optimizer, solar surplus) is active.
 
-        # Check if entity exists
-        state = self.hass.states.get(external_switch)
-        if not state:
+        Args:
+            is_away: Whether the alarm is armed away
+        """
+        # Native solar surplus boost, then the external switch
+        is_active = self.room_manager.coordinator.solar_surplus.is_boosted(
+            self.room_manager.room_id
+        )
+        external_switch = self.room_config.get(CONF_EXTERNAL_CONTROL_SWITCH)
+        if not is_active and external_switch:
+            # Check is_active attribute (primary) or state ON (fallback)
+            state = self.hass.states.get(external_switch)
+            if state:
+                is_active = state.attributes.get("is_active", False)
+                if not is_active:
+                    is_active = state.state.lower() == STATE_ON.lower()
+        if not is_active:
             self._external_control_active = False
             return False
 
-        # Check is_active attribute (primary) or state ON (fallback)
-        is_active = state.attributes.get("is_active", False)
-        if not is_active:
-            is_active = state.state.lower() == STATE_ON.lower()
-
         # Check if we should allow external control based on presence
         if is_active:
             allow_in_away = self.room_config.get(
                 CONF_ALLOW_EXTERNAL_IN_AWAY, DEFAULT_ALLOW_EXTERNAL_IN_AWAY
             )
-            is_away = self._is_away_mode()
 
             # If allow_in_away is True: external control ONLY works when away
             # If allow_in_away is False: external control works anytime
@@ -335,7 +282,7 @@ class ClimateController:
 
     async def _apply_external_control(self, climate_entity: str) -> None:
         """Apply external control preset/temperature."""
-        is_summer = self._is_summer_mode()
+        is_summer = self.is_summer_mode()
 
         if self._climate_type == CLIMATE_TYPE_FIL_PILOTE:
             # Fil Pilote (heater only): external control drives heating, skip in summer
@@ -360,16 +307,19 @@ class ClimateController:
                 preset,
             )
             try:
-                await self.hass.services.async_call(
+                await self.room_manager.coordinator.dispatcher.async_call(
                     CLIMATE_DOMAIN,
                     SERVICE_SET_PRESET_MODE,
                     {
                         "entity_id": climate_entity,
                         ATTR_PRESET_MODE: preset,
                     },
-                    blocking=True,
                 )
                 controller._current_preset = preset
+                # External control bypasses the dwell time but restarts it
+                self.room_manager.coordinator.dwell_guard.record(
+                    climate_entity, self.room_manager
+                )
             except Exception as err:
                 _LOGGER.error(
                     "Error setting external control preset for %s: %s",
@@ -379,11 +329,13 @@ class ClimateController:
         else:
             # Thermostat: respect summer mode for reversible units
             state = self.hass.states.get(climate_entity)
-            if not state:
+            capabilities = self.room_manager.coordinator.state_cache.get_capabilities(
+                climate_entity
+            )
+            if not state or capabilities is None:
                 return
 
-            hvac_modes = state.attributes.get("hvac_modes", [])
-            is_reversible = HVACMode.COOL in hvac_modes
+            is_reversible = capabilities.reversible
 
             if is_summer:
                 if not is_reversible:
@@ -414,14 +366,16 @@ class ClimateController:
             current_hvac = state.state
             if current_hvac != target_hvac:
                 try:
-                    await self.hass.services.async_call(
+                    await self.room_manager.coordinator.dispatcher.async_call(
                         CLIMATE_DOMAIN,
                         SERVICE_SET_HVAC_MODE,
                         {
                             "entity_id": climate_entity,
                             ATTR_HVAC_MODE: target_hvac,
                         },
-                        blocking=True,
+                    )
+                    self.room_manager.coordinator.dwell_guard.record(
+                        climate_entity, self.room_manager
                     )
                 except Exception as err:
                     _LOGGER.error(
@@ -431,6 +385,7 @@ class ClimateController:
                     )
                     return
 
+            target_temp = capabilities.clamp_temperature(target_temp)
             current_temp = state.attributes.get(ATTR_TEMPERATURE)
             if current_temp is None or abs(current_temp - target_temp) >= 0.5:
                 _LOGGER.debug(
@@ -439,16 +394,18 @@ class ClimateController:
                     target_temp,
                 )
                 try:
-                    await self.hass.services.async_call(
+                    await self.room_manager.coordinator.dispatcher.async_call(
                         CLIMATE_DOMAIN,
                         SERVICE_SET_TEMPERATURE,
                         {
                             "entity_id": climate_entity,
                             ATTR_TEMPERATURE: target_temp,
                         },
-                        blocking=True,
                     )
                     controller._target_temperature = target_temp
+                    self.room_manager.coordinator.dwell_guard.record(
+                        climate_entity, self.room_manager
+                    )
                 except Exception as err:
                     _LOGGER.error(
                         "Error setting external control temperature for %s: %s",
@@ -456,15 +413,6 @@ class ClimateController:
                         err,
                     )
 
-    def _is_away_mode(self) -> bool:
-        """Check if alarm is in armed_away mode."""
-        alarm_entity = self.room_manager.coordinator.entry.data.get(CONF_ALARM_ENTITY)
-        if not alarm_entity:
-            return False
-
-        alarm_state = self.hass.states.get(alarm_entity)
-        return alarm_state and alarm_state.state == ALARM_STATE_ARMED_AWAY
-
     def _get_fil_pilote_controller(self) -> FilPiloteController:
         """Get or create Fil Pilote controller (lazy load)."""
         if self._fil_pilote_controller is None:
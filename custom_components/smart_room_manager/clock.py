@@ -0,0 +1,122 @@
+"""Clock sources for Smart Room Manager time-dependent logic."""
+
+from __future__ import annotations
+
+import heapq
+import inspect
+import itertools
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_call_later, async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+
+class Clock:
+    """Wall clock (default time source).
+
+    The coordinator captures the time once per refresh and passes it down to
+    the rooms, so every decision taken during a tick sees the same "now".
+    Timers go through the clock too, which allows swapping it for a
+    VirtualClock in simulations and offline replays.
+    """
+
+    def now(self) -> datetime:
+        """Return the current local time."""
+        return dt_util.now()
+
+    def utcnow(self) -> datetime:
+        """Return the current UTC time."""
+        return dt_util.utcnow()
+
+    def async_call_later(
+        self,
+        hass: HomeAssistant,
+        delay: float,
+        action: Callable[[datetime], Any],
+    ) -> CALLBACK_TYPE:
+        """Run an action after a delay (seconds). Returns a cancel callback."""
+        return async_call_later(hass, delay, action)
+
+    def async_call_at(
+        self,
+        hass: HomeAssistant,
+        when: datetime,
+        action: Callable[[datetime], Any],
+    ) -> CALLBACK_TYPE:
+        """Run an action at a point in time. Returns a cancel callback."""
+        return async_track_point_in_time(hass, action, when)
+
+
+class VirtualClock(Clock):
+    """Manually advanced clock for simulations and tests.
+
+    Time only moves when async_advance_to() is called; timers scheduled
+    through the clock fire in chronological order while advancing, each one
+    seeing its own scheduled time as "now".
+    """
+
+    def __init__(self, start: datetime) -> None:
+        """Initialize the clock at a start time (timezone-aware)."""
+        self._utcnow = dt_util.as_utc(start)
+        self._timers: list[tuple[datetime, int, Callable[[datetime], Any]]] = []
+        self._cancelled: set[int] = set()
+        self._sequence = itertools.count()
+
+    def now(self) -> datetime:
+        """Return the virtual local time."""
+        return dt_util.as_local(self._utcnow)
+
+    def utcnow(self) -> datetime:
+        """Return the virtual UTC time."""
+        return self._utcnow
+
+    def async_call_later(
+        self,
+        hass: HomeAssistant,
+        delay: float,
+        action: Callable[[datetime], Any],
+    ) -> CALLBACK_TYPE:
+        """Schedule an action after a virtual delay (seconds)."""
+        return self.async_call_at(hass, self._utcnow + timedelta(seconds=delay), action)
+
+    def async_call_at(
+        self,
+        hass: HomeAssistant,
+        when: datetime,
+        action: Callable[[datetime], Any],
+    ) -> CALLBACK_TYPE:
+        """Schedule an action at a virtual point in time."""
+        sequence = next(self._sequence)
+        heapq.heappush(self._timers, (dt_util.as_utc(when), sequence, action))
+
+        def cancel() -> None:
+            self._cancelled.add(sequence)
+
+        return cancel
+
+    @property
+    def next_timer(self) -> datetime | None:
+        """Return the time of the next pending timer (None if none)."""
+        while self._timers and self._timers[0][1] in self._cancelled:
+            self._cancelled.discard(heapq.heappop(self._timers)[1])
+        return self._timers[0][0] if self._timers else None
+
+    async def async_advance_to(self, when: datetime) -> None:
+        """Move the clock forward, firing the timers due on the way."""
+        when = dt_util.as_utc(when)
+        while (next_timer := self.next_timer) is not None and next_timer <= when:
+            fire_at, _sequence, action = heapq.heappop(self._timers)
+            self._utcnow = max(self._utcnow, fire_at)
+            result = action(self.now())
+            if inspect.isawaitable(result):
+                await result
+
+        if when > self._utcnow:
+            self._utcnow = when
+
+    async def async_advance(self, delta: timedelta) -> None:
+        """Move the clock forward by a duration."""
+        await self.async_advance_to(self._utcnow + delta)
@@ -0,0 +1,450 @@
+"""Rate-limited and verified command dispatch for Smart Room Manager."""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import random
+from collections.abc import Callable
+from datetime import datetime
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.climate import (
+    ATTR_HVAC_MODE,
+    ATTR_PRESET_MODE,
+    SERVICE_SET_HVAC_MODE,
+    SERVICE_SET_PRESET_MODE,
+    SERVICE_SET_TEMPERATURE,
+)
+from homeassistant.const import (
+    ATTR_TEMPERATURE,
+    SERVICE_TOGGLE,
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+    STATE_OFF,
+    STATE_ON,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, State, callback
+from homeassistant.helpers import entity_registry as er
+
+from .const import (
+    COMMAND_RETRY_MAX_DELAY,
+    CONF_COMMAND_BURST,
+    CONF_COMMAND_JITTER,
+    CONF_COMMAND_RATE,
+    CONF_COMMAND_RATE_LIMITS,
+    CONF_COMMAND_RETRIES,
+    CONF_COMMAND_VERIFY_TIMEOUT,
+    DEFAULT_COMMAND_BURST,
+    DEFAULT_COMMAND_JITTER,
+    DEFAULT_COMMAND_RATE,
+    DEFAULT_COMMAND_RETRIES,
+    DEFAULT_COMMAND_VERIFY_TIMEOUT,
+    DEFAULT_TEMP_STEP,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import SmartRoomCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Services setting the same attribute of an entity (a later one supersedes)
+SERVICE_FAMILIES = {
+    SERVICE_TURN_ON: "state",
+    SERVICE_TURN_OFF: "state",
+    SERVICE_TOGGLE: "state",
+}
+
+
+def _temperature_reached(state: State, data: dict[str, Any], step: float) -> bool:
+    """Check a setpoint within the entity's step (devices round what they get)."""
+    temperature = state.attributes.get(ATTR_TEMPERATURE)
+    return temperature is not None and abs(temperature - data[ATTR_TEMPERATURE]) < step
+
+
+# Check that an entity reached the state a service asked for
+# (arguments: state, service data, temperature step of the entity)
+VERIFIERS: dict[str, Callable[[State, dict[str, Any], float], bool]] = {
+    SERVICE_SET_PRESET_MODE: lambda state, data, _step: (
+        state.attributes.get(ATTR_PRESET_MODE) == data[ATTR_PRESET_MODE]
+    ),
+    SERVICE_SET_HVAC_MODE: lambda state, data, _step: (
+        state.state == data[ATTR_HVAC_MODE]
+    ),
+    SERVICE_SET_TEMPERATURE: _temperature_reached,
+    SERVICE_TURN_ON: lambda state, _data, _step: state.state == STATE_ON,
+    SERVICE_TURN_OFF: lambda state, _data, _step: state.state == STATE_OFF,
+}
+
+Command = tuple[str, str, dict[str, Any]]  # (domain, service, service data)
+
+
+def parse_rate_limits(rate_limits_text: str | None) -> dict[str, float]:
+    """Parse per-integration rate limits from text format.
+
+    Format: "integration=rate, integration=rate" (commands per second)
+    Example: "zwave_js=1, rfxtrx=0.5"
+    """
+    rate_limits: dict[str, float] = {}
+    for item in (rate_limits_text or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            integration, rate = item.split("=")
+            rate_limits[integration.strip()] = float(rate)
+        except ValueError:
+            _LOGGER.warning("Invalid command rate limit format: %s", item)
+    return rate_limits
+
+
+def _entity_ids(service_data: dict[str, Any]) -> list[str]:
+    """Return the target entities of a command."""
+    entity_id = service_data["entity_id"]
+    return [entity_id] if isinstance(entity_id, str) else list(entity_id)
+
+
+def _command_key(service: str, service_data: dict[str, Any]) -> tuple[Any, str]:
+    """Return the (entity, attribute) slot a command sets."""
+    entity_id = service_data["entity_id"]
+    return (
+        entity_id if isinstance(entity_id, str) else tuple(entity_id),
+        SERVICE_FAMILIES.get(service, service),
+    )
+
+
+class _Bucket:
+    """Token bucket and pending commands of one integration."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated", "queue", "timer")
+
+    def __init__(self, rate: float, burst: int, now: datetime) -> None:
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+        # (entity, service family) -> (command, attempt), in sending order
+        self.queue: dict[tuple[Any, str], tuple[Command, int]] = {}
+        self.timer: CALLBACK_TYPE | None = None
+
+    def refill(self, now: datetime) -> None:
+        """Add the tokens earned since the last update."""
+        elapsed = (now - self.updated).total_seconds()
+        if elapsed > 0:
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+
+class _Verification:
+    """A sent command waiting to be checked on its entity."""
+
+    __slots__ = ("command", "attempt", "sent", "timer")
+
+    def __init__(
+        self, command: Command, attempt: int, sent: datetime, timer: CALLBACK_TYPE
+    ) -> None:
+        """Initialize the verification."""
+        self.command = command
+        self.attempt = attempt
+        self.sent = sent
+        self.timer = timer
+
+
+class CommandDispatcher:
+    """Send the room commands through a token bucket per integration.
+
+    A schedule boundary (22:00 night, alarm arming) makes every room send
+    its command in the same refresh. With a rate limit, each integration
+    (zwave_js, rfxtrx, mqtt... from the entity registry) sends at most
+    `burst` commands at once, then one command per 1/rate seconds; the
+    others wait in a FIFO queue drained by a single timer, optionally
+    spread by a random jitter. Commands to an entity leave in the order
+    they were issued, and a command still waiting is dropped when a newer
+    one sets the same attribute of the same entity (a light turned off
+    then on again before the first command left sends only the last one).
+
+    With retries enabled, every command sent is checked on its entity
+    after the verification timeout. A command that was lost (or failed)
+    is sent again, through the rate limit, with the timeout doubled each
+    time up to COMMAND_RETRY_MAX_DELAY, until the retries are exhausted. A
+    newer command for the same slot replaces the pending verification, so
+    there is at most one timer per entity attribute and nothing is polled.
+
+    Controllers keep their optimistic state: the command is theirs once
+    queued. Without rate limit nor retries, commands are sent directly.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: SmartRoomCoordinator) -> None:
+        """Initialize the dispatcher."""
+        self.hass = hass
+        self.coordinator = coordinator
+
+        self._buckets: dict[str, _Bucket | None] = {}  # None = unlimited
+        self._integrations: dict[str, str] = {}  # entity -> integration
+        self._rate_limits: dict[str, float] | None = None  # parsed overrides
+        self._verifications: dict[tuple[Any, str], _Verification] = {}
+        self._sending: dict[tuple[Any, str], int] = {}  # key -> latest send
+        self._send_seq = itertools.count()
+
+    @property
+    def rate_limited(self) -> bool:
+        """Return True if any integration has a rate limit."""
+        data = self.coordinator.entry.data
+        return bool(
+            data.get(CONF_COMMAND_RATE, DEFAULT_COMMAND_RATE)
+            or data.get(CONF_COMMAND_RATE_LIMITS)
+        )
+
+    @property
+    def retries(self) -> int:
+        """Return how many times a lost command is sent again (0 = disabled)."""
+        return int(
+            self.coordinator.entry.data.get(
+                CONF_COMMAND_RETRIES, DEFAULT_COMMAND_RETRIES
+            )
+            or 0
+        )
+
+    @property
+    def jitter(self) -> float:
+        """Return the maximum random delay of a queued command (s)."""
+        return float(
+            self.coordinator.entry.data.get(CONF_COMMAND_JITTER, DEFAULT_COMMAND_JITTER)
+            or 0
+        )
+
+    def _integration(self, entity_id: str) -> str:
+        """Return the integration providing an entity (its domain if unknown)."""
+        integration = self._integrations.get(entity_id)
+        if integration is None:
+            entry = er.async_get(self.hass).async_get(entity_id)
+            integration = entry.platform if entry else entity_id.split(".")[0]
+            self._integrations[entity_id] = integration
+        return integration
+
+    def _bucket(self, integration: str) -> _Bucket | None:
+        """Return the bucket of an integration (None if unlimited)."""
+        if integration in self._buckets:
+            return self._buckets[integration]
+        data = self.coordinator.entry.data
+        if self._rate_limits is None:
+            self._rate_limits = parse_rate_limits(data.get(CONF_COMMAND_RATE_LIMITS))
+        rate = self._rate_limits.get(
+            integration, data.get(CONF_COMMAND_RATE, DEFAULT_COMMAND_RATE)
+        )
+        bucket = None
+        if rate and rate > 0:
+            burst = int(data.get(CONF_COMMAND_BURST, DEFAULT_COMMAND_BURST) or 1)
+            bucket = _Bucket(rate, max(1, burst), self.coordinator.clock.now())
+            _LOGGER.debug(
+                "📡 %s commands limited to %.2f/s (burst %d)", integration, rate, burst
+            )
+        self._buckets[integration] = bucket
+        return bucket
+
+    async def async_call(
+        self, domain: str, service: str, service_data: dict[str, Any]
+    ) -> None:
+        """Send a command now or queue it behind the rate limit.
+
+        Errors of a command sent now are raised to the caller; errors of a
+        queued command are logged when it is sent.
+        """
+        await self._async_dispatch((domain, service, service_data), 0)
+
+    async def _async_dispatch(self, command: Command, attempt: int) -> None:
+        """Send or queue a command (attempt 0 is the first sending)."""
+        domain, service, service_data = command
+        key = _command_key(service, service_data)
+        verification = self._verifications.pop(key, None)
+        if verification is not None:
+            # A newer command (or its retry) takes over the check
+            verification.timer()
+
+        integration = None
+        bucket = None
+        if self.rate_limited:
+            integration = self._integration(_entity_ids(service_data)[0])
+            bucket = self._bucket(integration)
+        if integration is None or bucket is None:
+            await self._async_send(key, command, attempt)
+            return
+
+        bucket.refill(self.coordinator.clock.now())
+        if not bucket.queue and bucket.tokens >= 1 and not self.jitter:
+            bucket.tokens -= 1
+            await self._async_send(key, command, attempt)
+            return
+
+        pending = bucket.queue.get(key)
+        if pending is not None and pending[0] == command:
+            # Already waiting (the room asked again before it left)
+            return
+        if pending is not None:
+            # Superseded: the newer command goes behind the others
+            del bucket.queue[key]
+            _LOGGER.debug("📡 %s %s superseded by %s", pending[0][1], key[0], service)
+        bucket.queue[key] = (command, attempt)
+        self._arm(integration, bucket)
+
+    async def _async_send(
+        self, key: tuple[Any, str], command: Command, attempt: int
+    ) -> None:
+        """Call the service, then schedule the check of its result."""
+        domain, service, service_data = command
+        seq = self._sending[key] = next(self._send_seq)
+        try:
+            await self.hass.services.async_call(
+                domain, service, service_data, blocking=True
+            )
+        finally:
+            # Only the latest send of a key is checked: one sent while this
+            # call was awaiting supersedes it
+            latest = self._sending.get(key) == seq
+            if latest:
+                del self._sending[key]
+            # Failed calls are checked (and retried) like lost ones
+            if latest and self.retries and service in VERIFIERS:
+                timeout = self.coordinator.entry.data.get(
+                    CONF_COMMAND_VERIFY_TIMEOUT, DEFAULT_COMMAND_VERIFY_TIMEOUT
+                )
+                delay = min(timeout * 2**attempt, COMMAND_RETRY_MAX_DELAY)
+                # A check stored since (drain, retry) is replaced, not orphaned
+                previous = self._verifications.pop(key, None)
+                if previous is not None:
+                    previous.timer()
+                self._verifications[key] = _Verification(
+                    command,
+                    attempt,
+                    self.coordinator.clock.now(),
+                    self.coordinator.clock.async_call_later(
+                        self.hass, delay, partial(self._async_verify, key)
+                    ),
+                )
+
+    def _step(self, entity_id: str) -> float:
+        """Return the setpoint step of a climate (DEFAULT_TEMP_STEP if unknown)."""
+        capabilities = self.coordinator.state_cache.get_capabilities(entity_id)
+        return (capabilities and capabilities.temp_step) or DEFAULT_TEMP_STEP
+
+    def _reached(self, verification: _Verification) -> bool:
+        """Check if every target entity is in the commanded state."""
+        _domain, service, service_data = verification.command
+        verifier = VERIFIERS[service]
+        for entity_id in _entity_ids(service_data):
+            state = self.hass.states.get(entity_id)
+            if state is None:
+                continue
+            # Only setpoints need the step (the climate's capability profile)
+            step = (
+                self._step(entity_id)
+                if service == SERVICE_SET_TEMPERATURE
+                else DEFAULT_TEMP_STEP
+            )
+            if verifier(state, service_data, step):
+                continue
+            if service in SERVICE_FAMILIES and state.last_changed > verification.sent:
+                # Switched back by someone else since: not a lost command
+                continue
+            return False
+        return True
+
+    async def _async_verify(self, key: tuple[Any, str], _now: Any) -> None:
+        """Send a command again if its entity did not follow."""
+        verification = self._verifications.pop(key, None)
+        if verification is None:
+            return
+        if self._reached(verification):
+            return
+
+        command, attempt = verification.command, verification.attempt
+        domain, service, service_data = command
+        if attempt >= self.retries:
+            _LOGGER.warning(
+                "📡 %s did not apply %s.%s after %d retries",
+                key[0],
+                domain,
+                service,
+                attempt,
+            )
+            return
+
+        _LOGGER.info(
+            "📡 %s did not apply %s.%s - sending again (retry %d/%d)",
+            key[0],
+            domain,
+            service,
+            attempt + 1,
+            self.retries,
+        )
+        try:
+            await self._async_dispatch(command, attempt + 1)
+        except Exception as err:
+            _LOGGER.error(
+                "Error calling %s.%s for %s: %s",
+                domain,
+                service,
+                service_data["entity_id"],
+                err,
+            )
+
+    def _arm(self, integration: str, bucket: _Bucket) -> None:
+        """Arm the drain timer of a bucket at its next token."""
+        if bucket.timer or not bucket.queue:
+            return
+        delay = max(0.0, (1 - bucket.tokens) / bucket.rate)
+        if self.jitter:
+            delay += random.uniform(0, self.jitter)
+        bucket.timer = self.coordinator.clock.async_call_later(
+            self.hass, delay, partial(self._async_drain, integration)
+        )
+
+    async def _async_drain(self, integration: str, _now: Any) -> None:
+        """Send the queued commands the bucket allows."""
+        bucket = self._buckets.get(integration)
+        if bucket is None:
+            return
+        bucket.timer = None
+        bucket.refill(self.coordinator.clock.now())
+        while bucket.queue and bucket.tokens >= 1:
+            key = next(iter(bucket.queue))
+            command, attempt = bucket.queue.pop(key)
+            bucket.tokens -= 1
+            try:
+                await self._async_send(key, command, attempt)
+            except Exception as err:
+                domain, service, service_data = command
+                _LOGGER.error(
+                    "Error calling %s.%s for %s: %s",
+                    domain,
+                    service,
+                    service_data["entity_id"],
+                    err,
+                )
+            if self.jitter:
+                # One command per draw of the jitter
+                break
+        if bucket.queue:
+            _LOGGER.debug(
+                "📡 %d %s command(s) waiting (rate limit)",
+                len(bucket.queue),
+                integration,
+            )
+        self._arm(integration, bucket)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the timers (queued commands and checks are dropped)."""
+        for bucket in self._buckets.values():
+            if bucket is None:
+                continue
+            if bucket.timer:
+                bucket.timer()
+                bucket.timer = None
+            bucket.queue.clear()
+        for verification in self._verifications.values():
+            verification.timer()
+        self._verifications.clear()
+        self._sending.clear()
@@ -31,20 +31,42 @@ from .const import (
     CONF_CLIMATE_ENTITY,
     CONF_CLIMATE_MODE,
     CONF_CLIMATE_WINDOW_CHECK,
+    CONF_COMMAND_BURST,
+    CONF_COMMAND_JITTER,
+    CONF_COMMAND_RATE,
+    CONF_COMMAND_RATE_LIMITS,
+    CONF_COMMAND_RETRIES,
+    CONF_COMMAND_VERIFY_TIMEOUT,
     CONF_DOOR_WINDOW_SENSORS,
+    CONF_EVALUATION_ENGINE,
     CONF_EXTERNAL_CONTROL_PRESET,
     CONF_EXTERNAL_CONTROL_SWITCH,
     CONF_EXTERNAL_CONTROL_TEMP,
     CONF_EXTERNAL_CONTROL_TEMP_SUMMER,
+    CONF_HEAT_DEMAND_OFF,
+    CONF_HEAT_DEMAND_ON,
+    CONF_HEAT_SOURCE_ENTITY,
+    CONF_HEATER_POWER,
+    CONF_HEATING_ZONE,
     CONF_HUMIDITY_SENSOR,
     CONF_HYSTERESIS,
     CONF_IGNORE_IN_AWAY,
+    CONF_LIGHT_GROUP,
     CONF_LIGHT_TIMEOUT,
     CONF_LIGHTS,
+    CONF_LOOP_WATCHDOG_THRESHOLD,
     CONF_MAX_SETPOINT,
+    CONF_MIN_DWELL_TIME,
     CONF_MIN_SETPOINT,
+    CONF_OCCUPANCY_LIGHTS_OFF,
+    CONF_OCCUPANCY_SENSORS,
+    CONF_OCCUPANCY_TIMEOUT,
+    CONF_OUTDOOR_TEMP_SENSOR,
     CONF_PAUSE_DURATION_MINUTES,
     CONF_PAUSE_INFINITE,
+    CONF_POWER_BUDGET,
+    CONF_POWER_METER_SENSOR,
+    CONF_PREHEAT,
     CONF_PRESET_AWAY,
     CONF_PRESET_COMFORT,
     CONF_PRESET_ECO,
@@ -54,6 +76,7 @@ from .const import (
     CONF_PRESET_SCHEDULE_OFF,
     CONF_PRESET_SCHEDULE_ON,
     CONF_PRESET_WINDOW,
+    CONF_ROOM_GROUPS,
     CONF_ROOM_ICON,
     CONF_ROOM_ID,
     CONF_ROOM_NAME,
@@ -62,6 +85,8 @@ from .const import (
     CONF_SCHEDULE_ENTITY,
     CONF_SEASON_CALENDAR,
     CONF_SETPOINT_INPUT,
+    CONF_SOLAR_BOOST,
+    CONF_SOLAR_EXPORT_SENSOR,
     CONF_SUMMER_POLICY,
     CONF_TEMP_COMFORT,
     CONF_TEMP_COOL_COMFORT,
@@ -70,23 +95,40 @@ from .const import (
     CONF_TEMP_FROST_PROTECTION,
     CONF_TEMP_NIGHT,
     CONF_TEMPERATURE_SENSOR,
+    CONF_TEMPERATURE_SMOOTHING,
     CONF_THERMOSTAT_CONTROL_MODE,
+    CONF_VACANCY_ECO_DELAY,
     CONF_VMC_ENTITY,
     CONF_VMC_TIMER,
     CONF_WINDOW_DELAY_CLOSE,
     CONF_WINDOW_DELAY_OPEN,
     DEFAULT_ALLOW_EXTERNAL_IN_AWAY,
     DEFAULT_CLIMATE_MODE,
+    DEFAULT_COMMAND_BURST,
+    DEFAULT_COMMAND_JITTER,
+    DEFAULT_COMMAND_RATE,
+    DEFAULT_COMMAND_RETRIES,
+    DEFAULT_COMMAND_VERIFY_TIMEOUT,
+    DEFAULT_EVALUATION_ENGINE,
     DEFAULT_EXTERNAL_CONTROL_PRESET,
     DEFAULT_EXTERNAL_CONTROL_TEMP,
     DEFAULT_EXTERNAL_CONTROL_TEMP_SUMMER,
+    DEFAULT_HEAT_DEMAND_OFF,
+    DEFAULT_HEAT_DEMAND_ON,
+    DEFAULT_HEATER_POWER,
     DEFAULT_HYSTERESIS,
     DEFAULT_LIGHT_TIMEOUT,
     DEFAULT_LIGHT_TIMEOUT_BATHROOM,
+    DEFAULT_LOOP_WATCHDOG_THRESHOLD,
     DEFAULT_MAX_SETPOINT,
+    DEFAULT_MIN_DWELL_TIME,
     DEFAULT_MIN_SETPOINT,
+    DEFAULT_OCCUPANCY_LIGHTS_OFF,
+    DEFAULT_OCCUPANCY_TIMEOUT,
     DEFAULT_PAUSE_DURATION,
     DEFAULT_PAUSE_INFINITE,
+    DEFAULT_POWER_BUDGET,
+    DEFAULT_PREHEAT,
     DEFAULT_PRESET_AWAY,
     DEFAULT_PRESET_COMFORT,
     DEFAULT_PRESET_ECO,
@@ -101,11 +143,15 @@ from .const import (
     DEFAULT_TEMP_ECO,
     DEFAULT_TEMP_FROST_PROTECTION,
     DEFAULT_TEMP_NIGHT,
+    DEFAULT_TEMPERATURE_SMOOTHING,
     DEFAULT_THERMOSTAT_CONTROL_MODE,
+    DEFAULT_VACANCY_ECO_DELAY,
     DEFAULT_VMC_TIMER,
     DEFAULT_WINDOW_DELAY_CLOSE,
     DEFAULT_WINDOW_DELAY_OPEN,
     DOMAIN,
+    ENGINE_BATCH,
+    ENGINE_PER_ROOM,
     FP_PRESET_AWAY,
     FP_PRESET_COMFORT,
     FP_PRESET_ECO,
@@ -232,6 +278,21 @@ def build_global_settings_schema(current_data: dict[str, Any]) -> vol.Schema:
             selector.EntitySelectorConfig(domain=["calendar", "binary_sensor"])
         )
 
+    # Outdoor temperature sensor (refines the pre-heating models)
+    outdoor = current_data.get(CONF_OUTDOOR_TEMP_SENSOR)
+    if outdoor is not None:
+        schema_dict[vol.Optional(CONF_OUTDOOR_TEMP_SENSOR, default=outdoor)] = (
+            selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain="sensor", device_class="temperature"
+                )
+            )
+        )
+    else:
+        schema_dict[vol.Optional(CONF_OUTDOOR_TEMP_SENSOR)] = selector.EntitySelector(
+            selector.EntitySelectorConfig(domain="sensor", device_class="temperature")
+        )
+
     # VMC entity (high speed switch)
     vmc = current_data.get(CONF_VMC_ENTITY)
     if vmc is not None:
@@ -261,6 +322,206 @@ def build_global_settings_schema(current_data: dict[str, Any]) -> vol.Schema:
         )
     )
 
+    # Heat source driven by the house heat demand (boiler, heat pump)
+    heat_source = current_data.get(CONF_HEAT_SOURCE_ENTITY)
+    if heat_source is not None:
+        schema_dict[vol.Optional(CONF_HEAT_SOURCE_ENTITY, default=heat_source)] = (
+            selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain=[SWITCH_DOMAIN, "input_boolean", CLIMATE_DOMAIN]
+                )
+            )
+        )
+    else:
+        schema_dict[vol.Optional(CONF_HEAT_SOURCE_ENTITY)] = selector.EntitySelector(
+            selector.EntitySelectorConfig(
+                domain=[SWITCH_DOMAIN, "input_boolean", CLIMATE_DOMAIN]
+            )
+        )
+
+    # Heat source hysteresis (% of heated rooms asking heat)
+    for key, default in (
+        (CONF_HEAT_DEMAND_ON, DEFAULT_HEAT_DEMAND_ON),
+        (CONF_HEAT_DEMAND_OFF, DEFAULT_HEAT_DEMAND_OFF),
+    ):
+        schema_dict[vol.Optional(key, default=current_data.get(key, default))] = (
+            selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=100,
+                    step=5,
+                    mode=selector.NumberSelectorMode.SLIDER,
+                    unit_of_measurement="%",
+                )
+            )
+        )
+
+    # Power budget of the Wire Pilot heaters in comfort (0 = no load shedding)
+    schema_dict[
+        vol.Optional(
+            CONF_POWER_BUDGET,
+            default=current_data.get(CONF_POWER_BUDGET, DEFAULT_POWER_BUDGET),
+        )
+    ] = selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            max=36000,
+            step=100,
+            mode=selector.NumberSelectorMode.BOX,
+            unit_of_measurement="W",
+        )
+    )
+
+    # House power meter (the budget then excludes the other loads)
+    power_meter = current_data.get(CONF_POWER_METER_SENSOR)
+    if power_meter is not None:
+        schema_dict[vol.Optional(CONF_POWER_METER_SENSOR, default=power_meter)] = (
+            selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="sensor", device_class="power")
+            )
+        )
+    else:
+        schema_dict[vol.Optional(CONF_POWER_METER_SENSOR)] = selector.EntitySelector(
+            selector.EntitySelectorConfig(domain="sensor", device_class="power")
+        )
+
+    # Grid export power (solar surplus boost of the opted-in rooms)
+    solar_export = current_data.get(CONF_SOLAR_EXPORT_SENSOR)
+    if solar_export is not None:
+        schema_dict[vol.Optional(CONF_SOLAR_EXPORT_SENSOR, default=solar_export)] = (
+            selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="sensor", device_class="power")
+            )
+        )
+    else:
+        schema_dict[vol.Optional(CONF_SOLAR_EXPORT_SENSOR)] = selector.EntitySelector(
+            selector.EntitySelectorConfig(domain="sensor", device_class="power")
+        )
+
+    # Minimum time between two mode commands to a heater (0 = disabled)
+    schema_dict[
+        vol.Optional(
+            CONF_MIN_DWELL_TIME,
+            default=current_data.get(CONF_MIN_DWELL_TIME, DEFAULT_MIN_DWELL_TIME),
+        )
+    ] = selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            max=60,
+            step=1,
+            mode=selector.NumberSelectorMode.SLIDER,
+            unit_of_measurement="min",
+        )
+    )
+
+    # Command rate limit per integration (radio networks, 0 = unlimited)
+    schema_dict[
+        vol.Optional(
+            CONF_COMMAND_RATE,
+            default=current_data.get(CONF_COMMAND_RATE, DEFAULT_COMMAND_RATE),
+        )
+    ] = selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            max=20,
+            step=0.1,
+            mode=selector.NumberSelectorMode.BOX,
+            unit_of_measurement="/s",
+        )
+    )
+    schema_dict[
+        vol.Optional(
+            CONF_COMMAND_BURST,
+            default=current_data.get(CONF_COMMAND_BURST, DEFAULT_COMMAND_BURST),
+        )
+    ] = selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=1, max=20, step=1, mode=selector.NumberSelectorMode.BOX
+        )
+    )
+    schema_dict[
+        vol.Optional(
+            CONF_COMMAND_JITTER,
+            default=current_data.get(CONF_COMMAND_JITTER, DEFAULT_COMMAND_JITTER),
+        )
+    ] = selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            max=30,
+            step=0.5,
+            mode=selector.NumberSelectorMode.BOX,
+            unit_of_measurement="s",
+        )
+    )
+
+    # Per-integration rate limits - NO default, use suggested_value
+    schema_dict[
+        vol.Optional(
+            CONF_COMMAND_RATE_LIMITS,
+            description={"suggested_value": current_data.get(CONF_COMMAND_RATE_LIMITS)},
+        )
+    ] = selector.TextSelector()
+
+    # Check that commands were applied, resend lost ones (0 = disabled)
+    schema_dict[
+        vol.Optional(
+            CONF_COMMAND_RETRIES,
+            default=current_data.get(CONF_COMMAND_RETRIES, DEFAULT_COMMAND_RETRIES),
+        )
+    ] = selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0, max=5, step=1, mode=selector.NumberSelectorMode.BOX
+        )
+    )
+    schema_dict[
+        vol.Optional(
+            CONF_COMMAND_VERIFY_TIMEOUT,
+            default=current_data.get(
+                CONF_COMMAND_VERIFY_TIMEOUT, DEFAULT_COMMAND_VERIFY_TIMEOUT
+            ),
+        )
+    ] = selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=2,
+            max=120,
+            step=1,
+            mode=selector.NumberSelectorMode.BOX,
+            unit_of_measurement="s",
+        )
+    )
+
+    # Event-loop watchdog threshold (diagnostics, 0 = disabled)
+    schema_dict[
+        vol.Optional(
+            CONF_LOOP_WATCHDOG_THRESHOLD,
+            default=current_data.get(
+                CONF_LOOP_WATCHDOG_THRESHOLD, DEFAULT_LOOP_WATCHDOG_THRESHOLD
+            ),
+        )
+    ] = selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            max=500,
+            step=1,
+            mode=selector.NumberSelectorMode.BOX,
+            unit_of_measurement="ms",
+        )
+    )
+
+    # Evaluation engine (batch = vectorised, for very large installations)
+    schema_dict[
+        vol.Optional(
+            CONF_EVALUATION_ENGINE,
+            default=current_data.get(CONF_EVALUATION_ENGINE, DEFAULT_EVALUATION_ENGINE),
+        )
+    ] = selector.SelectSelector(
+        selector.SelectSelectorConfig(
+            options=[ENGINE_PER_ROOM, ENGINE_BATCH],
+            mode=selector.SelectSelectorMode.DROPDOWN,
+            translation_key="evaluation_engine",
+        )
+    )
+
     return vol.Schema(schema_dict)
 
 
@@ -330,6 +591,55 @@ def build_room_sensors_schema(room_data: dict[str, Any]) -> vol.Schema:
         )
     )
 
+    # Motion/presence sensors (multiple selector), room empty after the timeout
+    schema_dict[
+        vol.Optional(
+            CONF_OCCUPANCY_SENSORS,
+            default=room_data.get(CONF_OCCUPANCY_SENSORS) or [],
+        )
+    ] = selector.EntitySelector(
+        selector.EntitySelectorConfig(
+            domain=[BINARY_SENSOR_DOMAIN],
+            multiple=True,
+        )
+    )
+    schema_dict[
+        vol.Optional(
+            CONF_OCCUPANCY_TIMEOUT,
+            default=room_data.get(CONF_OCCUPANCY_TIMEOUT, DEFAULT_OCCUPANCY_TIMEOUT),
+        )
+    ] = selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=1,
+            max=60,
+            step=1,
+            mode=selector.NumberSelectorMode.SLIDER,
+            unit_of_measurement="min",
+        )
+    )
+    schema_dict[
+        vol.Optional(
+            CONF_VACANCY_ECO_DELAY,
+            default=room_data.get(CONF_VACANCY_ECO_DELAY, DEFAULT_VACANCY_ECO_DELAY),
+        )
+    ] = selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            max=240,
+            step=5,
+            mode=selector.NumberSelectorMode.BOX,
+            unit_of_measurement="min",
+        )
+    )
+    schema_dict[
+        vol.Optional(
+            CONF_OCCUPANCY_LIGHTS_OFF,
+            default=room_data.get(
+                CONF_OCCUPANCY_LIGHTS_OFF, DEFAULT_OCCUPANCY_LIGHTS_OFF
+            ),
+        )
+    ] = selector.BooleanSelector()
+
     # Temperature sensor - NO default, use suggested_value to show current
     # suggested_value shows the value in UI but doesn't force it when cleared
     schema_dict[
@@ -428,6 +738,22 @@ def build_room_actuators_schema(room_data: dict[str, Any]) -> vol.Schema:
         selector.EntitySelectorConfig(domain=[SWITCH_DOMAIN, "input_boolean"])
     )
 
+    # Native external control on the solar surplus (global export sensor)
+    schema_dict[
+        vol.Optional(
+            CONF_SOLAR_BOOST,
+            default=room_data.get(CONF_SOLAR_BOOST, False),
+        )
+    ] = selector.BooleanSelector()
+
+    # Heating zone - NO default, use suggested_value to show current
+    schema_dict[
+        vol.Optional(
+            CONF_HEATING_ZONE,
+            description={"suggested_value": room_data.get(CONF_HEATING_ZONE)},
+        )
+    ] = selector.TextSelector()
+
     # Note: VMC entity is now in global settings, not per-room
 
     return vol.Schema(schema_dict)
@@ -441,22 +767,33 @@ def build_light_config_schema(room_data: dict[str, Any], room_type: str) -> vol.
         else DEFAULT_LIGHT_TIMEOUT
     )
 
-    return vol.Schema(
-        {
-            vol.Optional(
-                CONF_LIGHT_TIMEOUT,
-                default=room_data.get(CONF_LIGHT_TIMEOUT, default_timeout),
-            ): selector.NumberSelector(
-                selector.NumberSelectorConfig(
-                    min=60,
-                    max=1800,
-                    step=30,
-                    mode=selector.NumberSelectorMode.SLIDER,
-                    unit_of_measurement="s",
-                )
-            ),
-        }
-    )
+    schema_dict = {
+        vol.Optional(
+            CONF_LIGHT_TIMEOUT,
+            default=room_data.get(CONF_LIGHT_TIMEOUT, default_timeout),
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=60,
+                max=1800,
+                step=30,
+                mode=selector.NumberSelectorMode.SLIDER,
+                unit_of_measurement="s",
+            )
+        ),
+    }
+
+    # Optional light group: one turn_off for the whole room when all lights expire
+    light_group = room_data.get(CONF_LIGHT_GROUP)
+    if light_group is not None:
+        schema_dict[vol.Optional(CONF_LIGHT_GROUP, default=light_group)] = (
+            selector.EntitySelector(selector.EntitySelectorConfig(domain="light"))
+        )
+    else:
+        schema_dict[vol.Optional(CONF_LIGHT_GROUP)] = selector.EntitySelector(
+            selector.EntitySelectorConfig(domain="light")
+        )
+
+    return vol.Schema(schema_dict)
 
 
 def build_climate_config_schema(
@@ -631,6 +968,23 @@ def build_fil_pilote_advanced_schema(room_data: dict[str, Any]) -> vol.Schema:
         )
     )
 
+    schema_dict[
+        vol.Optional(
+            CONF_TEMPERATURE_SMOOTHING,
+            default=room_data.get(
+                CONF_TEMPERATURE_SMOOTHING, DEFAULT_TEMPERATURE_SMOOTHING
+            ),
+        )
+    ] = selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            max=30,
+            step=1,
+            mode=selector.NumberSelectorMode.SLIDER,
+            unit_of_measurement="min",
+        )
+    )
+
     schema_dict[
         vol.Optional(
             CONF_MIN_SETPOINT,
@@ -777,6 +1131,22 @@ def build_fil_pilote_presets_schema(room_data: dict[str, Any]) -> vol.Schema:
         )
     )
 
+    # Rated power of the heater (load shedding, 0 = never shed)
+    schema_dict[
+        vol.Optional(
+            CONF_HEATER_POWER,
+            default=room_data.get(CONF_HEATER_POWER, DEFAULT_HEATER_POWER),
+        )
+    ] = selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            max=5000,
+            step=50,
+            mode=selector.NumberSelectorMode.BOX,
+            unit_of_measurement="W",
+        )
+    )
+
     # External Control configuration for Fil Pilote
     schema_dict[
         vol.Optional(
@@ -885,6 +1255,22 @@ def build_thermostat_advanced_schema(room_data: dict[str, Any]) -> vol.Schema:
         )
     ] = selector.BooleanSelector()
 
+    # Rated power of the heat pump/heater (solar surplus boost)
+    schema_dict[
+        vol.Optional(
+            CONF_HEATER_POWER,
+            default=room_data.get(CONF_HEATER_POWER, DEFAULT_HEATER_POWER),
+        )
+    ] = selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            max=5000,
+            step=50,
+            mode=selector.NumberSelectorMode.BOX,
+            unit_of_measurement="W",
+        )
+    )
+
     return vol.Schema(schema_dict)
 
 
@@ -1054,6 +1440,14 @@ def build_schedule_schema(room_data: dict[str, Any]) -> vol.Schema:
         )
     ] = selector.BooleanSelector()
 
+    # Start comfort early from the learned heat-up rate (needs a sensor)
+    schema_dict[
+        vol.Optional(
+            CONF_PREHEAT,
+            default=room_data.get(CONF_PREHEAT, DEFAULT_PREHEAT),
+        )
+    ] = selector.BooleanSelector()
+
     return vol.Schema(schema_dict)
 
 
@@ -1083,6 +1477,11 @@ def build_room_control_schema(room_data: dict[str, Any]) -> vol.Schema:
                 CONF_PAUSE_INFINITE,
                 default=room_data.get(CONF_PAUSE_INFINITE, DEFAULT_PAUSE_INFINITE),
             ): selector.BooleanSelector(),
+            # Room groups for the bulk services - suggested_value shows current
+            vol.Optional(
+                CONF_ROOM_GROUPS,
+                description={"suggested_value": room_data.get(CONF_ROOM_GROUPS)},
+            ): selector.TextSelector(selector.TextSelectorConfig(multiple=True)),
         }
     )
 
@@ -1273,6 +1672,16 @@ class SmartRoomManagerOptionsFlow(config_entries.OptionsFlow):
             # Door/window sensors (multiple - always in user_input)
             update_data = {
                 CONF_DOOR_WINDOW_SENSORS: user_input.get(CONF_DOOR_WINDOW_SENSORS, []),
+                CONF_OCCUPANCY_SENSORS: user_input.get(CONF_OCCUPANCY_SENSORS, []),
+                CONF_OCCUPANCY_TIMEOUT: user_input.get(
+                    CONF_OCCUPANCY_TIMEOUT, DEFAULT_OCCUPANCY_TIMEOUT
+                ),
+                CONF_VACANCY_ECO_DELAY: user_input.get(
+                    CONF_VACANCY_ECO_DELAY, DEFAULT_VACANCY_ECO_DELAY
+                ),
+                CONF_OCCUPANCY_LIGHTS_OFF: user_input.get(
+                    CONF_OCCUPANCY_LIGHTS_OFF, DEFAULT_OCCUPANCY_LIGHTS_OFF
+                ),
             }
 
             # With suggested_value, always process the field:
@@ -1298,7 +1707,8 @@ class SmartRoomManagerOptionsFlow(config_entries.OptionsFlow):
             data_schema=build_room_sensors_schema(self._current_room),
             description_placeholders={
                 "room_name": self._current_room[CONF_ROOM_NAME],
-                "info": "All optional. Windows → frost protection if open.",
+                "info": "All optional. Windows → frost protection if open, "
+                "empty room → eco.",
             },
         )
 
@@ -1339,11 +1749,21 @@ class SmartRoomManagerOptionsFlow(config_entries.OptionsFlow):
                     update_data[CONF_EXTERNAL_CONTROL_SWITCH] = external_switch
                 else:
                     self._current_room.pop(CONF_EXTERNAL_CONTROL_SWITCH, None)
+
+                update_data[CONF_SOLAR_BOOST] = user_input.get(CONF_SOLAR_BOOST, False)
+
+                heating_zone = (user_input.get(CONF_HEATING_ZONE) or "").strip()
+                if heating_zone:
+                    update_data[CONF_HEATING_ZONE] = heating_zone
+                else:
+                    self._current_room.pop(CONF_HEATING_ZONE, None)
             else:
                 # No climate: remove all climate-related settings
                 self._current_room.pop(CONF_CLIMATE_ENTITY, None)
                 self._current_room.pop(CONF_CLIMATE_BYPASS_SWITCH, None)
                 self._current_room.pop(CONF_EXTERNAL_CONTROL_SWITCH, None)
+                self._current_room.pop(CONF_SOLAR_BOOST, None)
+                self._current_room.pop(CONF_HEATING_ZONE, None)
 
             # Note: VMC entity is now in global settings, not per-room
 
@@ -1371,6 +1791,12 @@ class SmartRoomManagerOptionsFlow(config_entries.OptionsFlow):
                 self._current_room[CONF_LIGHT_TIMEOUT] = user_input.get(
                     CONF_LIGHT_TIMEOUT
                 )
+                light_group = user_input.get(CONF_LIGHT_GROUP)
+                if light_group:
+                    self._current_room[CONF_LIGHT_GROUP] = light_group
+                else:
+                    # Remove if was previously set but now empty
+                    self._current_room.pop(CONF_LIGHT_GROUP, None)
             return await self.async_step_room_climate_config()
 
         # Show timeout config only for corridor/bathroom
@@ -1498,6 +1924,9 @@ class SmartRoomManagerOptionsFlow(config_entries.OptionsFlow):
                 update_data[CONF_HYSTERESIS] = user_input.get(
                     CONF_HYSTERESIS, DEFAULT_HYSTERESIS
                 )
+                update_data[CONF_TEMPERATURE_SMOOTHING] = user_input.get(
+                    CONF_TEMPERATURE_SMOOTHING, DEFAULT_TEMPERATURE_SMOOTHING
+                )
                 update_data[CONF_MIN_SETPOINT] = user_input.get(
                     CONF_MIN_SETPOINT, DEFAULT_MIN_SETPOINT
                 )
@@ -1518,6 +1947,9 @@ class SmartRoomManagerOptionsFlow(config_entries.OptionsFlow):
                 update_data[CONF_HYSTERESIS] = user_input.get(
                     CONF_HYSTERESIS, DEFAULT_HYSTERESIS
                 )
+                update_data[CONF_TEMPERATURE_SMOOTHING] = user_input.get(
+                    CONF_TEMPERATURE_SMOOTHING, DEFAULT_TEMPERATURE_SMOOTHING
+                )
                 update_data[CONF_MIN_SETPOINT] = user_input.get(
                     CONF_MIN_SETPOINT, DEFAULT_MIN_SETPOINT
                 )
@@ -1566,6 +1998,9 @@ class SmartRoomManagerOptionsFlow(config_entries.OptionsFlow):
             update_data[CONF_PRESET_WINDOW] = user_input.get(
                 CONF_PRESET_WINDOW, DEFAULT_PRESET_WINDOW
             )
+            update_data[CONF_HEATER_POWER] = user_input.get(
+                CONF_HEATER_POWER, DEFAULT_HEATER_POWER
+            )
 
             # External Control configuration for Fil Pilote
             update_data[CONF_EXTERNAL_CONTROL_PRESET] = user_input.get(
@@ -1611,6 +2046,9 @@ class SmartRoomManagerOptionsFlow(config_entries.OptionsFlow):
             update_data[CONF_ALLOW_EXTERNAL_IN_AWAY] = user_input.get(
                 CONF_ALLOW_EXTERNAL_IN_AWAY, DEFAULT_ALLOW_EXTERNAL_IN_AWAY
             )
+            update_data[CONF_HEATER_POWER] = user_input.get(
+                CONF_HEATER_POWER, DEFAULT_HEATER_POWER
+            )
 
             self._current_room.update(update_data)
 
@@ -1704,6 +2142,11 @@ class SmartRoomManagerOptionsFlow(config_entries.OptionsFlow):
                 CONF_IGNORE_IN_AWAY, False
             )
 
+            # Predictive pre-heating
+            self._current_room[CONF_PREHEAT] = user_input.get(
+                CONF_PREHEAT, DEFAULT_PREHEAT
+            )
+
             return await self.async_step_room_control()
 
         return self.async_show_form(
@@ -1728,6 +2171,15 @@ class SmartRoomManagerOptionsFlow(config_entries.OptionsFlow):
             self._current_room[CONF_PAUSE_INFINITE] = user_input.get(
                 CONF_PAUSE_INFINITE, DEFAULT_PAUSE_INFINITE
             )
+            groups = [
+                group.strip()
+                for group in user_input.get(CONF_ROOM_GROUPS) or []
+                if group.strip()
+            ]
+            if groups:
+                self._current_room[CONF_ROOM_GROUPS] = groups
+            else:
+                self._current_room.pop(CONF_ROOM_GROUPS, None)
 
             return await self._save_room()
 
@@ -1846,7 +2298,16 @@ class SmartRoomManagerOptionsFlow(config_entries.OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> config_entries.FlowResult:
         """Configure global settings (v0.2.0 - alarm + season calendar + VMC)."""
+        errors: dict[str, str] = {}
+
         if user_input is not None:
+            # Stop threshold at or above the start one: source cycling each tick
+            demand_on = user_input.get(CONF_HEAT_DEMAND_ON, DEFAULT_HEAT_DEMAND_ON)
+            demand_off = user_input.get(CONF_HEAT_DEMAND_OFF, DEFAULT_HEAT_DEMAND_OFF)
+            if demand_off > 0 and demand_off >= demand_on:
+                errors[CONF_HEAT_DEMAND_OFF] = "heat_demand_thresholds"
+
+        if user_input is not None and not errors:
             # Update entry data (not options) for global settings
             # Note: This requires updating entry.data which is normally immutable
             # We create a new data dict
@@ -1854,8 +2315,46 @@ class SmartRoomManagerOptionsFlow(config_entries.OptionsFlow):
                 **self.config_entry.data,
                 CONF_ALARM_ENTITY: user_input.get(CONF_ALARM_ENTITY),
                 CONF_SEASON_CALENDAR: user_input.get(CONF_SEASON_CALENDAR),
+                CONF_OUTDOOR_TEMP_SENSOR: user_input.get(CONF_OUTDOOR_TEMP_SENSOR),
                 CONF_VMC_ENTITY: user_input.get(CONF_VMC_ENTITY),
                 CONF_VMC_TIMER: user_input.get(CONF_VMC_TIMER, DEFAULT_VMC_TIMER),
+                CONF_HEAT_SOURCE_ENTITY: user_input.get(CONF_HEAT_SOURCE_ENTITY),
+                CONF_HEAT_DEMAND_ON: user_input.get(
+                    CONF_HEAT_DEMAND_ON, DEFAULT_HEAT_DEMAND_ON
+                ),
+                CONF_HEAT_DEMAND_OFF: user_input.get(
+                    CONF_HEAT_DEMAND_OFF, DEFAULT_HEAT_DEMAND_OFF
+                ),
+                CONF_POWER_BUDGET: user_input.get(
+                    CONF_POWER_BUDGET, DEFAULT_POWER_BUDGET
+                ),
+                CONF_POWER_METER_SENSOR: user_input.get(CONF_POWER_METER_SENSOR),
+                CONF_SOLAR_EXPORT_SENSOR: user_input.get(CONF_SOLAR_EXPORT_SENSOR),
+                CONF_MIN_DWELL_TIME: user_input.get(
+                    CONF_MIN_DWELL_TIME, DEFAULT_MIN_DWELL_TIME
+                ),
+                CONF_COMMAND_RATE: user_input.get(
+                    CONF_COMMAND_RATE, DEFAULT_COMMAND_RATE
+                ),
+                CONF_COMMAND_BURST: user_input.get(
+                    CONF_COMMAND_BURST, DEFAULT_COMMAND_BURST
+                ),
+                CONF_COMMAND_JITTER: user_input.get(
+                    CONF_COMMAND_JITTER, DEFAULT_COMMAND_JITTER
+                ),
+                CONF_COMMAND_RATE_LIMITS: user_input.get(CONF_COMMAND_RATE_LIMITS),
+                CONF_COMMAND_RETRIES: user_input.get(
+                    CONF_COMMAND_RETRIES, DEFAULT_COMMAND_RETRIES
+                ),
+                CONF_COMMAND_VERIFY_TIMEOUT: user_input.get(
+                    CONF_COMMAND_VERIFY_TIMEOUT, DEFAULT_COMMAND_VERIFY_TIMEOUT
+                ),
+                CONF_LOOP_WATCHDOG_THRESHOLD: user_input.get(
+                    CONF_LOOP_WATCHDOG_THRESHOLD, DEFAULT_LOOP_WATCHDOG_THRESHOLD
+                ),
+                CONF_EVALUATION_ENGINE: user_input.get(
+                    CONF_EVALUATION_ENGINE, DEFAULT_EVALUATION_ENGINE
+                ),
             }
 
             # Update the config entry
@@ -1868,7 +2367,10 @@ class SmartRoomManagerOptionsFlow(config_entries.OptionsFlow):
 
         return self.async_show_form(
             step_id="global_settings",
-            data_schema=build_global_settings_schema(self.config_entry.data),
+            data_schema=build_global_settings_schema(
+                {**self.config_entry.data, **(user_input or {})}
+            ),
+            errors=errors,
             description_placeholders={
                 "info": "VMC: durée après extinction lumière SDB/WC.",
             },
@@ -50,6 +50,44 @@ CONF_CLIMATE_BYPASS_SWITCH: Final = "climate_bypass_switch"
 CONF_VMC_ENTITY: Final = "vmc_entity"  # switch or fan for VMC high speed (global)
 CONF_VMC_TIMER: Final = "vmc_timer"  # Timer duration in seconds after light off
 
+# Heat source driven by the aggregated heat demand - Global settings
+CONF_HEAT_SOURCE_ENTITY: Final = "heat_source_entity"  # boiler/heat pump (switch...)
+CONF_HEAT_DEMAND_ON: Final = "heat_demand_on"  # % of rooms asking heat to start
+CONF_HEAT_DEMAND_OFF: Final = "heat_demand_off"  # % of rooms asking heat to stop
+CONF_HEATING_ZONE: Final = "heating_zone"  # Per room, zone of the heat demand
+
+# Power budget of the Wire Pilot heaters (load shedding) - Global settings
+CONF_POWER_BUDGET: Final = "power_budget"  # W available to heaters (0 = disabled)
+CONF_POWER_METER_SENSOR: Final = "power_meter_sensor"  # House power (W), optional
+CONF_HEATER_POWER: Final = "heater_power"  # Per room, rated heater power (W)
+
+# Native solar surplus boost (grid export sensor) - Global settings
+CONF_SOLAR_EXPORT_SENSOR: Final = "solar_export_sensor"  # Grid export power (W)
+CONF_SOLAR_BOOST: Final = "solar_boost"  # Per room, external control on surplus
+
+# Event-loop watchdog (global setting, diagnostics)
+CONF_LOOP_WATCHDOG_THRESHOLD: Final = (
+    "loop_watchdog_threshold"  # ms, synchronous slice limit (0 = disabled)
+)
+
+# Minimum time between two mode commands to a heater (global setting)
+CONF_MIN_DWELL_TIME: Final = "min_dwell_time"  # minutes (0 = disabled)
+
+# Command rate limiting per integration (global settings)
+CONF_COMMAND_RATE: Final = "command_rate"  # commands/s (0 = unlimited)
+CONF_COMMAND_BURST: Final = "command_burst"  # commands sent at once
+CONF_COMMAND_JITTER: Final = "command_jitter"  # max random delay (s)
+CONF_COMMAND_RATE_LIMITS: Final = "command_rate_limits"  # "zwave_js=1, rfxtrx=0.5"
+
+# Command verification and retries (global settings)
+CONF_COMMAND_RETRIES: Final = "command_retries"  # resends if not applied (0 = off)
+CONF_COMMAND_VERIFY_TIMEOUT: Final = "command_verify_timeout"  # seconds
+
+# Evaluation engine (global setting, large installations)
+CONF_EVALUATION_ENGINE: Final = "evaluation_engine"
+ENGINE_PER_ROOM: Final = "per_room"  # Each room evaluated by its own controllers
+ENGINE_BATCH: Final = "batch"  # Vectorised pass over all rooms (requires numpy)
+
 # Fil Pilote Hysteresis configuration (Type 3b)
 CONF_SETPOINT_INPUT: Final = "setpoint_input"  # input_number entity for setpoint
 CONF_HYSTERESIS: Final = "hysteresis"  # Hysteresis value in °C
@@ -57,6 +95,9 @@ CONF_MIN_SETPOINT: Final = "min_setpoint"  # Minimum temperature setpoint
 CONF_MAX_SETPOINT: Final = "max_setpoint"  # Maximum temperature setpoint
 CONF_PRESET_HEAT: Final = "preset_heat"  # Preset when heating needed
 CONF_PRESET_IDLE: Final = "preset_idle"  # Preset when temperature OK
+CONF_TEMPERATURE_SMOOTHING: Final = (
+    "temperature_smoothing"  # minutes, EMA time constant (0 = raw readings)
+)
 
 # External Control configuration (Solar Optimizer, etc.)
 CONF_EXTERNAL_CONTROL_SWITCH: Final = "external_control_switch"  # Switch/binary_sensor
@@ -74,12 +115,16 @@ CONF_SCHEDULE_ENTITY: Final = "schedule_entity"  # calendar entity
 CONF_PRESET_SCHEDULE_ON: Final = "preset_schedule_on"  # Mode when event active
 CONF_PRESET_SCHEDULE_OFF: Final = "preset_schedule_off"  # Mode when no event
 CONF_IGNORE_IN_AWAY: Final = "ignore_in_away"  # Ignore schedule when away
+CONF_PREHEAT: Final = "preheat"  # Boolean, start comfort early (learned heat-up)
 
 # Manual Pause configuration
 CONF_PAUSE_DURATION_MINUTES: Final = (
     "pause_duration_minutes"  # 15, 30, 60, 120, 240, 480
 )
 CONF_PAUSE_INFINITE: Final = "pause_infinite"  # Boolean
+CONF_ROOM_GROUPS: Final = (
+    "room_groups"  # Group names (floor, wing...) for bulk services
+)
 
 # Window delays (Priority 2)
 CONF_WINDOW_DELAY_OPEN: Final = "window_delay_open"  # Minutes before reacting to open
@@ -87,6 +132,18 @@ CONF_WINDOW_DELAY_CLOSE: Final = (
     "window_delay_close"  # Minutes before resuming after close
 )
 
+# Occupancy sensors (motion/presence, event driven)
+CONF_OCCUPANCY_SENSORS: Final = "occupancy_sensors"  # Motion/presence binary sensors
+CONF_OCCUPANCY_TIMEOUT: Final = (
+    "occupancy_timeout"  # Minutes without detection before the room is empty
+)
+CONF_VACANCY_ECO_DELAY: Final = (
+    "vacancy_eco_delay"  # Minutes empty before eco (0 = never)
+)
+CONF_OCCUPANCY_LIGHTS_OFF: Final = (
+    "occupancy_lights_off"  # Turn the lights off once the room is empty
+)
+
 # Configurable presets (Priority 2)
 CONF_PRESET_COMFORT: Final = "preset_comfort"  # Fil Pilote preset for comfort mode
 CONF_PRESET_ECO: Final = "preset_eco"  # Fil Pilote preset for eco mode
@@ -105,6 +162,7 @@ CONF_LIGHT_TIMEOUT: Final = "light_timeout"
 CONF_LIGHT_NIGHT_MODE: Final = "light_night_mode"
 CONF_LIGHT_NIGHT_BRIGHTNESS: Final = "light_night_brightness"
 CONF_LIGHT_DAY_BRIGHTNESS: Final = "light_day_brightness"
+CONF_LIGHT_GROUP: Final = "light_group"  # Optional group turned off instead of members
 
 # Climate behavior configuration
 CONF_TEMP_COMFORT: Final = "temp_comfort"
@@ -127,6 +185,7 @@ CONF_COMFORT_TIME_RANGES: Final = (
 # Global configuration
 CONF_ALARM_ENTITY: Final = "alarm_entity"
 CONF_SEASON_CALENDAR: Final = "season_calendar"
+CONF_OUTDOOR_TEMP_SENSOR: Final = "outdoor_temp_sensor"  # Optional, for pre-heating
 
 # Fil Pilote preset modes (IPX800, etc.)
 # Real preset names: comfort, eco, away (hors-gel), none (off)
@@ -161,9 +220,58 @@ DEFAULT_LIGHT_DAY_BRIGHTNESS: Final = 100
 DEFAULT_VMC_TIMER: Final = 600  # 10 minutes
 DEFAULT_VMC_TIMER_BATHROOM: Final = 900  # 15 minutes
 
+# Default values - Heat demand
+DEFAULT_HEAT_DEMAND_ON: Final = 10  # % (start as soon as 1 room in 10 asks heat)
+DEFAULT_HEAT_DEMAND_OFF: Final = 0  # % (stop once no room asks heat)
+HEAT_DEMAND_MIN_GAP: Final = 5  # %, stop threshold kept below the start one
+
+# Default values - Load shedding
+DEFAULT_POWER_BUDGET: Final = 0  # W (disabled)
+DEFAULT_HEATER_POWER: Final = 0  # W (heater not managed)
+LOAD_SHED_AGING: Final = 1.0  # °C of priority gained per hour of waiting
+LOAD_SHED_ROTATION: Final = 1800  # seconds in comfort before yielding to waiters
+
+# Default values - Solar surplus boost
+SOLAR_START_MARGIN: Final = 100  # W still exported once a heater starts
+SOLAR_STOP_IMPORT: Final = 100  # W imported before boosted rooms stop
+SOLAR_SETTLE_TIME: Final = 30  # seconds for a switched heater to show on the meter
+SOLAR_MIN_ON: Final = 600  # seconds a boosted room stays boosted
+SOLAR_MIN_OFF: Final = 300  # seconds before a stopped room is boosted again
+
+# Default values - Event-loop watchdog
+DEFAULT_LOOP_WATCHDOG_THRESHOLD: Final = 0  # ms (0 = disabled)
+
+# Default values - Anti-short-cycle
+DEFAULT_MIN_DWELL_TIME: Final = 0  # minutes (disabled)
+
+# Default values - Command dispatch
+DEFAULT_COMMAND_RATE: Final = 0  # commands/s (unlimited)
+DEFAULT_COMMAND_BURST: Final = 3
+DEFAULT_COMMAND_JITTER: Final = 0  # seconds
+DEFAULT_COMMAND_RETRIES: Final = 0  # disabled
+DEFAULT_COMMAND_VERIFY_TIMEOUT: Final = 10  # seconds, doubled on each retry
+COMMAND_RETRY_MAX_DELAY: Final = 300  # seconds, cap of the backoff
+DEFAULT_TEMP_STEP: Final = 0.5  # °C, setpoint tolerance if no target_temp_step
+
+# Default values - Evaluation engine
+DEFAULT_EVALUATION_ENGINE: Final = ENGINE_PER_ROOM
+
 # Default values - Schedule
 DEFAULT_NIGHT_START: Final = "22:00:00"
 DEFAULT_DAY_START: Final = "06:00:00"  # End of night period
+CALENDAR_LOOKAHEAD_HORIZON: Final = 86400  # seconds (24 hours) of events fetched
+CALENDAR_REFRESH_INTERVAL: Final = 900  # seconds between incremental fetches
+
+# Default values - Pre-heating
+DEFAULT_PREHEAT: Final = False
+PREHEAT_SEGMENT: Final = 1800  # seconds of heating per learned rate sample
+PREHEAT_MEMORY: Final = 50  # samples, forgetting horizon of the heat-up model
+PREHEAT_MIN_SAMPLES: Final = 3  # samples before the model is used
+PREHEAT_MIN_RATE: Final = 0.2  # °C/h, floor of the predicted heat-up rate
+PREHEAT_MIN_DEFICIT: Final = 0.3  # °C below comfort to count as heating up
+PREHEAT_MAX_LEAD: Final = 10800  # seconds (3 hours), longest pre-heat
+PREHEAT_STORAGE_VERSION: Final = 1
+PREHEAT_SAVE_DELAY: Final = 60  # seconds, batches model writes to storage
 
 # Default values - Hysteresis
 DEFAULT_HYSTERESIS: Final = 0.5  # °C
@@ -171,6 +279,10 @@ DEFAULT_MIN_SETPOINT: Final = 17.0  # °C
 DEFAULT_MAX_SETPOINT: Final = 23.0  # °C
 DEFAULT_PRESET_HEAT: Final = FP_PRESET_COMFORT
 DEFAULT_PRESET_IDLE: Final = FP_PRESET_ECO
+DEFAULT_TEMPERATURE_SMOOTHING: Final = 0  # minutes (disabled)
+# Smoothed rooms already moving back towards the band at this rate (°C/h)
+# keep their preset while within one more hysteresis width
+TEMPERATURE_TREND_THRESHOLD: Final = 0.5
 
 # Default values - External Control
 DEFAULT_EXTERNAL_CONTROL_PRESET: Final = FP_PRESET_COMFORT
@@ -192,6 +304,11 @@ DEFAULT_THERMOSTAT_CONTROL_MODE: Final = THERMOSTAT_CONTROL_PRESET  # Use preset
 DEFAULT_WINDOW_DELAY_OPEN: Final = 2  # minutes
 DEFAULT_WINDOW_DELAY_CLOSE: Final = 2  # minutes
 
+# Default values - Occupancy
+DEFAULT_OCCUPANCY_TIMEOUT: Final = 5  # minutes
+DEFAULT_VACANCY_ECO_DELAY: Final = 30  # minutes
+DEFAULT_OCCUPANCY_LIGHTS_OFF: Final = False
+
 # Default values - Configurable presets (Priority 2)
 # These default to standard Fil Pilote presets, but can be overridden per room
 DEFAULT_PRESET_COMFORT: Final = FP_PRESET_COMFORT
@@ -258,6 +375,28 @@ ATTR_REMAINING_MINUTES: Final = "remaining_minutes"
 # Update intervals
 UPDATE_INTERVAL: Final = 30  # seconds
 
+# Light auto-off: lights due within this window share one turn_off call
+LIGHT_OFF_GROUPING_WINDOW: Final = 2  # seconds
+
+# Profiling service (diagnostics)
+SERVICE_PROFILE: Final = "profile"
+PROFILE_ENGINE_CPROFILE: Final = "cprofile"  # stdlib, always available
+PROFILE_ENGINE_YAPPI: Final = "yappi"  # optional, coroutine-aware
+PROFILE_FORMAT_PSTATS: Final = "pstats"
+PROFILE_FORMAT_CALLGRIND: Final = "callgrind"  # requires yappi
+DEFAULT_PROFILE_CYCLES: Final = 5
+
+# Room group services (bulk operations, one refresh)
+SERVICE_PAUSE_GROUP: Final = "pause_group"
+SERVICE_RESUME_GROUP: Final = "resume_group"
+SERVICE_FORCE_GROUP_MODE: Final = "force_group_mode"
+
+# Room mode override services (any rooms, kept across restarts)
+SERVICE_SET_ROOM_MODE: Final = "set_room_mode"
+SERVICE_CANCEL_ROOM_MODE: Final = "cancel_room_mode"
+OVERRIDE_STORAGE_VERSION: Final = 1
+OVERRIDE_SAVE_DELAY: Final = 5  # seconds, batches override writes to storage
+
 # Time periods (simplified)
 TIME_PERIOD_DAY: Final = "day"
 TIME_PERIOD_NIGHT: Final = "night"
@@ -273,7 +412,9 @@ PRIORITY_PAUSED: Final = "paused"
 PRIORITY_BYPASS: Final = "bypass"
 PRIORITY_WINDOWS_OPEN: Final = "windows_open"
 PRIORITY_EXTERNAL_CONTROL: Final = "external_control"
+PRIORITY_OVERRIDE: Final = "override"
 PRIORITY_AWAY: Final = "away"
+PRIORITY_VACANT: Final = "vacant"
 PRIORITY_SCHEDULE: Final = "schedule"
 PRIORITY_NORMAL: Final = "normal"
 
@@ -3,15 +3,46 @@
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
-from typing import Any
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import CONF_ROOMS, DOMAIN, UPDATE_INTERVAL
+from .batch_engine import BatchEvaluator
+from .calendar_lookahead import CalendarLookahead
+from .clock import Clock
+from .command_dispatch import CommandDispatcher
+from .const import (
+    CONF_EVALUATION_ENGINE,
+    CONF_LOOP_WATCHDOG_THRESHOLD,
+    CONF_ROOM_GROUPS,
+    CONF_ROOMS,
+    DEFAULT_EVALUATION_ENGINE,
+    DEFAULT_LOOP_WATCHDOG_THRESHOLD,
+    DOMAIN,
+    ENGINE_BATCH,
+    PREHEAT_SAVE_DELAY,
+    PREHEAT_STORAGE_VERSION,
+    UPDATE_INTERVAL,
+)
+from .dwell_guard import DwellGuard
+from .heat_demand import HeatDemandAggregator
+from .load_shedding import LoadShedder
+from .mode_override import ModeOverrides
+from .profiler import RefreshProfiler
 from .room_manager import RoomManager
+from .solar_surplus import SolarSurplusAllocator
+from .state_cache import EntityStateCache
+from .vmc_control import VmcArbiter
+from .watchdog import LoopWatchdog
+
+if TYPE_CHECKING:
+    from .switch import SmartRoomPauseSwitch
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,7 +50,9 @@ _LOGGER = logging.getLogger(__name__)
 class SmartRoomCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from rooms."""
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, clock: Clock | None = None
+    ) -> None:
         """Initialize coordinator."""
         super().__init__(
             hass,
@@ -30,6 +63,69 @@ class SmartRoomCoordinator(DataUpdateCoordinator):
         self.entry = entry
         self.room_managers: dict[str, RoomManager] = {}
 
+        # Single time source (swappable for a VirtualClock in simulations)
+        self.clock = clock or Clock()
+
+        # Pre-parsed entity states shared by all rooms
+        self.state_cache = EntityStateCache(hass)
+
+        # Opt-in profiling of refresh cycles (smart_room_manager.profile service)
+        self.profiler = RefreshProfiler(hass, self)
+
+        # Optional event-loop blocking detector (global setting)
+        self.watchdog = LoopWatchdog(
+            self,
+            entry.data.get(
+                CONF_LOOP_WATCHDOG_THRESHOLD, DEFAULT_LOOP_WATCHDOG_THRESHOLD
+            )
+            or 0,
+        )
+
+        # Optional vectorised engine for large installations (global setting)
+        self.batch_evaluator: BatchEvaluator | None = None
+        engine = entry.data.get(CONF_EVALUATION_ENGINE, DEFAULT_EVALUATION_ENGINE)
+        if engine == ENGINE_BATCH:
+            if BatchEvaluator.available():
+                self.batch_evaluator = BatchEvaluator(self)
+            else:
+                _LOGGER.warning(
+                    "Batch evaluation engine requires numpy - "
+                    "falling back to per-room evaluation"
+                )
+
+        # Rate-limited command queue per integration (radio networks)
+        self.dispatcher = CommandDispatcher(hass, self)
+
+        # Anti-short-cycle guard shared by all climate controllers
+        self.dwell_guard = DwellGuard(hass, self)
+
+        # House-wide VMC shared by all bathrooms (event driven)
+        self.vmc_arbiter = VmcArbiter(hass, self)
+
+        # House/zone heat demand, drives the shared heat source (if any)
+        self.heat_demand = HeatDemandAggregator(hass, self)
+
+        # Power budget shared by the Wire Pilot heaters in comfort
+        self.load_shedder = LoadShedder(hass, self)
+
+        # Rooms boosted with the solar surplus (native external control)
+        self.solar_surplus = SolarSurplusAllocator(hass, self)
+
+        # Forced room modes with their expiry (group services)
+        self.mode_overrides = ModeOverrides(hass, self)
+
+        # Pause switch of each room (registered by the switch platform)
+        self.pause_switches: dict[str, SmartRoomPauseSwitch] = {}
+
+        # Upcoming events of the schedule calendars, one fetch per calendar
+        self.calendar_lookahead = CalendarLookahead(hass, self)
+
+        # Learned heat-up models of the pre-heating rooms, kept across restarts
+        self._preheat_store: Store[dict[str, Any]] = Store(
+            hass, PREHEAT_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.preheat"
+        )
+        self._preheat_unsaved = False
+
         # Initialize room managers
         self._setup_room_managers()
 
@@ -67,14 +163,25 @@ class SmartRoomCoordinator(DataUpdateCoordinator):
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Update data via library."""
+        self.profiler.start_cycle()
         try:
-            data = {}
-            for room_id, room_manager in self.room_managers.items():
-                data[room_id] = await room_manager.async_update()
+            # Capture the time once: every room sees the same "now" this tick
+            now = self.clock.now()
+            if self.batch_evaluator is not None:
+                data = await self.batch_evaluator.async_evaluate(now)
+            else:
+                data = {}
+                for room_id, room_manager in self.room_managers.items():
+                    data[room_id] = await room_manager.async_update(now)
+
+            # The heat source reacts once to the demand of all rooms
+            await self.heat_demand.async_update()
             return data
         except Exception as err:
             _LOGGER.exception("Error updating Smart Room Manager data")
             raise UpdateFailed(f"Error communicating with API: {err}") from err
+        finally:
+            await self.profiler.async_end_cycle()
 
     @callback
     def async_add_listener(self, *args, **kwargs) -> None:
@@ -88,6 +195,22 @@ class SmartRoomCoordinator(DataUpdateCoordinator):
         """Shutdown coordinator and room managers."""
         _LOGGER.debug("Shutting down coordinator")
 
+        # Flush any running profiling session
+        await self.profiler.async_stop()
+
+        # Stop listening to bathroom lights
+        self.vmc_arbiter.async_shutdown()
+        self.dwell_guard.async_shutdown()
+        self.calendar_lookahead.async_shutdown()
+        self.load_shedder.async_shutdown()
+        self.solar_surplus.async_shutdown()
+        await self.mode_overrides.async_shutdown()
+        self.dispatcher.async_shutdown()
+
+        # Write the learned heat-up models now rather than after the save delay
+        if self._preheat_unsaved:
+            await self._preheat_store.async_save(self._preheat_models())
+
         # Shutdown all room managers first
         for room_manager in self.room_managers.values():
             await room_manager.async_shutdown()
@@ -98,8 +221,134 @@ class SmartRoomCoordinator(DataUpdateCoordinator):
             await super().async_shutdown()
 
     async def async_config_entry_first_refresh(self) -> None:
-        """Refresh data for the first time when a config entry is setup."""
-        await super().async_config_entry_first_refresh()
+        """Refresh data for the first time when a config entry is setup.
+
+        The listeners and timers started by async_setup are stopped again if
+        the setup or the first refresh fails (ConfigEntryNotReady retries
+        with a new coordinator).
+        """
+        try:
+            await self.async_setup()
+            await super().async_config_entry_first_refresh()
+        except Exception:
+            await self.async_shutdown()
+            raise
+
+    async def async_setup(self) -> None:
+        """Start event listeners (bathroom VMC, light auto-off timers)."""
+        await self.vmc_arbiter.async_setup()
+        await self.calendar_lookahead.async_setup()
+        self.load_shedder.async_setup()
+        self.solar_surplus.async_setup()
+        await self.mode_overrides.async_setup()
+        preheat_models = await self._preheat_store.async_load() or {}
+        for room_id, room_manager in self.room_managers.items():
+            room_manager.async_setup(preheat_models.get(room_id))
+
+    @callback
+    def async_schedule_preheat_save(self) -> None:
+        """Persist the heat-up models (batched, one write per delay)."""
+        self._preheat_unsaved = True
+        self._preheat_store.async_delay_save(self._preheat_models, PREHEAT_SAVE_DELAY)
+
+    @callback
+    def _preheat_models(self) -> dict[str, Any]:
+        """Return the heat-up models to persist, by room_id."""
+        self._preheat_unsaved = False
+        return {
+            room_id: room_manager.preheat.model.as_dict()
+            for room_id, room_manager in self.room_managers.items()
+            if room_manager.preheat.enabled
+        }
+
+    async def async_refresh_room(self, room_id: str) -> None:
+        """Re-evaluate a single room now (event-driven transitions)."""
+        await self.async_refresh_rooms([room_id])
+
+    async def async_refresh_rooms(self, room_ids: Iterable[str]) -> None:
+        """Re-evaluate some rooms now, then update the heat demand once."""
+        now = self.clock.now()
+        states: dict[str, Any] = {}
+        for room_id in room_ids:
+            room_manager = self.room_managers.get(room_id)
+            if room_manager is not None:
+                states[room_id] = await room_manager.async_update(now, force=True)
+        if not states:
+            return
+        await self.heat_demand.async_update()
+        if self.data is not None:
+            self.data.update(states)
+            self.async_update_listeners()
+
+    def get_group_room_ids(self, group: str) -> list[str]:
+        """Get the rooms of a room group (configuration order)."""
+        return [
+            room_id
+            for room_id, room_manager in self.room_managers.items()
+            if group in (room_manager.room_config.get(CONF_ROOM_GROUPS) or [])
+        ]
+
+    async def async_pause_rooms(
+        self, room_ids: list[str], duration: int | None = None
+    ) -> None:
+        """Pause rooms in one operation (one refresh for all of them).
+
+        Args:
+            room_ids: Rooms to pause
+            duration: Minutes (0 = no limit, None = duration of each room)
+        """
+        for room_id in room_ids:
+            pause_switch = self.pause_switches.get(room_id)
+            if pause_switch is not None:
+                pause_switch.start_pause(duration)
+        await self.async_refresh_rooms(room_ids)
+
+    async def async_resume_rooms(self, room_ids: list[str]) -> None:
+        """End the pause and forced mode of rooms (one refresh)."""
+        for room_id in room_ids:
+            pause_switch = self.pause_switches.get(room_id)
+            if pause_switch is not None and pause_switch.is_on:
+                pause_switch.end_pause()
+        self.mode_overrides.clear(room_ids)
+        await self.async_refresh_rooms(room_ids)
+
+    async def async_force_mode(
+        self, room_ids: list[str], mode: str, until: datetime
+    ) -> None:
+        """Force the mode of rooms until a given time (one refresh)."""
+        self.mode_overrides.set(room_ids, mode, until)
+        _LOGGER.info(
+            "✋ Mode %s forced for %d room(s) until %s",
+            mode,
+            len(room_ids),
+            until.strftime("%H:%M:%S"),
+        )
+        await self.async_refresh_rooms(room_ids)
+
+    async def async_cancel_mode(self, room_ids: list[str]) -> None:
+        """Cancel the forced mode of rooms (refreshes only those forced)."""
+        await self.async_refresh_rooms(self.mode_overrides.clear(room_ids))
+
+    def resolve_room_ids(self, rooms: list[str]) -> list[str]:
+        """Get the room_ids of rooms given by id or name (case-insensitive).
+
+        Raises:
+            HomeAssistantError: A room does not exist
+        """
+        by_name = {
+            room_manager.room_name.casefold(): room_id
+            for room_id, room_manager in self.room_managers.items()
+        }
+        room_ids: list[str] = []
+        for room in rooms:
+            room_id = (
+                room if room in self.room_managers else by_name.get(room.casefold())
+            )
+            if room_id is None:
+                raise HomeAssistantError(f"Unknown room: {room}")
+            if room_id not in room_ids:
+                room_ids.append(room_id)
+        return room_ids
 
     def get_room_manager(self, room_id: str) -> RoomManager | None:
         """Get room manager by room_id."""
@@ -0,0 +1,97 @@
+"""Minimum dwell time between heater commands for Smart Room Manager."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+from .const import CONF_MIN_DWELL_TIME, DEFAULT_MIN_DWELL_TIME
+
+if TYPE_CHECKING:
+    from .coordinator import SmartRoomCoordinator
+    from .room_manager import RoomManager
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DwellGuard:
+    """Anti-short-cycle guard shared by all climate controllers.
+
+    Each climate entity must stay in the state set by its last command for
+    the minimum dwell time before the next mode command is sent. A command
+    asked for earlier is not sent: a single timer re-evaluates the room at
+    the exact end of the dwell time, which sends whatever the room needs at
+    that moment (nothing if the inputs flapped back in the meantime).
+
+    Commands sent during the same evaluation belong to one transition (a
+    thermostat preset and its hvac mode) and are never deferred. Frost
+    protection (windows, away) and external control bypass the guard but
+    still start a new dwell period.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: SmartRoomCoordinator) -> None:
+        """Initialize the guard."""
+        self.hass = hass
+        self.coordinator = coordinator
+
+        self._last_command: dict[str, datetime] = {}  # entity -> evaluation time
+        self._timers: dict[str, CALLBACK_TYPE] = {}  # entity -> deferred refresh
+
+    @property
+    def min_dwell(self) -> timedelta:
+        """Return the minimum time between two commands (global setting)."""
+        minutes = self.coordinator.entry.data.get(
+            CONF_MIN_DWELL_TIME, DEFAULT_MIN_DWELL_TIME
+        )
+        return timedelta(minutes=minutes or 0)
+
+    def allow(self, entity_id: str, room_manager: RoomManager) -> bool:
+        """Check if a command may be sent now, deferring the room otherwise."""
+        min_dwell = self.min_dwell
+        last = self._last_command.get(entity_id)
+        now = room_manager.now
+        if not min_dwell or last is None or now == last or now - last >= min_dwell:
+            return True
+
+        if entity_id not in self._timers:
+            due = last + min_dwell
+            _LOGGER.debug(
+                "⏳ Command to %s in %s deferred until %s (minimum dwell time)",
+                entity_id,
+                room_manager.room_name,
+                due.strftime("%H:%M:%S"),
+            )
+            self._timers[entity_id] = self.coordinator.clock.async_call_at(
+                self.hass,
+                due,
+                partial(self._async_dwell_elapsed, entity_id, room_manager.room_id),
+            )
+        return False
+
+    def record(self, entity_id: str, room_manager: RoomManager) -> None:
+        """Start a new dwell period after a command was sent."""
+        self._last_command[entity_id] = room_manager.now
+        timer = self._timers.pop(entity_id, None)
+        if timer:
+            timer()
+
+    def deferred(self, entity_id: str) -> bool:
+        """Return True if a command to the entity is waiting for its dwell time."""
+        return entity_id in self._timers
+
+    async def _async_dwell_elapsed(
+        self, entity_id: str, room_id: str, _now: Any
+    ) -> None:
+        """Re-evaluate the room once the dwell time is over."""
+        self._timers.pop(entity_id, None)
+        await self.coordinator.async_refresh_room(room_id)
+
+    def async_shutdown(self) -> None:
+        """Cancel the pending re-evaluations."""
+        for timer in self._timers.values():
+            timer()
+        self._timers.clear()
@@ -31,3 +31,23 @@ class SmartRoomEntity(CoordinatorEntity):
             "model": "Smart Room Manager",
             "sw_version": VERSION,
         }
+
+
+class SmartRoomHouseEntity(CoordinatorEntity):
+    """Base entity for house-wide Smart Room Manager entities."""
+
+    def __init__(self, coordinator: SmartRoomCoordinator) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self._attr_has_entity_name = True
+
+    @property
+    def device_info(self):
+        """Return device information."""
+        return {
+            "identifiers": {(DOMAIN, self.coordinator.entry.entry_id)},
+            "name": "Smart Room Manager",
+            "manufacturer": "HA-SMART",
+            "model": "Smart Room Manager",
+            "sw_version": VERSION,
+        }
@@ -0,0 +1,153 @@
+"""Input fingerprint of a room evaluation for Smart Room Manager."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    CONF_ALARM_ENTITY,
+    CONF_CLIMATE_BYPASS_SWITCH,
+    CONF_CLIMATE_ENTITY,
+    CONF_EXTERNAL_CONTROL_SWITCH,
+    CONF_HYSTERESIS,
+    CONF_LIGHT_GROUP,
+    CONF_LIGHTS,
+    CONF_SCHEDULE_ENTITY,
+    CONF_SEASON_CALENDAR,
+    CONF_SETPOINT_INPUT,
+    CONF_TEMPERATURE_SENSOR,
+    DEFAULT_HYSTERESIS,
+    TEMPERATURE_TREND_THRESHOLD,
+)
+
+if TYPE_CHECKING:
+    from .room_manager import RoomManager
+
+
+class InputFingerprint:
+    """Everything a room evaluation depends on, as one comparable tuple.
+
+    The fingerprint holds the State objects of the entities the room reads
+    (Home Assistant creates a new State on every change, so comparing them
+    is an identity check), the time-based inputs (night, comfort range,
+    schedule event, pre-heating), the delayed window state, the occupancy,
+    a pending dwell time and the temperature bucket. When it matches the
+    previous tick the whole controller pass, actuator state checks included,
+    would take the same decision and send nothing, so the room keeps its
+    previous state.
+
+    The temperature bucket is the hysteresis zone of the reading around the
+    last setpoint (plus the trend direction near the band edges), which is
+    all the Wire Pilot hysteresis looks at, and the reading rounded to
+    0.1 °C for the hysteresis sensor.
+    """
+
+    def __init__(self, room_manager: RoomManager) -> None:
+        """Initialize and compile the fingerprint of a room."""
+        self.room_manager = room_manager
+        self._entities: tuple[str, ...] = ()
+        self._last: tuple[Any, ...] | None = None
+        self.skipped: int = 0
+        self.compile()
+
+    def compile(self) -> None:
+        """Select the entities read by the room from its configuration."""
+        room = self.room_manager
+        room_config = room.room_config
+        global_config = room.coordinator.entry.data
+        entities = [
+            f"switch.smart_room_{room.room_id}_pause",
+            global_config.get(CONF_ALARM_ENTITY),
+            global_config.get(CONF_SEASON_CALENDAR),
+            room_config.get(CONF_CLIMATE_ENTITY),
+            room_config.get(CONF_CLIMATE_BYPASS_SWITCH),
+            room_config.get(CONF_EXTERNAL_CONTROL_SWITCH),
+            room_config.get(CONF_SCHEDULE_ENTITY),
+            room_config.get(CONF_SETPOINT_INPUT),
+            room_config.get(CONF_LIGHT_GROUP),
+            *(room_config.get(CONF_LIGHTS) or []),
+        ]
+        self._entities = tuple(entity for entity in entities if entity)
+        self._last = None
+
+    def _temperature_bucket(self, now: datetime) -> tuple[Any, ...]:
+        """Return the hysteresis zone of the room temperature."""
+        room = self.room_manager
+        sensor = room.room_config.get(CONF_TEMPERATURE_SENSOR)
+        if not sensor:
+            return ()
+        temperature = room.coordinator.state_cache.get_float(sensor, "temperature")
+        if temperature is None:
+            return (None,)
+
+        trend = None
+        if room.temperature_filter.enabled:
+            smoothed = room.temperature_filter.value(now)
+            if smoothed is not None:
+                temperature = smoothed
+                trend = room.temperature_filter.trend(now)
+
+        fil_pilote = room.climate_controller.fil_pilote
+        setpoint = fil_pilote.hysteresis_setpoint if fil_pilote else None
+        if setpoint is None:
+            return (round(temperature, 1),)
+
+        hysteresis = room.room_config.get(CONF_HYSTERESIS, DEFAULT_HYSTERESIS)
+        if temperature <= setpoint - 2 * hysteresis:
+            zone = 0
+        elif temperature <= setpoint - hysteresis:
+            zone = 1
+        elif temperature < setpoint + hysteresis:
+            zone = 2
+        elif temperature < setpoint + 2 * hysteresis:
+            zone = 3
+        else:
+            zone = 4
+
+        direction = None
+        if zone in (1, 3) and trend is not None:
+            if trend >= TEMPERATURE_TREND_THRESHOLD:
+                direction = 1
+            elif trend <= -TEMPERATURE_TREND_THRESHOLD:
+                direction = -1
+            else:
+                direction = 0
+        return (round(temperature, 1), zone, direction)
+
+    def compute(self, now: datetime) -> tuple[Any, ...]:
+        """Return the fingerprint of the room inputs at a given time."""
+        room = self.room_manager
+        get_state = room.hass.states.get
+        climate_entity = room.room_config.get(CONF_CLIMATE_ENTITY)
+        return (
+            room._automation_enabled,
+            room.is_night_period(),
+            room._is_in_comfort_time_range(),
+            room.window_tracker.windows_open,
+            room.window_tracker.open_delayed,
+            room.occupancy.occupied,
+            room.occupancy.vacant,
+            room.get_schedule_mode(),
+            room.preheat.enabled and room.preheat.is_preheating(now),
+            bool(climate_entity)
+            and room.coordinator.dwell_guard.deferred(climate_entity),
+            room.coordinator.solar_surplus.is_boosted(room.room_id),
+            room.coordinator.mode_overrides.mode(room.room_id, now),
+            self._temperature_bucket(now),
+            *map(get_state, self._entities),
+        )
+
+    def unchanged(self, now: datetime, force: bool = False) -> bool:
+        """Check if the inputs match the previous evaluation (and remember them).
+
+        Args:
+            now: Time of the evaluation
+            force: The pass runs anyway, only remember the inputs
+        """
+        fingerprint = self.compute(now)
+        unchanged = fingerprint == self._last and not force
+        self._last = fingerprint
+        if unchanged:
+            self.skipped += 1
+        return unchanged
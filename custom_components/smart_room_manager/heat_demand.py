@@ -0,0 +1,225 @@
+"""Aggregated heat demand and shared heat source for Smart Room Manager."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.climate import ATTR_HVAC_ACTION
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
+from homeassistant.components.climate import SERVICE_SET_HVAC_MODE, HVACMode
+from homeassistant.const import (
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+    STATE_OFF,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+)
+
+from .const import (
+    CLIMATE_MODE_THERMOSTAT_COOL,
+    CLIMATE_TYPE_FIL_PILOTE,
+    CONF_CLIMATE_ENTITY,
+    CONF_CLIMATE_MODE,
+    CONF_HEAT_DEMAND_OFF,
+    CONF_HEAT_DEMAND_ON,
+    CONF_HEAT_SOURCE_ENTITY,
+    CONF_HEATING_ZONE,
+    DEFAULT_HEAT_DEMAND_OFF,
+    DEFAULT_HEAT_DEMAND_ON,
+    HEAT_DEMAND_MIN_GAP,
+    MODE_COMFORT,
+    MODE_FROST_PROTECTION,
+    PRIORITY_BYPASS,
+    PRIORITY_EXTERNAL_CONTROL,
+    PRIORITY_PAUSED,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import SmartRoomCoordinator
+    from .room_manager import RoomManager
+
+_LOGGER = logging.getLogger(__name__)
+
+# Priorities where the heater is not driven by the room (not counted)
+UNCONTROLLED_PRIORITIES = (PRIORITY_PAUSED, PRIORITY_BYPASS, PRIORITY_EXTERNAL_CONTROL)
+
+
+def room_heat_demand(room_manager: RoomManager) -> bool | None:
+    """Return True if a room asks for heat (None if it does not count).
+
+    Wire Pilot rooms with a temperature sensor ask for heat while their
+    hysteresis is heating (or holds the heat preset in the deadband);
+    thermostats report it through their hvac_action. Other rooms ask for
+    heat in comfort mode.
+    """
+    room_config = room_manager.room_config
+    climate_controller = room_manager.climate_controller
+    climate_entity = room_config.get(CONF_CLIMATE_ENTITY)
+    if not climate_entity:
+        return None
+    if room_config.get(CONF_CLIMATE_MODE) == CLIMATE_MODE_THERMOSTAT_COOL:
+        return None
+    if climate_controller.priority in UNCONTROLLED_PRIORITIES:
+        return None
+    if climate_controller.is_summer_mode():
+        return False
+
+    mode = room_manager.get_current_mode()
+    if mode == MODE_FROST_PROTECTION:
+        return False
+
+    if climate_controller.climate_type == CLIMATE_TYPE_FIL_PILOTE:
+        fil_pilote = climate_controller.fil_pilote
+        demand = fil_pilote.heat_demand() if fil_pilote else None
+        if demand is not None:
+            return demand
+    else:
+        state = room_manager.hass.states.get(climate_entity)
+        hvac_action = state.attributes.get(ATTR_HVAC_ACTION) if state else None
+        if hvac_action is not None:
+            return hvac_action in ("heating", "preheating")
+
+    return mode == MODE_COMFORT
+
+
+class HeatDemandAggregator:
+    """House and zone heat demand, driving an optional shared heat source.
+
+    After each refresh the demand of every heated room is collected into
+    one figure per zone (rooms sharing a heating_zone) and for the house:
+    the percentage of heated rooms asking for heat. The boiler or heat pump
+    configured as heat source reacts to the house demand once per refresh,
+    with its own hysteresis: it starts when the demand reaches the on
+    threshold and stops when it falls to the off threshold, whatever the
+    number of room commands in between.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: SmartRoomCoordinator) -> None:
+        """Initialize the aggregator."""
+        self.hass = hass
+        self.coordinator = coordinator
+
+        self._demand: float | None = None  # % of heated rooms asking heat
+        self._demanding: list[str] = []  # room names
+        self._counted: int = 0
+        self._zones: dict[str, dict[str, Any]] = {}
+        self._active: bool | None = None  # heat source state (None = unknown)
+
+    @property
+    def heat_source(self) -> str | None:
+        """Return the boiler/heat pump entity (global setting)."""
+        return self.coordinator.entry.data.get(CONF_HEAT_SOURCE_ENTITY)
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if at least one room has a climate entity."""
+        return any(
+            room_manager.room_config.get(CONF_CLIMATE_ENTITY)
+            for room_manager in self.coordinator.get_all_room_managers()
+        )
+
+    async def async_update(self) -> None:
+        """Aggregate the room demands and drive the heat source."""
+        demanding: list[str] = []
+        counted = 0
+        zones: dict[str, list[int]] = {}  # zone -> [asking, counted]
+        for room_manager in self.coordinator.get_all_room_managers():
+            demand = room_heat_demand(room_manager)
+            if demand is None:
+                continue
+            counted += 1
+            if demand:
+                demanding.append(room_manager.room_name)
+            zone = room_manager.room_config.get(CONF_HEATING_ZONE)
+            if zone:
+                totals = zones.setdefault(zone, [0, 0])
+                totals[0] += demand
+                totals[1] += 1
+
+        self._demanding = demanding
+        self._counted = counted
+        self._demand = round(100 * len(demanding) / counted, 1) if counted else None
+        self._zones = {
+            zone: {
+                "demand": round(100 * asking / total, 1),
+                "rooms_asking_heat": asking,
+            }
+            for zone, (asking, total) in zones.items()
+        }
+
+        if self.heat_source:
+            await self._async_control_heat_source()
+
+    async def _async_control_heat_source(self) -> None:
+        """Start or stop the heat source with hysteresis on the house demand."""
+        heat_source = self.heat_source
+        data = self.coordinator.entry.data
+        demand_on = data.get(CONF_HEAT_DEMAND_ON, DEFAULT_HEAT_DEMAND_ON)
+        # Stop threshold below the start one, or the source would cycle
+        demand_off = max(
+            0,
+            min(
+                data.get(CONF_HEAT_DEMAND_OFF, DEFAULT_HEAT_DEMAND_OFF),
+                demand_on - HEAT_DEMAND_MIN_GAP,
+            ),
+        )
+        demand = self._demand or 0
+
+        # Follow the actual state (manual changes, restarts)
+        state = self.coordinator.state_cache.get_state(heat_source)
+        if state is None or state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return
+        self._active = state != STATE_OFF
+
+        if not self._active and self._demanding and demand >= demand_on:
+            turn_on = True
+        elif self._active and demand <= demand_off:
+            turn_on = False
+        else:
+            return
+
+        _LOGGER.info(
+            "🔥 Heat demand %s%% (%d/%d rooms) - %s %s",
+            demand,
+            len(self._demanding),
+            self._counted,
+            "starting" if turn_on else "stopping",
+            heat_source,
+        )
+        domain = heat_source.split(".")[0] if "." in heat_source else "switch"
+        try:
+            if domain == CLIMATE_DOMAIN:
+                await self.hass.services.async_call(
+                    CLIMATE_DOMAIN,
+                    SERVICE_SET_HVAC_MODE,
+                    {
+                        "entity_id": heat_source,
+                        "hvac_mode": HVACMode.HEAT if turn_on else HVACMode.OFF,
+                    },
+                    blocking=True,
+                )
+            else:
+                await self.hass.services.async_call(
+                    domain,
+                    SERVICE_TURN_ON if turn_on else SERVICE_TURN_OFF,
+                    {"entity_id": heat_source},
+                    blocking=True,
+                )
+            self._active = turn_on
+        except Exception as err:
+            action = "on" if turn_on else "off"
+            _LOGGER.error("Error turning %s %s: %s", action, heat_source, err)
+
+    def get_state(self) -> dict[str, Any]:
+        """Get the aggregated demand for the heat demand sensor."""
+        return {
+            "heat_demand": self._demand,
+            "rooms_asking_heat": self._demanding,
+            "heated_rooms": self._counted,
+            "zones": self._zones,
+            "heat_source": self.heat_source,
+            "heat_source_active": self._active,
+        }
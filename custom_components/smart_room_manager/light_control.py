@@ -3,22 +3,22 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.const import SERVICE_TURN_OFF, SERVICE_TURN_ON, STATE_ON
-from homeassistant.core import HomeAssistant
-from homeassistant.util import dt as dt_util
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
 
 from .const import (
+    CONF_LIGHT_GROUP,
     CONF_LIGHT_TIMEOUT,
     CONF_LIGHTS,
     CONF_ROOM_TYPE,
-    CONF_VMC_ENTITY,
-    CONF_VMC_TIMER,
     DEFAULT_LIGHT_TIMEOUT,
     DEFAULT_LIGHT_TIMEOUT_BATHROOM,
-    DEFAULT_VMC_TIMER,
+    LIGHT_OFF_GROUPING_WINDOW,
     ROOM_TYPE_BATHROOM,
     ROOM_TYPE_CORRIDOR,
 )
@@ -44,17 +44,122 @@ class LightController:
         self.room_manager = room_manager
 
         self._light_on_times: dict[str, datetime] = {}
+        self._light_timers: dict[str, CALLBACK_TYPE] = {}  # auto-off per light
         self._current_brightness: int | None = None
-
-        # VMC control state
-        self._vmc_active: bool = False
-        self._vmc_started_at: datetime | None = None
-        self._any_light_was_on: bool = False
+        self._unsub_lights: CALLBACK_TYPE | None = None
 
     def update_config(self, room_config: dict[str, Any]) -> None:
         """Update configuration."""
         self.room_config = room_config
 
+    def _has_auto_off(self) -> bool:
+        """Return True if lights of this room type turn off automatically."""
+        room_type = self.room_config.get(CONF_ROOM_TYPE, "normal")
+        return room_type in [ROOM_TYPE_CORRIDOR, ROOM_TYPE_BATHROOM]
+
+    def _get_timeout(self) -> float:
+        """Get the auto-off timeout (seconds) based on room type."""
+        if self.room_config.get(CONF_ROOM_TYPE, "normal") == ROOM_TYPE_BATHROOM:
+            return self.room_config.get(
+                CONF_LIGHT_TIMEOUT, DEFAULT_LIGHT_TIMEOUT_BATHROOM
+            )
+        return self.room_config.get(CONF_LIGHT_TIMEOUT, DEFAULT_LIGHT_TIMEOUT)
+
+    @callback
+    def async_setup(self) -> None:
+        """Listen to light state changes to arm the auto-off timers."""
+        light_entities = self.room_config.get(CONF_LIGHTS) or []
+        if not light_entities or not self._has_auto_off():
+            return
+
+        self._unsub_lights = async_track_state_change_event(
+            self.hass, light_entities, self._async_light_changed
+        )
+
+        # Lights already on: timers start from their last change
+        for entity_id in light_entities:
+            state = self.hass.states.get(entity_id)
+            if state and state.state == STATE_ON:
+                self._track_light_on(entity_id, state.last_changed)
+
+    @callback
+    def _async_light_changed(self, event: Event) -> None:
+        """Arm or cancel the auto-off timer of a light."""
+        entity_id = event.data["entity_id"]
+        new_state = event.data.get("new_state")
+        if new_state and new_state.state == STATE_ON:
+            self._track_light_on(entity_id, new_state.last_changed)
+        else:
+            self._untrack_light(entity_id)
+
+    def _track_light_on(self, entity_id: str, on_time: datetime) -> None:
+        """Record when a light turned on and arm its auto-off timer."""
+        if entity_id in self._light_on_times:
+            return
+
+        self._light_on_times[entity_id] = on_time
+        _LOGGER.debug(
+            "Light %s turned on in %s at %s",
+            entity_id,
+            self.room_manager.room_name,
+            on_time,
+        )
+        self._light_timers[entity_id] = (
+            self.room_manager.coordinator.clock.async_call_at(
+                self.hass,
+                on_time + timedelta(seconds=self._get_timeout()),
+                partial(self._async_light_timer_expired, entity_id),
+            )
+        )
+
+    def _untrack_light(self, entity_id: str) -> None:
+        """Forget a light that is off and cancel its auto-off timer."""
+        self._light_on_times.pop(entity_id, None)
+        cancel = self._light_timers.pop(entity_id, None)
+        if cancel:
+            cancel()
+
+    async def _async_light_timer_expired(self, entity_id: str, _now: Any) -> None:
+        """Turn lights off when a timeout is reached.
+
+        Lights of the room due within LIGHT_OFF_GROUPING_WINDOW (e.g. switched
+        on together) are turned off in the same call.
+        """
+        self._light_timers.pop(entity_id, None)
+        if entity_id not in self._light_on_times:
+            return
+        if self.room_manager.is_paused():
+            # Turned off by async_update once the pause ends
+            return
+
+        # Lights switched on before this instant reach their timeout soon too
+        on_before = self.room_manager.coordinator.clock.utcnow() - timedelta(
+            seconds=self._get_timeout() - LIGHT_OFF_GROUPING_WINDOW
+        )
+        expired = [entity_id] + [
+            other_id
+            for other_id, on_time in self._light_on_times.items()
+            if other_id != entity_id and on_time <= on_before
+        ]
+        await self._async_auto_off(expired)
+
+    async def _async_auto_off(self, entity_ids: list[str]) -> None:
+        """Turn off lights whose timeout was reached."""
+        now = self.room_manager.coordinator.clock.utcnow()
+        # Group entity usable only if no other light of the room stays on
+        whole_room = set(entity_ids) >= set(self._light_on_times)
+        for entity_id in entity_ids:
+            _LOGGER.debug(
+                "Auto-off light %s in %s after %d seconds (timeout: %d)",
+                entity_id,
+                self.room_manager.room_name,
+                (now - self._light_on_times[entity_id]).total_seconds(),
+                self._get_timeout(),
+            )
+            # Untrack first: pending timers of grouped lights must not fire
+            self._untrack_light(entity_id)
+        await self._turn_off_lights(entity_ids, whole_room)
+
     async def async_update(self) -> None:
         """Update light control logic.
 
@@ -62,7 +167,7 @@ class LightController:
         - User turns on lights manually (or via automation like door sensor)
         - For corridor/bathroom types: auto-off after timeout
         - For normal types (bedrooms): no auto-off
-        - For bathroom: trigger VMC high speed when lights go off
+        - For bathroom: keep the VMC arbiter request in sync with the lights
         """
         # Check if manual pause is active - skip all automation
         if self.room_manager.is_paused():
@@ -72,177 +177,68 @@ class LightController:
             )
             return
 
-        # Use 'or []' to handle None values (dict.get returns None if value is None)
-        light_entities = self.room_config.get(CONF_LIGHTS) or []
-        room_type = self.room_config.get(CONF_ROOM_TYPE, "normal")
+        watchdog = self.room_manager.coordinator.watchdog
+        with watchdog.measure(self.room_manager.room_name, "lights"):
+            # Use 'or []' to handle None values (dict.get returns None if value is None)
+            light_entities = self.room_config.get(CONF_LIGHTS) or []
+            room_type = self.room_config.get(CONF_ROOM_TYPE, "normal")
 
-        # Check if any light is currently on
-        any_light_on = False
-        for entity_id in light_entities:
-            state = self.hass.states.get(entity_id)
-            if state and state.state == STATE_ON:
-                any_light_on = True
-                break
+            # Check if any light is currently on
+            state_cache = self.room_manager.coordinator.state_cache
+            any_light_on = state_cache.any_on(light_entities)
 
         # Handle VMC for bathroom rooms
+        # Light changes are handled as events by the arbiter; this reconciles
+        # state missed while the room was paused (no-op when already in sync)
         if room_type == ROOM_TYPE_BATHROOM:
-            await self._update_vmc_control(any_light_on)
+            await self.room_manager.coordinator.vmc_arbiter.async_update_request(
+                self.room_manager.room_id, any_light_on
+            )
 
         if not light_entities:
-            self._any_light_was_on = any_light_on
             return
 
         # Only auto-off for corridor and bathroom types
-        if room_type not in [ROOM_TYPE_CORRIDOR, ROOM_TYPE_BATHROOM]:
-            self._any_light_was_on = any_light_on
+        if not self._has_auto_off():
             return
 
-        # Get timeout based on room type
-        if room_type == ROOM_TYPE_BATHROOM:
-            timeout = self.room_config.get(
-                CONF_LIGHT_TIMEOUT, DEFAULT_LIGHT_TIMEOUT_BATHROOM
-            )
-        else:
-            timeout = self.room_config.get(CONF_LIGHT_TIMEOUT, DEFAULT_LIGHT_TIMEOUT)
-
-        # Check each light for auto-off
-        for entity_id in light_entities:
-            state = self.hass.states.get(entity_id)
-            if not state:
-                continue
-
-            # If light just turned on, record time
-            if state.state == STATE_ON:
-                if entity_id not in self._light_on_times:
+        # Auto-off is timer driven (armed on the light-on event); this only
+        # catches lights missed while paused or before listeners were set up
+        expired: list[str] = []
+        with watchdog.measure(self.room_manager.room_name, "lights"):
+            for entity_id in light_entities:
+                state = self.hass.states.get(entity_id)
+                if not state or state.state != STATE_ON:
+                    self._untrack_light(entity_id)
+                elif entity_id not in self._light_on_times:
                     # Use last_changed or current time as fallback
-                    self._light_on_times[entity_id] = (
-                        state.last_changed or dt_util.utcnow()
-                    )
-                    _LOGGER.debug(
-                        "Light %s turned on in %s at %s",
-                        entity_id,
-                        self.room_manager.room_name,
-                        state.last_changed,
-                    )
-
-                # Check if timeout exceeded
-                time_on = (
-                    dt_util.utcnow() - self._light_on_times[entity_id]
-                ).total_seconds()
-                if time_on > timeout:
-                    _LOGGER.debug(
-                        "Auto-off light %s in %s after %d seconds (timeout: %d)",
-                        entity_id,
-                        self.room_manager.room_name,
-                        time_on,
-                        timeout,
+                    self._track_light_on(
+                        entity_id, state.last_changed or self.room_manager.now
                     )
-                    await self._turn_off_light(entity_id)
-                    if entity_id in self._light_on_times:
-                        del self._light_on_times[entity_id]
+                elif entity_id not in self._light_timers:
+                    # Timeout reached during a manual pause
+                    expired.append(entity_id)
 
-            else:
-                # Light is off, remove from tracking
-                if entity_id in self._light_on_times:
-                    del self._light_on_times[entity_id]
+        if expired:
+            await self._async_auto_off(expired)
 
-        self._any_light_was_on = any_light_on
-
-    async def _update_vmc_control(self, any_light_on: bool) -> None:
-        """Update VMC control for bathroom rooms.
-
-        Logic:
-        - Light turns ON → VMC high speed ON immediately
-        - Light turns OFF → Start timer
-        - Timer expires → VMC high speed OFF
-        """
-        # Get VMC config from global settings
-        vmc_entity = self.room_manager.coordinator.entry.data.get(CONF_VMC_ENTITY)
-        vmc_timer = self.room_manager.coordinator.entry.data.get(
-            CONF_VMC_TIMER, DEFAULT_VMC_TIMER
-        )
-
-        if not vmc_entity:
+    async def async_room_empty(self) -> None:
+        """Turn off the lights left on once the room is empty (occupancy)."""
+        if self.room_manager.is_paused():
             return
-
-        now = dt_util.utcnow()
-
-        # Light just turned ON (was off, now on) -> start VMC high speed
-        if not self._any_light_was_on and any_light_on:
-            _LOGGER.info(
-                "💨 Bathroom light ON in %s - starting VMC high speed",
-                self.room_manager.room_name,
-            )
-            await self._turn_on_vmc(vmc_entity)
-            self._vmc_active = True
-            self._vmc_started_at = None  # No timer yet, light is still on
-
-        # Light just turned OFF (was on, now off) -> start the countdown timer
-        if self._any_light_was_on and not any_light_on:
-            _LOGGER.info(
-                "💨 Bathroom light OFF in %s - VMC will stop in %ds",
-                self.room_manager.room_name,
-                vmc_timer,
-            )
-            self._vmc_started_at = now  # Start countdown
-
-        # Check if VMC timer expired (light is off and timer running)
-        if self._vmc_active and self._vmc_started_at and not any_light_on:
-            elapsed = (now - self._vmc_started_at).total_seconds()
-            if elapsed >= vmc_timer:
-                # Before turning off VMC, check if any OTHER bathroom has lights on
-                # VMC is global, so we must not turn it off if another bathroom needs it
-                if self._any_other_bathroom_active():
-                    _LOGGER.debug(
-                        "💨 VMC timer expired in %s but another bathroom is active",
-                        self.room_manager.room_name,
-                    )
-                    self._vmc_active = False
-                    self._vmc_started_at = None
-                else:
-                    _LOGGER.info(
-                        "💨 VMC timer expired in %s - stopping high speed",
-                        self.room_manager.room_name,
-                    )
-                    await self._turn_off_vmc(vmc_entity)
-                    self._vmc_active = False
-                    self._vmc_started_at = None
-
-        # If light turns back on while timer is running, cancel the timer
-        if any_light_on and self._vmc_started_at:
-            _LOGGER.debug(
-                "Light back ON in %s - canceling VMC shutdown timer",
-                self.room_manager.room_name,
-            )
-            self._vmc_started_at = None  # Cancel timer, VMC stays on
-
-    def _any_other_bathroom_active(self) -> bool:
-        """Check if any other bathroom has lights on or VMC timer running.
-
-        This prevents turning off the global VMC when another bathroom needs it.
-        """
-        coordinator = self.room_manager.coordinator
-        current_room_id = self.room_manager.room_id
-
-        for room_manager in coordinator.get_all_room_managers():
-            # Skip current room
-            if room_manager.room_id == current_room_id:
-                continue
-
-            # Only check other bathrooms
-            if room_manager.room_type != ROOM_TYPE_BATHROOM:
-                continue
-
-            # Check if lights are on in this bathroom
-            light_controller = room_manager.light_controller
-            if light_controller._any_light_was_on:
-                return True
-
-            # Check if VMC timer is still running in this bathroom
-            if light_controller._vmc_active and light_controller._vmc_started_at:
-                return True
-
-        return False
+        light_entities = self.room_config.get(CONF_LIGHTS) or []
+        is_on = self.room_manager.coordinator.state_cache.is_on
+        lights_on = [entity_id for entity_id in light_entities if is_on(entity_id)]
+        if not lights_on:
+            return
+        _LOGGER.debug(
+            "Room %s empty - turning off %s",
+            self.room_manager.room_name,
+            ", ".join(lights_on),
+        )
+        for entity_id in lights_on:
+            self._untrack_light(entity_id)
+        await self._turn_off_lights(lights_on, whole_room=True)
 
     def _get_entity_domain(self, entity_id: str, default: str = "light") -> str:
         """Extract domain from entity_id (e.g., 'light.kitchen' -> 'light')."""
@@ -255,38 +251,51 @@ class LightController:
         try:
             domain = self._get_entity_domain(entity_id, default_domain)
             service = SERVICE_TURN_ON if turn_on else SERVICE_TURN_OFF
-            await self.hass.services.async_call(
+            await self.room_manager.coordinator.dispatcher.async_call(
                 domain,
                 service,
                 {"entity_id": entity_id},
-                blocking=True,
             )
         except Exception as err:
             action = "on" if turn_on else "off"
             _LOGGER.error("Error turning %s %s: %s", action, entity_id, err)
 
-    async def _turn_on_vmc(self, vmc_entity: str) -> None:
-        """Turn on VMC high speed."""
-        await self._control_entity(vmc_entity, turn_on=True, default_domain="switch")
+    async def _turn_off_lights(
+        self, entity_ids: list[str], whole_room: bool = False
+    ) -> None:
+        """Turn off lights with one service call per domain.
 
-    async def _turn_off_vmc(self, vmc_entity: str) -> None:
-        """Turn off VMC high speed."""
-        await self._control_entity(vmc_entity, turn_on=False, default_domain="switch")
+        Args:
+            entity_ids: Lights to turn off
+            whole_room: True if no other light of the room is on; the room's
+                light group (if configured) is then turned off instead
+        """
+        light_group = self.room_config.get(CONF_LIGHT_GROUP)
+        if light_group and whole_room:
+            await self._control_entity(
+                light_group, turn_on=False, default_domain="light"
+            )
+            return
 
-    async def _turn_off_light(self, entity_id: str) -> None:
-        """Turn off a single light."""
-        await self._control_entity(entity_id, turn_on=False, default_domain="light")
+        by_domain: dict[str, list[str]] = {}
+        for entity_id in entity_ids:
+            domain = self._get_entity_domain(entity_id, "light")
+            by_domain.setdefault(domain, []).append(entity_id)
+
+        for domain, entities in by_domain.items():
+            try:
+                await self.room_manager.coordinator.dispatcher.async_call(
+                    domain,
+                    SERVICE_TURN_OFF,
+                    {"entity_id": entities[0] if len(entities) == 1 else entities},
+                )
+            except Exception as err:
+                _LOGGER.error("Error turning off %s: %s", ", ".join(entities), err)
 
     def get_state(self) -> dict[str, Any]:
         """Get current light controller state."""
         room_type = self.room_config.get(CONF_ROOM_TYPE, "normal")
-
-        if room_type == ROOM_TYPE_BATHROOM:
-            timeout = self.room_config.get(
-                CONF_LIGHT_TIMEOUT, DEFAULT_LIGHT_TIMEOUT_BATHROOM
-            )
-        else:
-            timeout = self.room_config.get(CONF_LIGHT_TIMEOUT, DEFAULT_LIGHT_TIMEOUT)
+        timeout = self._get_timeout()
 
         # Calculate remaining time for each tracked light
         timer_active = False
@@ -295,7 +304,7 @@ class LightController:
             ROOM_TYPE_CORRIDOR,
             ROOM_TYPE_BATHROOM,
         ]:
-            now = dt_util.utcnow()
+            now = self.room_manager.now
             for entity_id, on_time in self._light_on_times.items():
                 elapsed = (now - on_time).total_seconds()
                 remaining = max(0, timeout - elapsed)
@@ -303,17 +312,15 @@ class LightController:
                     timer_active = True
                     time_remaining = max(time_remaining, remaining)
 
-        # Calculate VMC timer remaining (only when light is off and timer running)
+        # VMC state seen from this bathroom (-1 = light still on, "waiting")
+        vmc_active = False
         vmc_time_remaining = 0
-        if self._vmc_active and self._vmc_started_at:
-            vmc_timer = self.room_manager.coordinator.entry.data.get(
-                CONF_VMC_TIMER, DEFAULT_VMC_TIMER
+        if room_type == ROOM_TYPE_BATHROOM:
+            vmc_state = self.room_manager.coordinator.vmc_arbiter.get_room_state(
+                self.room_manager.room_id
             )
-            elapsed = (dt_util.utcnow() - self._vmc_started_at).total_seconds()
-            vmc_time_remaining = max(0, vmc_timer - elapsed)
-        elif self._vmc_active and not self._vmc_started_at:
-            # VMC active but no timer = light still on, show -1 to indicate "waiting"
-            vmc_time_remaining = -1
+            vmc_active = vmc_state["vmc_active"]
+            vmc_time_remaining = vmc_state["vmc_time_remaining"]
 
         return {
             "room_type": room_type,
@@ -322,10 +329,15 @@ class LightController:
             "lights_on": list(self._light_on_times.keys()),
             "timer_active": timer_active,
             "time_remaining": int(time_remaining),
-            "vmc_active": self._vmc_active,
-            "vmc_time_remaining": int(vmc_time_remaining),
+            "vmc_active": vmc_active,
+            "vmc_time_remaining": vmc_time_remaining,
         }
 
     async def async_shutdown(self) -> None:
         """Shutdown light controller."""
-        pass
+        if self._unsub_lights:
+            self._unsub_lights()
+            self._unsub_lights = None
+        for cancel in self._light_timers.values():
+            cancel()
+        self._light_timers.clear()
@@ -0,0 +1,318 @@
+"""Power budget load shedding for Smart Room Manager Wire Pilot heaters."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import (
+    CONF_HEATER_POWER,
+    CONF_POWER_BUDGET,
+    CONF_POWER_METER_SENSOR,
+    DEFAULT_HEATER_POWER,
+    DEFAULT_POWER_BUDGET,
+    LOAD_SHED_AGING,
+    LOAD_SHED_ROTATION,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import SmartRoomCoordinator
+    from .room_manager import RoomManager
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Grant:
+    """A heater allowed to run in comfort."""
+
+    __slots__ = ("room_id", "power", "deficit", "since")
+
+    def __init__(self, room_id: str, power: float, deficit: float, since: datetime):
+        """Initialize the grant."""
+        self.room_id = room_id
+        self.power = power
+        self.deficit = deficit
+        self.since = since
+
+
+class LoadShedder:
+    """Share a power budget between the Wire Pilot heaters asking for comfort.
+
+    Each heater asking for comfort (or for heat, with hysteresis) needs its
+    rated power from the budget: the static budget, minus the other loads
+    read on the power meter if one is configured. Heaters that do not fit
+    wait in a priority queue and stay in eco.
+
+    The queue is ordered by deficit (setpoint - temperature) plus an aging
+    term for the time already waited. Both grow at the same rate for every
+    waiting heater, so the order is fixed at insertion and a heap keeps it.
+    The allocation is re-planned only when a heater asks or stops, the
+    meter changes, or the rotation timer expires: a heater holding comfort
+    for the rotation period while others wait gives its place back.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: SmartRoomCoordinator) -> None:
+        """Initialize the shedder."""
+        self.hass = hass
+        self.coordinator = coordinator
+
+        self._granted: dict[str, _Grant] = {}  # climate entity -> grant
+        self._waiting: dict[str, tuple[float, str, float, float]] = {}
+        self._queue: list[tuple[float, int, str]] = []  # (key, seq, entity)
+        self._seq = itertools.count()
+        self._allocated: float = 0.0  # rated power of the granted heaters
+        self._other_load: float = 0.0  # meter reading minus granted heaters
+        self._rotation_timer: CALLBACK_TYPE | None = None
+        self._rotation_due: datetime | None = None
+        self._unsub_meter: CALLBACK_TYPE | None = None
+
+    @property
+    def budget(self) -> float:
+        """Return the power budget of the heaters (W, 0 = disabled)."""
+        return float(
+            self.coordinator.entry.data.get(CONF_POWER_BUDGET, DEFAULT_POWER_BUDGET)
+            or 0
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if a power budget is configured."""
+        return self.budget > 0
+
+    @property
+    def meter(self) -> str | None:
+        """Return the house power meter sensor (global setting)."""
+        return self.coordinator.entry.data.get(CONF_POWER_METER_SENSOR)
+
+    @callback
+    def async_setup(self) -> None:
+        """Follow the power meter (re-plans on every reading)."""
+        if not self.enabled or not self.meter:
+            return
+        self._unsub_meter = async_track_state_change_event(
+            self.hass, self.meter, self._async_meter_changed
+        )
+        self._read_meter()
+
+    @callback
+    def _async_meter_changed(self, _event: Event) -> None:
+        """Re-plan with the new meter reading."""
+        self._read_meter()
+        self._replan(self.coordinator.clock.now(), None)
+
+    def _read_meter(self) -> None:
+        """Update the power used by the other loads from the meter."""
+        reading = self.coordinator.state_cache.get_float(self.meter, "power meter")
+        if reading is not None:
+            # The meter includes the heaters running on a grant
+            self._other_load = max(0.0, reading - self._allocated)
+
+    def _available(self) -> float:
+        """Return the power the heaters may use (W)."""
+        return self.budget - self._other_load
+
+    @staticmethod
+    def _power(room_manager: RoomManager) -> float:
+        """Return the rated power of the heater of a room (W, 0 = unmanaged)."""
+        return float(
+            room_manager.room_config.get(CONF_HEATER_POWER, DEFAULT_HEATER_POWER) or 0
+        )
+
+    def request(
+        self, room_manager: RoomManager, climate_entity: str, deficit: float
+    ) -> bool:
+        """Ask for comfort power, return True if the heater may run.
+
+        Args:
+            room_manager: Room of the heater
+            climate_entity: Heater asking for comfort
+            deficit: Setpoint - temperature (°C, 0 if unknown)
+        """
+        power = self._power(room_manager)
+        if not self.enabled or power <= 0:
+            return True
+
+        grant = self._granted.get(climate_entity)
+        if grant is not None:
+            grant.deficit = deficit
+            return True
+
+        waiting = self._waiting.get(climate_entity)
+        if waiting is not None and waiting[2] == deficit:
+            # Still waiting, nothing changed since the last plan
+            return False
+
+        now = room_manager.now
+        since = waiting[3] if waiting else now.timestamp()
+        self._enqueue(climate_entity, room_manager.room_id, deficit, since)
+        if waiting is None:
+            _LOGGER.debug(
+                "⚡ %s asks for %d W of comfort (deficit %.1f°C)",
+                room_manager.room_name,
+                power,
+                deficit,
+            )
+        self._replan(now, climate_entity)
+        return climate_entity in self._granted
+
+    def _enqueue(self, entity: str, room_id: str, deficit: float, since: float) -> None:
+        """Queue a heater (or update its deficit) by priority."""
+        # Deficit + LOAD_SHED_AGING per hour waited: the order does not change
+        # while waiting, so the key is computed once from the waiting start
+        key = LOAD_SHED_AGING * since / 3600 - deficit
+        self._waiting[entity] = (key, room_id, deficit, since)
+        heapq.heappush(self._queue, (key, next(self._seq), entity))
+
+    def release(self, climate_entity: str) -> None:
+        """Give back the power of a heater leaving comfort."""
+        self._waiting.pop(climate_entity, None)
+        grant = self._granted.pop(climate_entity, None)
+        if grant is None:
+            return
+        self._allocated -= grant.power
+        self._replan(self.coordinator.clock.now(), climate_entity)
+
+    def set_controlled(self, climate_entity: str, controlled: bool) -> None:
+        """Follow the automation switch of the room of a heater.
+
+        A room with automation disabled does not apply the allocation: its
+        waiting heater (left in eco) leaves the queue, and a granted heater
+        (left in comfort) keeps its power but is no longer shed or rotated.
+        """
+        if not self.enabled:
+            return
+        if not controlled:
+            self._waiting.pop(climate_entity, None)
+        self._arm_rotation(self.coordinator.clock.now())
+
+    def _controlled(self, grant: _Grant) -> bool:
+        """Check if the room of a grant applies it (automation enabled)."""
+        room_manager = self.coordinator.get_room_manager(grant.room_id)
+        return room_manager is not None and room_manager.is_automation_enabled()
+
+    def _rotatable(self) -> list[tuple[str, _Grant]]:
+        """Return the grants whose heater would leave comfort if revoked."""
+        return [item for item in self._granted.items() if self._controlled(item[1])]
+
+    def _peek(self) -> str | None:
+        """Return the first waiting heater (dropping stale queue entries)."""
+        queue = self._queue
+        while queue:
+            key, _seq, entity = queue[0]
+            waiting = self._waiting.get(entity)
+            if waiting is not None and waiting[0] == key:
+                return entity
+            heapq.heappop(queue)
+        return None
+
+    def _replan(self, now: datetime, requester: str | None) -> None:
+        """Grant waiting heaters that fit, shed grants over the budget."""
+        changed: list[str] = []
+        available = self._available()
+
+        # Over budget (meter spike): shed the smallest deficits first
+        if self._allocated > available and self._granted:
+            for entity, grant in sorted(
+                self._rotatable(), key=lambda item: item[1].deficit
+            ):
+                if self._allocated <= available:
+                    break
+                self._revoke(entity, now)
+                changed.append(grant.room_id)
+
+        # Grant by priority while the head of the queue fits
+        while (entity := self._peek()) is not None:
+            _key, room_id, deficit, _since = self._waiting[entity]
+            room_manager = self.coordinator.get_room_manager(room_id)
+            power = self._power(room_manager) if room_manager else 0.0
+            if self._allocated + power > available:
+                break
+            heapq.heappop(self._queue)
+            del self._waiting[entity]
+            self._granted[entity] = _Grant(room_id, power, deficit, now)
+            self._allocated += power
+            if entity != requester:
+                changed.append(room_id)
+
+        self._arm_rotation(now)
+
+        # Rooms whose heater changes must send their new preset now
+        for room_id in changed:
+            self.hass.async_create_task(self.coordinator.async_refresh_room(room_id))
+
+    def _revoke(self, entity: str, now: datetime) -> None:
+        """Take the power back from a heater and queue it again."""
+        grant = self._granted.pop(entity)
+        self._allocated -= grant.power
+        self._enqueue(entity, grant.room_id, grant.deficit, now.timestamp())
+        _LOGGER.debug("⚡ Comfort of %s shed (power budget)", entity)
+
+    def _arm_rotation(self, now: datetime) -> None:
+        """Arm the rotation of the oldest grant while heaters are waiting."""
+        due = None
+        rotatable = self._rotatable()
+        if rotatable and self._peek() is not None:
+            oldest = min(grant.since for _entity, grant in rotatable)
+            due = max(now, oldest + timedelta(seconds=LOAD_SHED_ROTATION))
+        if due == self._rotation_due and (due is None or self._rotation_timer):
+            return
+        if self._rotation_timer:
+            self._rotation_timer()
+            self._rotation_timer = None
+        self._rotation_due = due
+        if due is not None:
+            self._rotation_timer = self.coordinator.clock.async_call_at(
+                self.hass, due, self._async_rotate
+            )
+
+    async def _async_rotate(self, _now: Any) -> None:
+        """Hand the comfort of the longest running heater to the queue."""
+        self._rotation_timer = None
+        self._rotation_due = None
+        now = self.coordinator.clock.now()
+        rotatable = self._rotatable()
+        if self._peek() is None or not rotatable:
+            return
+        entity, grant = min(rotatable, key=lambda item: item[1].since)
+        if now - grant.since < timedelta(seconds=LOAD_SHED_ROTATION):
+            self._arm_rotation(now)
+            return
+        self._revoke(entity, now)
+        self.hass.async_create_task(self.coordinator.async_refresh_room(grant.room_id))
+        self._replan(now, None)
+
+    def is_shed(self, climate_entity: str) -> bool:
+        """Return True if a heater is waiting for power."""
+        return climate_entity in self._waiting
+
+    def is_granted(self, climate_entity: str) -> bool:
+        """Return True if a heater holds comfort power."""
+        return climate_entity in self._granted
+
+    def get_state(self) -> dict[str, Any]:
+        """Get the allocation for the heat demand sensor attributes."""
+        if not self.enabled:
+            return {}
+        return {
+            "power_budget": self.budget,
+            "power_available": round(self._available()),
+            "power_allocated": round(self._allocated),
+            "heaters_in_comfort": len(self._granted),
+            "heaters_shed": len(self._waiting),
+        }
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Unsubscribe and cancel the rotation."""
+        if self._unsub_meter:
+            self._unsub_meter()
+            self._unsub_meter = None
+        if self._rotation_timer:
+            self._rotation_timer()
+            self._rotation_timer = None
@@ -0,0 +1,161 @@
+"""Forced room modes with an expiry for Smart Room Manager."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, OVERRIDE_SAVE_DELAY, OVERRIDE_STORAGE_VERSION
+
+if TYPE_CHECKING:
+    from .coordinator import SmartRoomCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ModeOverrides:
+    """Room modes forced until an expiry time.
+
+    An override puts a room in a mode (comfort, eco, night or frost
+    protection) above the alarm, the schedule and external control; only
+    the pause, the bypass and open windows still win. All expiries share
+    one timer armed at the earliest one, and the rooms forced together
+    come back together in one refresh. Overrides are stored, so a restart
+    resumes them with the same expiry (expired ones are dropped).
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: SmartRoomCoordinator) -> None:
+        """Initialize the overrides."""
+        self.hass = hass
+        self.coordinator = coordinator
+
+        self._overrides: dict[str, tuple[str, datetime]] = {}  # room -> mode, until
+        self._timer: CALLBACK_TYPE | None = None
+        self._timer_due: datetime | None = None
+        self._store: Store[dict[str, Any]] = Store(
+            hass,
+            OVERRIDE_STORAGE_VERSION,
+            f"{DOMAIN}.{coordinator.entry.entry_id}.overrides",
+        )
+        self._unsaved = False
+
+    async def async_setup(self) -> None:
+        """Restore the overrides still running from storage."""
+        stored = await self._store.async_load() or {}
+        now = self.coordinator.clock.now()
+        for room_id, override in stored.items():
+            until = dt_util.parse_datetime(override.get("until") or "")
+            if (
+                until is None
+                or until <= now
+                or self.coordinator.get_room_manager(room_id) is None
+            ):
+                continue
+            self._overrides[room_id] = (override["mode"], until)
+        if self._overrides:
+            _LOGGER.info("✋ %d mode override(s) restored", len(self._overrides))
+        self._arm()
+
+    def mode(self, room_id: str, now: datetime) -> str | None:
+        """Return the forced mode of a room (None if not forced)."""
+        override = self._overrides.get(room_id)
+        if override is None or override[1] <= now:
+            return None
+        return override[0]
+
+    def active(self, now: datetime) -> dict[str, str]:
+        """Return the forced mode of every forced room."""
+        return {
+            room_id: mode
+            for room_id, (mode, until) in self._overrides.items()
+            if until > now
+        }
+
+    def set(self, room_ids: Iterable[str], mode: str, until: datetime) -> None:
+        """Force the mode of rooms until a given time (refresh them after)."""
+        for room_id in room_ids:
+            self._overrides[room_id] = (mode, until)
+        self._arm()
+        self._schedule_save()
+        # Forced rooms do not follow a solar boost: hand it to other rooms
+        self.coordinator.solar_surplus.async_reallocate()
+
+    def clear(self, room_ids: Iterable[str]) -> list[str]:
+        """Cancel the overrides of rooms, return the rooms that had one."""
+        cleared = [
+            room_id for room_id in room_ids if self._overrides.pop(room_id, None)
+        ]
+        if cleared:
+            self._arm()
+            self._schedule_save()
+            self.coordinator.solar_surplus.async_reallocate()
+        return cleared
+
+    def _schedule_save(self) -> None:
+        """Persist the overrides (batched, one write per delay)."""
+        self._unsaved = True
+        self._store.async_delay_save(self._data_to_save, OVERRIDE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the overrides to persist, by room_id."""
+        self._unsaved = False
+        return {
+            room_id: {"mode": mode, "until": until.isoformat()}
+            for room_id, (mode, until) in self._overrides.items()
+        }
+
+    def _arm(self) -> None:
+        """Arm the timer at the earliest expiry."""
+        due = min((until for _mode, until in self._overrides.values()), default=None)
+        if due == self._timer_due and (due is None or self._timer):
+            return
+        if self._timer:
+            self._timer()
+            self._timer = None
+        self._timer_due = due
+        if due is not None:
+            self._timer = self.coordinator.clock.async_call_at(
+                self.hass, due, self._async_expire
+            )
+
+    async def _async_expire(self, _now: Any) -> None:
+        """Drop the expired overrides and re-evaluate their rooms."""
+        self._timer = None
+        self._timer_due = None
+        now = self.coordinator.clock.now()
+        expired = [
+            room_id
+            for room_id, (_mode, until) in self._overrides.items()
+            if until <= now
+        ]
+        for room_id in expired:
+            del self._overrides[room_id]
+        self._arm()
+        if expired:
+            self._schedule_save()
+            _LOGGER.info("✋ Mode override expired for %d room(s)", len(expired))
+            self.coordinator.solar_surplus.async_reallocate()
+            await self.coordinator.async_refresh_rooms(expired)
+
+    def get_state(self, room_id: str) -> dict[str, Any]:
+        """Get the override of a room for its sensor attributes."""
+        override = self._overrides.get(room_id)
+        return {
+            "mode_override": override[0] if override else None,
+            "override_until": override[1].isoformat() if override else None,
+        }
+
+    async def async_shutdown(self) -> None:
+        """Cancel the expiry timer and write pending changes now."""
+        if self._timer:
+            self._timer()
+            self._timer = None
+        if self._unsaved:
+            await self._store.async_save(self._data_to_save())
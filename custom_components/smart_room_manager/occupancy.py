@@ -0,0 +1,232 @@
+"""Motion/presence sensor tracking for Smart Room Manager."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import STATE_ON, STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import (
+    CONF_OCCUPANCY_LIGHTS_OFF,
+    CONF_OCCUPANCY_SENSORS,
+    CONF_OCCUPANCY_TIMEOUT,
+    CONF_VACANCY_ECO_DELAY,
+    DEFAULT_OCCUPANCY_LIGHTS_OFF,
+    DEFAULT_OCCUPANCY_TIMEOUT,
+    DEFAULT_VACANCY_ECO_DELAY,
+)
+
+if TYPE_CHECKING:
+    from .room_manager import RoomManager
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class OccupancyTracker:
+    """Track the motion/presence sensors of a room with a vacancy timeout.
+
+    The sensors of a room are fused: the room is occupied while any of them
+    detects and for occupancy_timeout minutes after the last one cleared,
+    then it is empty. Once empty for vacancy_eco_delay minutes the room is
+    vacant and goes to eco.
+
+    Sensor events only update the set of detecting sensors and the last
+    motion time. One timer armed at the next possible transition switches
+    the state; it is not moved by every event but re-armed when it fires
+    early (motion in between). The room is re-evaluated only when its state
+    changes, so sensors firing every few seconds in an occupied room cost
+    neither a refresh nor a timer.
+    """
+
+    def __init__(self, hass: HomeAssistant, room_manager: RoomManager) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self.room_manager = room_manager
+
+        self._active: set[str] = set()  # Sensors currently detecting
+        self.last_motion: datetime | None = None  # Last detection start or end
+        self.empty_since: datetime | None = None
+        self._occupied: bool = False
+        self._vacant: bool = False  # Empty past the eco delay
+        self._timer: CALLBACK_TYPE | None = None
+        self._timer_due: datetime | None = None
+        self._unsub_sensors: CALLBACK_TYPE | None = None
+
+    @property
+    def _sensors(self) -> list[str]:
+        """Return the motion/presence sensors of the room."""
+        return self.room_manager.room_config.get(CONF_OCCUPANCY_SENSORS) or []
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if the room has occupancy sensors."""
+        return bool(self._sensors)
+
+    @property
+    def occupied(self) -> bool:
+        """Return True if someone was detected within the timeout."""
+        return self._occupied
+
+    @property
+    def vacant(self) -> bool:
+        """Return True if the room has been empty for the eco delay."""
+        return self._vacant
+
+    @property
+    def _timeout(self) -> timedelta:
+        """Return the time without detection before the room is empty."""
+        return timedelta(
+            minutes=self.room_manager.room_config.get(
+                CONF_OCCUPANCY_TIMEOUT, DEFAULT_OCCUPANCY_TIMEOUT
+            )
+        )
+
+    @property
+    def _eco_delay(self) -> timedelta | None:
+        """Return the time empty before eco (None = never)."""
+        delay = self.room_manager.room_config.get(
+            CONF_VACANCY_ECO_DELAY, DEFAULT_VACANCY_ECO_DELAY
+        )
+        return timedelta(minutes=delay) if delay else None
+
+    @callback
+    def async_setup(self) -> None:
+        """Listen to the occupancy sensors and apply their current state."""
+        sensors = self._sensors
+        if not sensors:
+            return
+
+        self._unsub_sensors = async_track_state_change_event(
+            self.hass, sensors, self._async_sensor_changed
+        )
+
+        # Sensors already clear: the room is empty since the last one cleared
+        for entity_id in sensors:
+            state = self.hass.states.get(entity_id)
+            if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+                continue
+            if state.state == STATE_ON:
+                self._active.add(entity_id)
+            elif self.last_motion is None or state.last_changed > self.last_motion:
+                self.last_motion = state.last_changed
+        self._update(self.room_manager.coordinator.clock.utcnow())
+
+    @callback
+    def _async_sensor_changed(self, event: Event) -> None:
+        """Handle a motion/presence sensor state change."""
+        entity_id = event.data["entity_id"]
+        new_state = event.data.get("new_state")
+        clock = self.room_manager.coordinator.clock
+        if new_state and new_state.state == STATE_ON:
+            if entity_id in self._active:
+                return
+            self._active.add(entity_id)
+            self.last_motion = new_state.last_changed
+        elif entity_id in self._active:
+            self._active.discard(entity_id)
+            self.last_motion = new_state.last_changed if new_state else clock.utcnow()
+        else:
+            return
+
+        # Only the empty -> occupied transition can happen on an event
+        if self._update(clock.utcnow()):
+            self.hass.async_create_task(
+                self.room_manager.coordinator.async_refresh_room(
+                    self.room_manager.room_id
+                )
+            )
+
+    def _update(self, now: datetime) -> bool:
+        """Compute the state at a given time, return True if it changed."""
+        due: datetime | None = None
+        timeout = self._timeout
+        if self._active:
+            occupied = True
+        elif self.last_motion is not None and now < self.last_motion + timeout:
+            occupied = True
+            due = self.last_motion + timeout
+        else:
+            occupied = False
+
+        vacant = False
+        if occupied:
+            self.empty_since = None
+        else:
+            if self.empty_since is None:
+                self.empty_since = (
+                    self.last_motion + timeout if self.last_motion else now
+                )
+            eco_delay = self._eco_delay
+            if eco_delay is not None:
+                vacant = now >= self.empty_since + eco_delay
+                if not vacant:
+                    due = self.empty_since + eco_delay
+
+        changed = occupied != self._occupied or vacant != self._vacant
+        if changed:
+            _LOGGER.debug(
+                "🚶 %s %s",
+                self.room_manager.room_name,
+                "occupied" if occupied else "vacant" if vacant else "empty",
+            )
+        self._occupied = occupied
+        self._vacant = vacant
+        if due is not None:
+            self._arm(due)
+        return changed
+
+    def _arm(self, due: datetime) -> None:
+        """Arm the timer at the next transition (an earlier one re-arms)."""
+        if self._timer is not None and self._timer_due <= due:
+            return
+        self._cancel_timer()
+        self._timer_due = due
+        self._timer = self.room_manager.coordinator.clock.async_call_at(
+            self.hass, due, self._async_timer
+        )
+
+    def _cancel_timer(self) -> None:
+        """Cancel the pending transition."""
+        if self._timer:
+            self._timer()
+            self._timer = None
+            self._timer_due = None
+
+    async def _async_timer(self, _now: Any) -> None:
+        """Switch to empty or vacant and re-evaluate the room."""
+        self._timer = None
+        self._timer_due = None
+        was_occupied = self._occupied
+        if not self._update(self.room_manager.coordinator.clock.utcnow()):
+            return
+
+        room_config = self.room_manager.room_config
+        if was_occupied and room_config.get(
+            CONF_OCCUPANCY_LIGHTS_OFF, DEFAULT_OCCUPANCY_LIGHTS_OFF
+        ):
+            await self.room_manager.light_controller.async_room_empty()
+        await self.room_manager.coordinator.async_refresh_room(
+            self.room_manager.room_id
+        )
+
+    def get_state(self) -> dict[str, Any]:
+        """Get the occupancy of the room for its attributes (empty if no sensor)."""
+        if not self.enabled:
+            return {}
+        return {
+            "occupancy_sensors_active": len(self._active),
+            "last_motion": (self.last_motion.isoformat() if self.last_motion else None),
+            "empty_since": (self.empty_since.isoformat() if self.empty_since else None),
+            "vacant": self._vacant,
+        }
+
+    def async_shutdown(self) -> None:
+        """Unsubscribe and cancel the pending transition."""
+        if self._unsub_sensors:
+            self._unsub_sensors()
+            self._unsub_sensors = None
+        self._cancel_timer()
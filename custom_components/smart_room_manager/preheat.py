@@ -0,0 +1,356 @@
+"""Predictive pre-heating for Smart Room Manager."""
+
+from __future__ import annotations
+
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_COMFORT_TIME_RANGES,
+    CONF_NIGHT_START,
+    CONF_OUTDOOR_TEMP_SENSOR,
+    CONF_PREHEAT,
+    CONF_PRESET_SCHEDULE_ON,
+    CONF_SCHEDULE_ENTITY,
+    CONF_TEMP_COMFORT,
+    CONF_TEMPERATURE_SENSOR,
+    DEFAULT_DAY_START,
+    DEFAULT_NIGHT_START,
+    DEFAULT_PREHEAT,
+    DEFAULT_TEMP_COMFORT,
+    MODE_COMFORT,
+    PREHEAT_MAX_LEAD,
+    PREHEAT_MEMORY,
+    PREHEAT_MIN_DEFICIT,
+    PREHEAT_MIN_RATE,
+    PREHEAT_MIN_SAMPLES,
+    PREHEAT_SEGMENT,
+    PRIORITY_NORMAL,
+    PRIORITY_SCHEDULE,
+)
+
+if TYPE_CHECKING:
+    from .room_manager import RoomManager
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HeatUpModel:
+    """Heat-up rate of a room (°C/h), learned online.
+
+    Weighted least squares of the observed rate against the indoor/outdoor
+    temperature difference, with exponential forgetting so the model
+    follows the seasons. The state is five running sums: each sample is an
+    O(1) update and the model never grows. Without an outdoor sensor (or
+    while the difference barely varies) the prediction is the mean rate.
+    """
+
+    __slots__ = ("weight", "sum_x", "sum_y", "sum_xx", "sum_xy", "samples")
+
+    def __init__(self, stored: dict[str, Any] | None = None) -> None:
+        """Initialize the model, optionally from persisted sums."""
+        stored = stored or {}
+        self.weight: float = stored.get("weight", 0.0)
+        self.sum_x: float = stored.get("sum_x", 0.0)
+        self.sum_y: float = stored.get("sum_y", 0.0)
+        self.sum_xx: float = stored.get("sum_xx", 0.0)
+        self.sum_xy: float = stored.get("sum_xy", 0.0)
+        self.samples: int = stored.get("samples", 0)
+
+    @property
+    def trained(self) -> bool:
+        """Return True once enough heat-up periods were observed."""
+        return self.samples >= PREHEAT_MIN_SAMPLES
+
+    def add(self, rate: float, delta: float) -> None:
+        """Add an observed rate (°C/h) at an indoor/outdoor difference (°C)."""
+        keep = 1 - 1 / PREHEAT_MEMORY
+        self.weight = self.weight * keep + 1
+        self.sum_x = self.sum_x * keep + delta
+        self.sum_y = self.sum_y * keep + rate
+        self.sum_xx = self.sum_xx * keep + delta * delta
+        self.sum_xy = self.sum_xy * keep + delta * rate
+        self.samples += 1
+
+    def predict(self, delta: float) -> float | None:
+        """Return the expected rate (°C/h) at a difference (None if untrained)."""
+        if not self.trained:
+            return None
+        mean_x = self.sum_x / self.weight
+        mean_y = self.sum_y / self.weight
+        variance = self.sum_xx / self.weight - mean_x * mean_x
+        rate = mean_y
+        if variance > 1.0:  # °C², enough outdoor spread for a slope
+            slope = (self.sum_xy / self.weight - mean_x * mean_y) / variance
+            rate = mean_y + slope * (delta - mean_x)
+        return max(rate, PREHEAT_MIN_RATE)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the persisted form of the model."""
+        return {
+            "weight": self.weight,
+            "sum_x": self.sum_x,
+            "sum_y": self.sum_y,
+            "sum_xx": self.sum_xx,
+            "sum_xy": self.sum_xy,
+            "samples": self.samples,
+        }
+
+
+class PreheatPlanner:
+    """Start comfort early enough to reach the comfort temperature on time.
+
+    Temperature readings are observed from the sensor state-change events.
+    While the room is heating towards comfort (comfort mode, normal or
+    schedule priority, below the comfort temperature), the rise over each
+    segment of PREHEAT_SEGMENT is added to the room's HeatUpModel. Before
+    the next comfort period (comfort time range, or schedule calendar event
+    known from the calendar lookahead), the lead time is the current deficit divided
+    by the predicted rate (capped at PREHEAT_MAX_LEAD) and the room switches
+    to comfort at that pre-heat start.
+    """
+
+    def __init__(self, hass: HomeAssistant, room_manager: RoomManager) -> None:
+        """Initialize the planner."""
+        self.hass = hass
+        self.room_manager = room_manager
+
+        self.model = HeatUpModel()
+        self._segment: tuple[datetime, float, float] | None = None
+        # (pre-heat start, comfort start) of the pre-heating in progress
+        self._active: tuple[datetime, datetime] | None = None
+        self._unsub_sensor: CALLBACK_TYPE | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if pre-heating is on and a temperature sensor exists."""
+        config = self.room_manager.room_config
+        return bool(config.get(CONF_PREHEAT, DEFAULT_PREHEAT)) and bool(
+            config.get(CONF_TEMPERATURE_SENSOR)
+        )
+
+    @property
+    def _target(self) -> float:
+        """Return the comfort temperature to reach."""
+        return self.room_manager.room_config.get(
+            CONF_TEMP_COMFORT, DEFAULT_TEMP_COMFORT
+        )
+
+    @callback
+    def async_setup(self, stored: dict[str, Any] | None) -> None:
+        """Restore the learned model and listen to the temperature sensor."""
+        if not self.enabled:
+            return
+        self.model = HeatUpModel(stored)
+        self._unsub_sensor = async_track_state_change_event(
+            self.hass,
+            self.room_manager.room_config[CONF_TEMPERATURE_SENSOR],
+            self._async_sensor_changed,
+        )
+
+    @callback
+    def _async_sensor_changed(self, event: Event) -> None:
+        """Observe a new temperature reading."""
+        new_state = event.data.get("new_state")
+        if new_state is None:
+            return
+        try:
+            value = float(new_state.state)
+        except (ValueError, TypeError):
+            return
+        if not math.isnan(value):
+            self._observe(value, new_state.last_updated)
+
+    def _is_heating_up(self, temperature: float) -> bool:
+        """Check if the room is currently heating towards comfort."""
+        room_manager = self.room_manager
+        return (
+            room_manager.is_automation_enabled()
+            and room_manager.get_current_mode() == MODE_COMFORT
+            and room_manager.climate_controller.priority
+            in (PRIORITY_NORMAL, PRIORITY_SCHEDULE)
+            and temperature < self._target - PREHEAT_MIN_DEFICIT
+        )
+
+    def _outdoor_delta(self, temperature: float) -> float:
+        """Return the indoor/outdoor difference (0 without outdoor sensor)."""
+        outdoor = self.room_manager.coordinator.state_cache.get_float(
+            self.room_manager.coordinator.entry.data.get(CONF_OUTDOOR_TEMP_SENSOR),
+            "outdoor temperature",
+        )
+        if outdoor is None or math.isnan(outdoor):
+            return 0.0
+        return temperature - outdoor
+
+    def _observe(self, temperature: float, when: datetime) -> None:
+        """Close a heat-up segment every PREHEAT_SEGMENT while heating."""
+        if not self._is_heating_up(temperature):
+            self._segment = None
+            return
+        if self._segment is None:
+            self._segment = (when, temperature, self._outdoor_delta(temperature))
+            return
+
+        started, start_temperature, delta = self._segment
+        elapsed = (when - started).total_seconds()
+        if elapsed < PREHEAT_SEGMENT:
+            return
+        if elapsed <= 4 * PREHEAT_SEGMENT:  # Sensor silent too long: no sample
+            rate = (temperature - start_temperature) * 3600 / elapsed
+            self.model.add(rate, delta)
+            _LOGGER.debug(
+                "🔥 Heat-up rate in %s: %.2f°C/h (outdoor delta %.1f°C, %d samples)",
+                self.room_manager.room_name,
+                rate,
+                delta,
+                self.model.samples,
+            )
+            self.room_manager.coordinator.async_schedule_preheat_save()
+        self._segment = (when, temperature, self._outdoor_delta(temperature))
+
+    def _temperature(self) -> float | None:
+        """Return the current room temperature (None if unavailable)."""
+        temperature = self.room_manager.coordinator.state_cache.get_float(
+            self.room_manager.room_config.get(CONF_TEMPERATURE_SENSOR), "temperature"
+        )
+        if temperature is None or math.isnan(temperature):
+            return None
+        return temperature
+
+    def heat_up_rate(self) -> float | None:
+        """Return the predicted heat-up rate in current conditions (°C/h)."""
+        temperature = self._temperature()
+        if temperature is None:
+            return None
+        return self.model.predict(self._outdoor_delta(temperature))
+
+    def lead_time(self) -> timedelta | None:
+        """Return how long the room needs to reach comfort (None if unknown)."""
+        temperature = self._temperature()
+        if temperature is None:
+            return None
+        deficit = self._target - temperature
+        if deficit <= 0:
+            return timedelta(0)
+        rate = self.model.predict(self._outdoor_delta(temperature))
+        if rate is None:
+            return None
+        return timedelta(hours=min(deficit / rate, PREHEAT_MAX_LEAD / 3600))
+
+    def next_comfort_start(self, now: datetime) -> datetime | None:
+        """Return when the next comfort period starts after now.
+
+        Rooms with a schedule calendar (comfort while an event is active) use
+        the next event from the calendar lookahead; other rooms the next
+        comfort time range starting in the day period.
+        """
+        config = self.room_manager.room_config
+        schedule_entity = config.get(CONF_SCHEDULE_ENTITY)
+        if schedule_entity:
+            if config.get(CONF_PRESET_SCHEDULE_ON, MODE_COMFORT) != MODE_COMFORT:
+                return None
+            return self.room_manager.coordinator.calendar_lookahead.next_start(
+                schedule_entity, now
+            )
+
+        night_start = dt_util.parse_time(
+            self.room_manager.room_config.get(CONF_NIGHT_START, DEFAULT_NIGHT_START)
+        )
+        day_start = dt_util.parse_time(DEFAULT_DAY_START)
+        upcoming = None
+        for time_range in (
+            self.room_manager.room_config.get(CONF_COMFORT_TIME_RANGES) or []
+        ):
+            try:
+                start_time = dt_util.parse_time(time_range.get("start") or "")
+            except (ValueError, TypeError):
+                continue
+            # A range starting in the night period never gives comfort
+            if (
+                start_time is None
+                or start_time >= night_start
+                or start_time < day_start
+            ):
+                continue
+            start = now.replace(
+                hour=start_time.hour,
+                minute=start_time.minute,
+                second=start_time.second,
+                microsecond=0,
+            )
+            if start <= now:
+                start += timedelta(days=1)
+            if upcoming is None or start < upcoming:
+                upcoming = start
+        return upcoming
+
+    def _plan(self, now: datetime) -> tuple[datetime, datetime] | None:
+        """Return the next (pre-heat start, comfort start), if within reach."""
+        comfort_start = self.next_comfort_start(now)
+        if comfort_start is None:
+            return None
+        if comfort_start - now > timedelta(seconds=PREHEAT_MAX_LEAD):
+            return None
+        lead = self.lead_time()
+        if lead is None:
+            return None
+        return comfort_start - lead, comfort_start
+
+    def preheat_start(self, now: datetime) -> datetime | None:
+        """Return when heating starts (or started) for the next comfort period."""
+        if not self.enabled:
+            return None
+        if self._active is not None and now < self._active[1]:
+            return self._active[0]
+        plan = self._plan(now)
+        return plan[0] if plan else None
+
+    def is_preheating(self, now: datetime) -> bool:
+        """Return True between the pre-heat start and the comfort period.
+
+        Once started, pre-heating holds until the comfort period begins: the
+        lead time shrinks as the room warms up and would otherwise end it.
+        """
+        if not self.enabled:
+            return False
+        if self._active is not None:
+            if now < self._active[1]:
+                return True
+            self._active = None
+
+        plan = self._plan(now)
+        if plan is None or plan[0] > now:
+            return False
+        self._active = plan
+        _LOGGER.info(
+            "🔥 Pre-heating %s to reach %.1f°C at %s",
+            self.room_manager.room_name,
+            self._target,
+            plan[1].strftime("%H:%M"),
+        )
+        return True
+
+    def get_state(self, now: datetime) -> dict[str, Any]:
+        """Get the planner state for the room sensor attributes."""
+        if not self.enabled:
+            return {}
+        start = self.preheat_start(now)
+        rate = self.heat_up_rate()
+        return {
+            "preheat_start": start.isoformat() if start else None,
+            "preheat_active": self._active is not None and now < self._active[1],
+            "heat_up_rate": round(rate, 2) if rate is not None else None,
+            "heat_up_samples": self.model.samples,
+        }
+
+    def async_shutdown(self) -> None:
+        """Unsubscribe from the sensor."""
+        if self._unsub_sensor:
+            self._unsub_sensor()
+            self._unsub_sensor = None
@@ -0,0 +1,262 @@
+"""Opt-in refresh profiler for Smart Room Manager."""
+
+from __future__ import annotations
+
+import cProfile
+import logging
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+try:
+    import yappi
+except ImportError:  # yappi is optional (coroutine-aware profiler)
+    yappi = None
+
+from .const import (
+    PROFILE_ENGINE_CPROFILE,
+    PROFILE_ENGINE_YAPPI,
+    PROFILE_FORMAT_CALLGRIND,
+    PROFILE_FORMAT_PSTATS,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import SmartRoomCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# yappi names the pstats format "pstat"
+YAPPI_FORMATS = {PROFILE_FORMAT_PSTATS: "pstat", PROFILE_FORMAT_CALLGRIND: "callgrind"}
+
+
+class RefreshProfiler:
+    """Profile a bounded number of coordinator refresh cycles.
+
+    The profiler is only enabled while a refresh is running, so the output
+    covers the room evaluation, the controllers' decision logic and the
+    service-dispatch awaits (including the handlers of the targeted devices
+    that run while we wait on them), but not the idle time between cycles.
+
+    Each cycle also records its wall time and its CPU time: the difference is
+    the time spent waiting on devices rather than computing.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: SmartRoomCoordinator) -> None:
+        """Initialize the profiler."""
+        self.hass = hass
+        self.coordinator = coordinator
+
+        self._engine: str | None = None
+        self._output_format: str = PROFILE_FORMAT_PSTATS
+        self._profile: cProfile.Profile | None = None
+        self._cycles_left: int | None = None
+        self._cycle_started: tuple[float, float] | None = None
+        self._cycles: list[dict[str, float]] = []
+        self._started_at = None
+        self._stop_timer: Callable[[], None] | None = None
+
+    @property
+    def active(self) -> bool:
+        """Return True if a profiling session is running."""
+        return self._engine is not None
+
+    @callback
+    def async_start(
+        self,
+        cycles: int | None = None,
+        duration: float | None = None,
+        engine: str = PROFILE_ENGINE_CPROFILE,
+        output_format: str = PROFILE_FORMAT_PSTATS,
+    ) -> None:
+        """Start profiling the next refresh cycles.
+
+        Args:
+            cycles: Number of refresh cycles to profile (ignored if duration set)
+            duration: Profile every refresh during this many seconds
+            engine: "cprofile" (stdlib) or "yappi" (optional, coroutine-aware)
+            output_format: "pstats" or "callgrind" (callgrind requires yappi)
+        """
+        if self.active:
+            raise HomeAssistantError("A profiling session is already running")
+
+        if output_format == PROFILE_FORMAT_CALLGRIND:
+            # cProfile cannot write callgrind files, yappi can
+            engine = PROFILE_ENGINE_YAPPI
+
+        if engine == PROFILE_ENGINE_YAPPI and yappi is None:
+            raise HomeAssistantError(
+                "The yappi package is required for this profiler engine/format"
+            )
+
+        self._engine = engine
+        self._output_format = output_format
+        self._cycles = []
+        self._started_at = self.coordinator.clock.now()
+
+        if duration:
+            self._cycles_left = None
+            self._stop_timer = self.coordinator.clock.async_call_later(
+                self.hass, duration, self._async_duration_expired
+            )
+        else:
+            self._cycles_left = max(1, int(cycles or 1))
+
+        if engine == PROFILE_ENGINE_YAPPI:
+            yappi.clear_stats()
+            yappi.set_clock_type("wall")
+        else:
+            self._profile = cProfile.Profile()
+
+        _LOGGER.info(
+            "Profiling started (engine: %s, %s)",
+            engine,
+            f"{duration}s" if duration else f"{self._cycles_left} cycles",
+        )
+
+    def start_cycle(self) -> None:
+        """Enable the profiler for a refresh cycle (no-op if inactive)."""
+        if not self.active:
+            return
+
+        self._cycle_started = (time.perf_counter(), time.process_time())
+        if self._engine == PROFILE_ENGINE_YAPPI:
+            yappi.start()
+        elif self._profile is not None:
+            self._profile.enable()
+
+    async def async_end_cycle(self) -> None:
+        """Disable the profiler after a refresh cycle (no-op if inactive)."""
+        if not self.active or self._cycle_started is None:
+            return
+
+        self._pause()
+        wall_start, cpu_start = self._cycle_started
+        self._cycle_started = None
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        self._cycles.append(
+            {
+                "wall_ms": wall * 1000,
+                "cpu_ms": cpu * 1000,
+                "wait_ms": (wall - cpu) * 1000,
+            }
+        )
+
+        if self._cycles_left is not None:
+            self._cycles_left -= 1
+            if self._cycles_left <= 0:
+                await self.async_stop()
+
+    async def _async_duration_expired(self, _now: Any) -> None:
+        """Stop a duration-based session."""
+        self._stop_timer = None
+        await self.async_stop()
+
+    def _pause(self) -> None:
+        """Pause data collection."""
+        if self._engine == PROFILE_ENGINE_YAPPI:
+            yappi.stop()
+        elif self._profile is not None:
+            self._profile.disable()
+
+    async def async_stop(self) -> str | None:
+        """Stop the session and write the profile file off the event loop.
+
+        Returns the path of the written file (None if nothing was profiled).
+        """
+        if not self.active:
+            return None
+
+        if self._stop_timer:
+            self._stop_timer()
+            self._stop_timer = None
+
+        if self._cycle_started is not None:
+            # Stopped in the middle of a cycle (shutdown)
+            self._pause()
+            self._cycle_started = None
+
+        engine = self._engine
+        profile = self._profile
+        cycles = self._cycles
+        self._engine = None
+        self._profile = None
+        self._cycles_left = None
+
+        if not cycles:
+            _LOGGER.info("Profiling stopped - no refresh cycle was profiled")
+            return None
+
+        extension = (
+            "callgrind" if self._output_format == PROFILE_FORMAT_CALLGRIND else "prof"
+        )
+        timestamp = self._started_at.strftime("%Y%m%d_%H%M%S")
+        path = self.hass.config.path(f"smart_room_manager_{timestamp}.{extension}")
+
+        # A failed write must never break the refresh that ended the session
+        try:
+            await self.hass.async_add_executor_job(
+                self._write_profile, engine, profile, path, self._output_format
+            )
+        except Exception as err:
+            _LOGGER.error("Error writing the profile to %s: %s", path, err)
+            return None
+
+        summary = self._summarize(cycles)
+        _LOGGER.info(
+            "Profiling finished: %d cycles, wall %.1f ms, CPU %.1f ms, "
+            "waiting %.1f ms (avg per cycle) - written to %s",
+            summary["cycles"],
+            summary["avg_wall_ms"],
+            summary["avg_cpu_ms"],
+            summary["avg_wait_ms"],
+            path,
+        )
+
+        try:
+            await self.hass.services.async_call(
+                "persistent_notification",
+                "create",
+                {
+                    "title": "Smart Room Manager - Profilage",
+                    "message": (
+                        f"Profilage terminé ({summary['cycles']} cycles) :\n"
+                        f"- Durée moyenne : {summary['avg_wall_ms']:.1f} ms\n"
+                        f"- Temps CPU moyen : {summary['avg_cpu_ms']:.1f} ms\n"
+                        f"- Attente équipements : {summary['avg_wait_ms']:.1f} ms\n"
+                        f"- Fichier : {path}"
+                    ),
+                    "notification_id": "smart_room_profile",
+                },
+            )
+        except Exception as err:
+            _LOGGER.error("Error creating the profiling notification: %s", err)
+        return path
+
+    @staticmethod
+    def _write_profile(
+        engine: str | None,
+        profile: cProfile.Profile | None,
+        path: str,
+        output_format: str,
+    ) -> None:
+        """Write the collected statistics (runs in the executor)."""
+        if engine == PROFILE_ENGINE_YAPPI:
+            yappi.get_func_stats().save(path, type=YAPPI_FORMATS[output_format])
+            yappi.clear_stats()
+        elif profile is not None:
+            profile.dump_stats(path)
+
+    @staticmethod
+    def _summarize(cycles: list[dict[str, float]]) -> dict[str, float]:
+        """Average the per-cycle timings."""
+        count = len(cycles)
+        return {
+            "cycles": count,
+            "avg_wall_ms": sum(c["wall_ms"] for c in cycles) / count,
+            "avg_cpu_ms": sum(c["cpu_ms"] for c in cycles) / count,
+            "avg_wait_ms": sum(c["wait_ms"] for c in cycles) / count,
+        }
@@ -2,21 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.const import STATE_ON
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.util import dt as dt_util
 
 from .climate_control import ClimateController
 from .const import (  # v0.3.0 additions; Priority 2 additions
     ALARM_STATE_ARMED_AWAY,
     CONF_ALARM_ENTITY,
-    CONF_CLIMATE_WINDOW_CHECK,
+    CONF_CLIMATE_ENTITY,
     CONF_COMFORT_TIME_RANGES,
-    CONF_DOOR_WINDOW_SENSORS,
-    CONF_IGNORE_IN_AWAY,
     CONF_LIGHTS,
     CONF_NIGHT_START,
     CONF_PRESET_SCHEDULE_OFF,
@@ -25,21 +25,20 @@ from .const import (  # v0.3.0 additions; Priority 2 additions
     CONF_ROOM_NAME,
     CONF_ROOM_TYPE,
     CONF_SCHEDULE_ENTITY,
-    CONF_WINDOW_DELAY_CLOSE,
-    CONF_WINDOW_DELAY_OPEN,
     DEFAULT_DAY_START,
     DEFAULT_NIGHT_START,
-    DEFAULT_WINDOW_DELAY_CLOSE,
-    DEFAULT_WINDOW_DELAY_OPEN,
     MODE_COMFORT,
     MODE_ECO,
-    MODE_FROST_PROTECTION,
-    MODE_NIGHT,
-    ROOM_TYPE_BATHROOM,
     TIME_PERIOD_DAY,
     TIME_PERIOD_NIGHT,
 )
+from .fingerprint import InputFingerprint
 from .light_control import LightController
+from .occupancy import OccupancyTracker
+from .preheat import PreheatPlanner
+from .rules import RuleEngine
+from .temperature_filter import TemperatureFilter
+from .window_tracker import WindowTracker
 
 if TYPE_CHECKING:
     from .coordinator import SmartRoomCoordinator
@@ -75,19 +74,39 @@ class RoomManager:
         self.room_type: str = room_config.get(CONF_ROOM_TYPE, "normal")
 
         # State tracking
-        self._windows_open: bool = False
         self._is_night: bool = False
         self._current_mode: str = MODE_COMFORT
         self._automation_enabled: bool = True
 
-        # Window delay tracking (Priority 2)
-        self._windows_opened_at = None  # Timestamp when windows opened
-        self._windows_closed_at = None  # Timestamp when windows closed
+        # Time of the current evaluation (captured once per tick by the coordinator)
+        self._now: datetime | None = None
+
+        # One evaluation at a time: event-driven refreshes wait for the tick
+        self._update_lock = asyncio.Lock()
+
+        # Door/window sensors with open/close delays (Priority 2, event driven)
+        self.window_tracker = WindowTracker(hass, self)
+
+        # Motion/presence sensors with a vacancy timeout (event driven)
+        self.occupancy = OccupancyTracker(hass, self)
+
+        # Smoothed temperature sensor for hysteresis (event driven)
+        self.temperature_filter = TemperatureFilter(hass, self)
+
+        # Learned heat-up model, starts comfort early (event driven)
+        self.preheat = PreheatPlanner(hass, self)
 
         # Controllers
         self.light_controller = LightController(hass, room_config, self)
         self.climate_controller = ClimateController(hass, room_config, self)
 
+        # Priority rules compiled from the room configuration
+        self.rules = RuleEngine(self)
+
+        # Inputs of the last evaluation: unchanged inputs skip the pass
+        self.fingerprint = InputFingerprint(self)
+        self._state: dict[str, Any] | None = None
+
         _LOGGER.debug(
             "Room manager initialized for %s (ID: %s, Type: %s)",
             self.room_name,
@@ -111,61 +130,63 @@ class RoomManager:
         self.room_type = room_config.get(CONF_ROOM_TYPE, "normal")
         self.light_controller.update_config(room_config)
         self.climate_controller.update_config(room_config)
+        self.rules.compile()
+        self.fingerprint.compile()
         _LOGGER.debug("Room config updated for %s", self.room_name)
 
-    async def async_update(self) -> dict[str, Any]:
-        """Update room state and control logic."""
-        # Update window states
-        self._update_window_states()
+    @property
+    def now(self) -> datetime:
+        """Return the time of the current evaluation tick (local time)."""
+        return self._now or self.coordinator.clock.now()
+
+    async def async_update(
+        self, now: datetime | None = None, force: bool = False
+    ) -> dict[str, Any]:
+        """Update room state and control logic.
+
+        Args:
+            now: Time of this tick, shared by every room (default: clock now)
+            force: Run the full pass even if the inputs did not change
+                (timer expiries, rooms selected by the batch engine)
+
+        Evaluations of the room are serialized: a refresh triggered by an
+        event (window delay, timer, load shedding...) while the room is being
+        evaluated runs after it, from the inputs of that moment.
+        """
+        async with self._update_lock:
+            return await self._async_update(now, force)
+
+    async def _async_update(self, now: datetime | None, force: bool) -> dict[str, Any]:
+        """Evaluate the room and apply the decision (lock held)."""
+        self._now = now or self.coordinator.clock.now()
+        watchdog = self.coordinator.watchdog
 
         # Update night period
-        self._update_night_period()
+        with watchdog.measure(self.room_name, "night_period"):
+            self._update_night_period()
 
-        # Determine current mode
-        self._update_current_mode()
+        # Same inputs as the previous tick: same decision, nothing to send
+        with watchdog.measure(self.room_name, "fingerprint"):
+            unchanged = self.fingerprint.unchanged(
+                self._now, force or self._state is None
+            )
+        if unchanged:
+            return self._state
+
+        # Determine current mode and climate priority in one pass
+        with watchdog.measure(self.room_name, "current_mode"):
+            decision = self.rules.evaluate(self._now, self._automation_enabled)
+            self._current_mode = decision.mode
 
         # Update controllers
         if self._automation_enabled:
             await self.light_controller.async_update()
-            await self.climate_controller.async_update()
+            await self.climate_controller.async_update(decision)
 
         # Return current state
-        return self.get_state()
-
-    def _update_window_states(self) -> None:
-        """Update window/door open states with delay tracking."""
-        # Use 'or []' to handle None values (dict.get returns None if value is None)
-        door_window_sensors = self.room_config.get(CONF_DOOR_WINDOW_SENSORS) or []
-
-        if not door_window_sensors:
-            previous_state = self._windows_open
-            self._windows_open = False
-            # Track close timestamp if changed
-            if previous_state and not self._windows_open:
-                self._windows_closed_at = dt_util.now()
-            return
-
-        # Check if any door/window sensor is open
-        any_open = False
-        for entity_id in door_window_sensors:
-            state = self.hass.states.get(entity_id)
-            if state and state.state == STATE_ON:
-                any_open = True
-                break
-
-        # Track state changes with timestamps
-        previous_state = self._windows_open
-        self._windows_open = any_open
-
-        # Track open/close timestamps
-        if not previous_state and self._windows_open:
-            # Windows just opened
-            self._windows_opened_at = dt_util.now()
-            self._windows_closed_at = None
-        elif previous_state and not self._windows_open:
-            # Windows just closed
-            self._windows_closed_at = dt_util.now()
-            self._windows_opened_at = None
+        with watchdog.measure(self.room_name, "room_state"):
+            self._state = self.get_state()
+        return self._state
 
     def _update_night_period(self) -> None:
         """Update night period status.
@@ -173,7 +194,7 @@ class RoomManager:
         Handles midnight crossing: night_start=22:00, day_start=06:00
         means night is 22:00-23:59 AND 00:00-05:59.
         """
-        now = dt_util.now().time()
+        now = self.now.time()
         night_start = dt_util.parse_time(
             self.room_config.get(CONF_NIGHT_START, DEFAULT_NIGHT_START)
         )
@@ -191,7 +212,7 @@ class RoomManager:
         if not comfort_ranges:
             return False
 
-        now = dt_util.now().time()
+        now = self.now.time()
 
         for time_range in comfort_ranges:
             start_str = time_range.get("start")
@@ -223,80 +244,6 @@ class RoomManager:
 
         return False
 
-    def _update_current_mode(self) -> None:
-        """Determine current operating mode.
-
-        Priority order (aligned with climate_control.async_update):
-        1. Windows open (with delay) → frost_protection
-        2. Away mode (alarm armed_away) → frost_protection OR schedule if ignore_in_away
-        3. Bathroom special logic
-        4. Schedule
-        5. Night period
-        6. Comfort time ranges
-        7. Default: Eco
-        """
-        # PRIORITY 1: Check windows open (aligned with climate_control PRIORITY 2)
-        if self.room_config.get(CONF_CLIMATE_WINDOW_CHECK, True):
-            if self.is_windows_open_delayed():
-                self._current_mode = MODE_FROST_PROTECTION
-                return
-
-        # PRIORITY 2: Check alarm armed_away
-        alarm_entity = self.coordinator.entry.data.get(CONF_ALARM_ENTITY)
-        if alarm_entity:
-            alarm_state = self.hass.states.get(alarm_entity)
-            if alarm_state and alarm_state.state == ALARM_STATE_ARMED_AWAY:
-                # Check if schedule should be used even when away
-                ignore_in_away = self.room_config.get(CONF_IGNORE_IN_AWAY, False)
-                if ignore_in_away:
-                    schedule_mode = self.get_schedule_mode()
-                    if schedule_mode:
-                        self._current_mode = schedule_mode
-                        return
-                # Default away behavior: frost protection
-                self._current_mode = MODE_FROST_PROTECTION
-                return
-
-        # PRIORITY 3: Bathroom special logic (light state determines mode)
-        if self.room_type == ROOM_TYPE_BATHROOM:
-            # Use 'or []' to handle None values (dict.get returns None if value is None)
-            lights = self.room_config.get(CONF_LIGHTS) or []
-            if lights:
-                # Check if ANY light is ON
-                any_light_on = False
-                for light_entity in lights:
-                    light_state = self.hass.states.get(light_entity)
-                    if light_state and light_state.state == STATE_ON:
-                        any_light_on = True
-                        break
-
-                if any_light_on:
-                    self._current_mode = MODE_COMFORT
-                    return
-                else:
-                    self._current_mode = MODE_ECO
-                    return
-
-        # PRIORITY 4: Check schedule/calendar (v0.3.0+)
-        # Schedule has priority over night period (explicit user config)
-        schedule_mode = self.get_schedule_mode()
-        if schedule_mode:
-            self._current_mode = schedule_mode
-            return
-
-        # PRIORITY 5: Night period
-        if self._is_night:
-            self._current_mode = MODE_NIGHT
-            return
-
-        # PRIORITY 6: Check legacy comfort time ranges (backward compatibility)
-        if self._is_in_comfort_time_range():
-            self._current_mode = MODE_COMFORT
-            return
-
-        # DEFAULT: Eco
-        self._current_mode = MODE_ECO
-
     def is_night_period(self) -> bool:
         """Check if it's night period."""
         return self._is_night
@@ -307,7 +254,7 @@ class RoomManager:
 
     def is_windows_open(self) -> bool:
         """Check if any windows/doors are open."""
-        return self._windows_open
+        return self.window_tracker.windows_open
 
     def is_windows_open_delayed(self) -> bool:
         """Check if windows are open with delay (Priority 2).
@@ -315,34 +262,7 @@ class RoomManager:
         Returns True only if windows have been open longer than delay_open.
         Returns False only if windows have been closed longer than delay_close.
         """
-        # Get configured delays
-        delay_open = self.room_config.get(
-            CONF_WINDOW_DELAY_OPEN, DEFAULT_WINDOW_DELAY_OPEN
-        )
-        delay_close = self.room_config.get(
-            CONF_WINDOW_DELAY_CLOSE, DEFAULT_WINDOW_DELAY_CLOSE
-        )
-
-        now = dt_util.now()
-
-        # If windows are currently open
-        if self._windows_open:
-            # Check if we have an open timestamp and delay has elapsed
-            if self._windows_opened_at:
-                elapsed = (now - self._windows_opened_at).total_seconds() / 60
-                return elapsed >= delay_open
-            # No timestamp yet (first check), assume not delayed
-            return False
-
-        # If windows are currently closed
-        else:
-            # Check if we have a close timestamp and delay has elapsed
-            if self._windows_closed_at:
-                elapsed = (now - self._windows_closed_at).total_seconds() / 60
-                # Return False (not open) only after delay has elapsed
-                return elapsed < delay_close
-            # No timestamp, windows were already closed
-            return False
+        return self.window_tracker.open_delayed
 
     def get_current_mode(self) -> str:
         """Get current operating mode."""
@@ -360,13 +280,15 @@ class RoomManager:
             self.room_name,
             "enabled" if enabled else "disabled",
         )
+        climate_entity = self.room_config.get(CONF_CLIMATE_ENTITY)
+        if climate_entity:
+            self.coordinator.load_shedder.set_controlled(climate_entity, enabled)
 
     def is_paused(self) -> bool:
         """Check if manual pause is active (v0.3.0)."""
         # Get pause switch state from HA
         pause_switch_id = f"switch.smart_room_{self.room_id}_pause"
-        pause_state = self.hass.states.get(pause_switch_id)
-        return pause_state and pause_state.state == STATE_ON
+        return self.coordinator.state_cache.is_on(pause_switch_id)
 
     def get_schedule_mode(self) -> str | None:
         """Get mode from schedule calendar (v0.3.0).
@@ -381,20 +303,40 @@ class RoomManager:
             return None
 
         # Check if calendar entity exists
-        calendar_state = self.hass.states.get(schedule_entity)
-        if not calendar_state:
+        calendar_state = self.coordinator.state_cache.get_state(schedule_entity)
+        if calendar_state is None:
             return None
 
         # Get presets for on/off states
         preset_on = self.room_config.get(CONF_PRESET_SCHEDULE_ON, MODE_COMFORT)
         preset_off = self.room_config.get(CONF_PRESET_SCHEDULE_OFF, MODE_ECO)
 
-        # Calendar state ON = event active
-        if calendar_state.state == STATE_ON:
+        if self.is_schedule_event_active(calendar_state, self.now):
             return preset_on
         else:
             return preset_off
 
+    def is_schedule_event_active(self, calendar_state: str, now: datetime) -> bool:
+        """Check if the schedule calendar has an event at a given time.
+
+        Events come from the shared calendar lookahead (exact at transitions),
+        else from the calendar state (ON = event active). Rooms switching to
+        comfort for events are also "on" while pre-heating for the next one.
+
+        Args:
+            calendar_state: Current state of the calendar entity
+            now: Time of the evaluation
+        """
+        schedule_entity = self.room_config.get(CONF_SCHEDULE_ENTITY)
+        active = self.coordinator.calendar_lookahead.is_active(schedule_entity, now)
+        if active is None:
+            active = calendar_state == STATE_ON
+        if active:
+            return True
+        if self.room_config.get(CONF_PRESET_SCHEDULE_ON, MODE_COMFORT) != MODE_COMFORT:
+            return False
+        return self.preheat.is_preheating(now)
+
     def get_state(self) -> dict[str, Any]:
         """Get current room state."""
         # Get alarm state for state reporting
@@ -403,28 +345,26 @@ class RoomManager:
         occupied = True  # Default to occupied if no alarm
 
         if alarm_entity:
-            alarm_state = self.hass.states.get(alarm_entity)
-            if alarm_state:
-                alarm_state_value = alarm_state.state
+            alarm_state = self.coordinator.state_cache.get_state(alarm_entity)
+            if alarm_state is not None:
+                alarm_state_value = alarm_state
                 # In v0.2.0: occupied = NOT armed_away (simplified presence detection)
                 occupied = alarm_state_value != ALARM_STATE_ARMED_AWAY
 
+        # Rooms with motion/presence sensors: occupied only when detected
+        if self.occupancy.enabled:
+            occupied = occupied and self.occupancy.occupied
+
         # Check if any light is on (for bathroom logic reporting)
         # Use 'or []' to handle None values (dict.get returns None if value is None)
         lights = self.room_config.get(CONF_LIGHTS) or []
-        light_on = False
-        if lights:
-            for light_entity in lights:
-                light_state = self.hass.states.get(light_entity)
-                if light_state and light_state.state == STATE_ON:
-                    light_on = True
-                    break
+        light_on = self.coordinator.state_cache.any_on(lights)
 
         # Get light state with should_be_on
         light_state_data = self.light_controller.get_state()
-        # In simplified v0.2.0: no automatic "should be on" logic
-        # Lights are manual or via external automation
-        light_state_data["should_be_on"] = False
+        # Lights are needed while occupancy sensors detect someone; without
+        # sensors lights are manual or via external automation
+        light_state_data["should_be_on"] = self.occupancy.enabled and occupied
 
         # v0.3.0: Get schedule and pause status
         schedule_active = self.get_schedule_mode() is not None
@@ -435,11 +375,13 @@ class RoomManager:
             "room_name": self.room_name,
             "room_type": self.room_type,
             "is_night": self._is_night,
-            "windows_open": self._windows_open,
+            "windows_open": self.window_tracker.windows_open,
             "current_mode": self._current_mode,
             "time_period": self.get_time_period(),
             "alarm_state": alarm_state_value,
             "occupied": occupied,
+            # Occupancy sensors of the room (empty when none)
+            "occupancy": self.occupancy.get_state(),
             "light_on": light_on,
             "automation_enabled": self._automation_enabled,
             "light_state": light_state_data,
@@ -447,10 +389,38 @@ class RoomManager:
             # v0.3.0 additions
             "schedule_active": schedule_active,
             "pause_active": pause_active,
+            # Pre-heating and upcoming schedule transition (empty when unknown)
+            "preheat": self.preheat.get_state(self.now),
+            "schedule_lookahead": self.coordinator.calendar_lookahead.get_state(
+                self.room_config.get(CONF_SCHEDULE_ENTITY), self.now
+            ),
+            # Deciding rules and per-rule hit counters
+            "rules": self.rules.get_state(),
+            # Forced mode and its expiry (group services)
+            "mode_override": self.coordinator.mode_overrides.get_state(self.room_id),
+            # Event-loop watchdog statistics (empty when disabled)
+            "loop_watchdog": self.coordinator.watchdog.get_room_stats(self.room_name),
         }
 
+    @callback
+    def async_setup(self, preheat_model: dict[str, Any] | None = None) -> None:
+        """Start the event listeners of the controllers.
+
+        Args:
+            preheat_model: Persisted heat-up model of the room (if any)
+        """
+        self.window_tracker.async_setup()
+        self.occupancy.async_setup()
+        self.temperature_filter.async_setup()
+        self.preheat.async_setup(preheat_model)
+        self.light_controller.async_setup()
+
     async def async_shutdown(self) -> None:
         """Shutdown room manager."""
+        self.window_tracker.async_shutdown()
+        self.occupancy.async_shutdown()
+        self.temperature_filter.async_shutdown()
+        self.preheat.async_shutdown()
         await self.light_controller.async_shutdown()
         await self.climate_controller.async_shutdown()
         _LOGGER.debug("Room manager shut down for %s", self.room_name)
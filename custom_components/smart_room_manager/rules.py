@@ -0,0 +1,434 @@
+"""Declarative priority rules for Smart Room Manager."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from datetime import datetime
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+from .const import (
+    ALARM_STATE_ARMED_AWAY,
+    CONF_ALARM_ENTITY,
+    CONF_CLIMATE_BYPASS_SWITCH,
+    CONF_CLIMATE_ENTITY,
+    CONF_CLIMATE_WINDOW_CHECK,
+    CONF_COMFORT_TIME_RANGES,
+    CONF_EXTERNAL_CONTROL_SWITCH,
+    CONF_IGNORE_IN_AWAY,
+    CONF_LIGHTS,
+    CONF_SCHEDULE_ENTITY,
+    CONF_SOLAR_BOOST,
+    MODE_COMFORT,
+    MODE_ECO,
+    MODE_FROST_PROTECTION,
+    MODE_NIGHT,
+    PRIORITY_AWAY,
+    PRIORITY_BYPASS,
+    PRIORITY_EXTERNAL_CONTROL,
+    PRIORITY_NORMAL,
+    PRIORITY_OVERRIDE,
+    PRIORITY_PAUSED,
+    PRIORITY_SCHEDULE,
+    PRIORITY_VACANT,
+    PRIORITY_WINDOWS_OPEN,
+    ROOM_TYPE_BATHROOM,
+)
+
+if TYPE_CHECKING:
+    from .room_manager import RoomManager
+
+_LOGGER = logging.getLogger(__name__)
+
+# Climate actions (carried out by ClimateController)
+ACTION_NONE: str = "none"  # Leave the climate entity alone
+ACTION_FROST_WINDOW: str = "frost_window"  # Frost protection, windows open
+ACTION_FROST_AWAY: str = "frost_away"  # Frost protection, away
+ACTION_EXTERNAL: str = "external"  # External control preset/temperature
+ACTION_APPLY: str = "apply"  # Apply the climate mode of the rule
+
+
+class RuleInputs:
+    """Inputs of one room evaluation, each read at most once.
+
+    Rules only read the inputs they need (short-circuit), and inputs shared
+    by several rules (schedule mode, away) are computed once per evaluation.
+    """
+
+    def __init__(self, room_manager: RoomManager, now: datetime) -> None:
+        """Initialize the inputs of an evaluation."""
+        self.room_manager = room_manager
+        self.now = now
+
+    @cached_property
+    def paused(self) -> bool:
+        """Return True if the manual pause switch is on."""
+        return self.room_manager.is_paused()
+
+    @cached_property
+    def bypass(self) -> bool:
+        """Return True if the climate bypass switch is on."""
+        return self.room_manager.coordinator.state_cache.is_on(
+            self.room_manager.room_config.get(CONF_CLIMATE_BYPASS_SWITCH)
+        )
+
+    @cached_property
+    def windows_open(self) -> bool:
+        """Return True if windows are open past their delay."""
+        return self.room_manager.is_windows_open_delayed()
+
+    @cached_property
+    def external_control(self) -> bool:
+        """Return True if external control (Solar Optimizer...) takes over."""
+        return self.room_manager.climate_controller.is_external_control_active(
+            self.away
+        )
+
+    @cached_property
+    def override(self) -> str | None:
+        """Return the forced mode of the room (None if not forced)."""
+        room_manager = self.room_manager
+        return room_manager.coordinator.mode_overrides.mode(
+            room_manager.room_id, self.now
+        )
+
+    @cached_property
+    def away(self) -> bool:
+        """Return True if the alarm is armed away."""
+        coordinator = self.room_manager.coordinator
+        alarm_entity = coordinator.entry.data.get(CONF_ALARM_ENTITY)
+        if not alarm_entity:
+            return False
+        return coordinator.state_cache.get_state(alarm_entity) == ALARM_STATE_ARMED_AWAY
+
+    @cached_property
+    def vacant(self) -> bool:
+        """Return True if the occupancy sensors saw nobody for the eco delay."""
+        return self.room_manager.occupancy.vacant
+
+    @cached_property
+    def schedule_mode(self) -> str | None:
+        """Return the mode from the schedule calendar (None if no schedule)."""
+        return self.room_manager.get_schedule_mode()
+
+    @cached_property
+    def light_on(self) -> bool:
+        """Return True if any light of the room is on."""
+        return self.room_manager.coordinator.state_cache.any_on(
+            self.room_manager.room_config.get(CONF_LIGHTS) or []
+        )
+
+    @cached_property
+    def preheating(self) -> bool:
+        """Return True while pre-heating for the next comfort period."""
+        return self.room_manager.preheat.is_preheating(self.now)
+
+    @cached_property
+    def night(self) -> bool:
+        """Return True during the night period."""
+        return self.room_manager.is_night_period()
+
+    @cached_property
+    def comfort_range(self) -> bool:
+        """Return True within a legacy comfort time range."""
+        return self.room_manager._is_in_comfort_time_range()
+
+
+def _always(_inputs: RuleInputs) -> bool:
+    return True
+
+
+def _schedule_mode(inputs: RuleInputs, _mode: str) -> str | None:
+    return inputs.schedule_mode
+
+
+def _room_mode(_inputs: RuleInputs, mode: str) -> str:
+    return mode
+
+
+def _override_mode(inputs: RuleInputs, _mode: str) -> str | None:
+    return inputs.override
+
+
+class Rule:
+    """One row of the priority table.
+
+    A rule decides the room mode (mode), the climate priority and action
+    (priority, action, climate_mode), or both. applies filters the rule out
+    at compile time for rooms whose configuration can never match it.
+    """
+
+    __slots__ = (
+        "name",
+        "label",
+        "condition",
+        "applies",
+        "mode",
+        "priority",
+        "action",
+        "climate_mode",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        label: str,
+        condition: Callable[[RuleInputs], bool],
+        *,
+        applies: Callable[[RoomManager], bool] | None = None,
+        mode: Callable[[RuleInputs], str] | None = None,
+        priority: str | None = None,
+        action: str = ACTION_NONE,
+        climate_mode: Callable[[RuleInputs, str], str | None] | None = None,
+    ) -> None:
+        """Initialize the rule."""
+        self.name = name
+        self.label = label
+        self.condition = condition
+        self.applies = applies
+        self.mode = mode
+        self.priority = priority
+        self.action = action
+        self.climate_mode = climate_mode
+
+
+# Priority table, highest first. Room mode rules and climate rules share one
+# order; each evaluation takes the first matching rule for each of them.
+RULES: tuple[Rule, ...] = (
+    Rule(
+        "paused",
+        "⏸️ Manual pause active - skipping automation",
+        lambda inputs: inputs.paused,
+        priority=PRIORITY_PAUSED,
+    ),
+    Rule(
+        "bypass",
+        "🔌 Climate bypass active - skipping control",
+        lambda inputs: inputs.bypass,
+        applies=lambda room: bool(room.room_config.get(CONF_CLIMATE_BYPASS_SWITCH)),
+        priority=PRIORITY_BYPASS,
+    ),
+    Rule(
+        "windows_open",
+        "🪟 Windows open - setting frost protection",
+        lambda inputs: inputs.windows_open,
+        applies=lambda room: room.room_config.get(CONF_CLIMATE_WINDOW_CHECK, True),
+        mode=lambda _inputs: MODE_FROST_PROTECTION,
+        priority=PRIORITY_WINDOWS_OPEN,
+        action=ACTION_FROST_WINDOW,
+    ),
+    Rule(
+        "override",
+        "✋ Mode forced - applying the override",
+        lambda inputs: inputs.override is not None,
+        mode=lambda inputs: inputs.override,
+        priority=PRIORITY_OVERRIDE,
+        action=ACTION_APPLY,
+        climate_mode=_override_mode,
+    ),
+    Rule(
+        "external_control",
+        "🌞 External control active - applying external control",
+        lambda inputs: inputs.external_control,
+        applies=lambda room: bool(
+            room.room_config.get(CONF_EXTERNAL_CONTROL_SWITCH)
+            or room.room_config.get(CONF_SOLAR_BOOST)
+        ),
+        priority=PRIORITY_EXTERNAL_CONTROL,
+        action=ACTION_EXTERNAL,
+    ),
+    Rule(
+        "away_schedule",
+        "🏠 Away mode but ignore_in_away=True - using schedule",
+        lambda inputs: inputs.away and bool(inputs.schedule_mode),
+        applies=lambda room: bool(
+            room.room_config.get(CONF_IGNORE_IN_AWAY, False)
+            and room.room_config.get(CONF_SCHEDULE_ENTITY)
+        ),
+        mode=lambda inputs: inputs.schedule_mode,
+        priority=PRIORITY_SCHEDULE,
+        action=ACTION_APPLY,
+        climate_mode=_schedule_mode,
+    ),
+    Rule(
+        "away",
+        "🏠 Away mode active - setting frost protection",
+        lambda inputs: inputs.away,
+        mode=lambda _inputs: MODE_FROST_PROTECTION,
+        priority=PRIORITY_AWAY,
+        action=ACTION_FROST_AWAY,
+    ),
+    Rule(
+        "vacant",
+        "🚶 Room empty - setting eco",
+        lambda inputs: inputs.vacant,
+        applies=lambda room: room.occupancy.enabled,
+        mode=lambda _inputs: MODE_ECO,
+        priority=PRIORITY_VACANT,
+        action=ACTION_APPLY,
+        climate_mode=_room_mode,
+    ),
+    Rule(
+        "bathroom_light",
+        "🛁 Bathroom - light state sets the mode",
+        _always,
+        applies=lambda room: room.room_type == ROOM_TYPE_BATHROOM
+        and bool(room.room_config.get(CONF_LIGHTS)),
+        mode=lambda inputs: MODE_COMFORT if inputs.light_on else MODE_ECO,
+    ),
+    Rule(
+        "bathroom",
+        "🛁 Bathroom - light-based mode takes priority over schedule",
+        _always,
+        applies=lambda room: room.room_type == ROOM_TYPE_BATHROOM,
+        priority=PRIORITY_NORMAL,
+        action=ACTION_APPLY,
+        climate_mode=_room_mode,
+    ),
+    Rule(
+        "schedule",
+        "📅 Schedule active",
+        lambda inputs: inputs.schedule_mode is not None,
+        applies=lambda room: bool(room.room_config.get(CONF_SCHEDULE_ENTITY)),
+        mode=lambda inputs: inputs.schedule_mode,
+        priority=PRIORITY_SCHEDULE,
+        action=ACTION_APPLY,
+        climate_mode=_schedule_mode,
+    ),
+    Rule(
+        "preheat",
+        "🔥 Pre-heating before the next comfort period",
+        lambda inputs: inputs.preheating,
+        applies=lambda room: room.preheat.enabled,
+        mode=lambda _inputs: MODE_COMFORT,
+    ),
+    Rule(
+        "night",
+        "🌙 Night period",
+        lambda inputs: inputs.night,
+        mode=lambda _inputs: MODE_NIGHT,
+    ),
+    Rule(
+        "comfort_range",
+        "☀️ Comfort time range",
+        lambda inputs: inputs.comfort_range,
+        applies=lambda room: bool(room.room_config.get(CONF_COMFORT_TIME_RANGES)),
+        mode=lambda _inputs: MODE_COMFORT,
+    ),
+    Rule(
+        "default",
+        "Normal logic",
+        _always,
+        mode=lambda _inputs: MODE_ECO,
+        priority=PRIORITY_NORMAL,
+        action=ACTION_APPLY,
+        climate_mode=_room_mode,
+    ),
+)
+
+
+class RuleDecision:
+    """Outcome of one evaluation of a room's rules."""
+
+    __slots__ = ("mode", "mode_rule", "climate_rule", "climate_mode")
+
+    def __init__(
+        self,
+        mode: str,
+        mode_rule: Rule,
+        climate_rule: Rule | None,
+        climate_mode: str | None,
+    ) -> None:
+        """Initialize the decision."""
+        self.mode = mode
+        self.mode_rule = mode_rule
+        self.climate_rule = climate_rule
+        self.climate_mode = climate_mode
+
+
+class RuleEngine:
+    """The priority table compiled for one room.
+
+    Rules that cannot apply to the room (no schedule, no bypass switch, not
+    a bathroom...) and climate rules of rooms without a climate entity are
+    dropped when compiling, so an evaluation only walks the rules the room
+    actually has. One pass decides both the room mode and the climate
+    priority, stopping as soon as both are known.
+    """
+
+    def __init__(self, room_manager: RoomManager) -> None:
+        """Initialize and compile the rules of a room."""
+        self.room_manager = room_manager
+        self._rules: list[Rule] = []
+        self.hits: dict[str, int] = {}
+        self.last_decision: RuleDecision | None = None
+        self.compile()
+
+    def compile(self) -> None:
+        """Select the rules of the room from its configuration (in order)."""
+        room = self.room_manager
+        has_climate = bool(room.room_config.get(CONF_CLIMATE_ENTITY))
+        self._rules = [
+            rule
+            for rule in RULES
+            if (rule.applies is None or rule.applies(room))
+            and (rule.mode is not None or has_climate)
+        ]
+        self.hits = {rule.name: 0 for rule in self._rules}
+        _LOGGER.debug(
+            "Rules compiled for %s: %s",
+            room.room_name,
+            ", ".join(rule.name for rule in self._rules),
+        )
+
+    def evaluate(self, now: datetime, climate: bool) -> RuleDecision:
+        """Evaluate the rules of the room.
+
+        Args:
+            now: Time of the evaluation
+            climate: Also decide the climate priority (automation enabled)
+        """
+        inputs = RuleInputs(self.room_manager, now)
+        mode_rule: Rule | None = None
+        climate_rule: Rule | None = None
+
+        for rule in self._rules:
+            wants_mode = mode_rule is None and rule.mode is not None
+            wants_climate = (
+                climate and climate_rule is None and rule.priority is not None
+            )
+            if not (wants_mode or wants_climate) or not rule.condition(inputs):
+                continue
+            if wants_mode:
+                mode_rule = rule
+            if wants_climate:
+                climate_rule = rule
+            if mode_rule is not None and (climate_rule is not None or not climate):
+                break
+
+        # The default rule always decides the mode
+        mode = mode_rule.mode(inputs)
+        self.hits[mode_rule.name] += 1
+        climate_mode = None
+        if climate_rule is not None:
+            if climate_rule is not mode_rule:
+                self.hits[climate_rule.name] += 1
+            if climate_rule.climate_mode is not None:
+                climate_mode = climate_rule.climate_mode(inputs, mode)
+
+        self.last_decision = RuleDecision(mode, mode_rule, climate_rule, climate_mode)
+        return self.last_decision
+
+    def get_state(self) -> dict[str, object]:
+        """Get the deciding rules and hit counters for the room attributes."""
+        decision = self.last_decision
+        return {
+            "mode_rule": decision.mode_rule.name if decision else None,
+            "climate_rule": (
+                decision.climate_rule.name
+                if decision and decision.climate_rule
+                else None
+            ),
+            "rule_hits": dict(self.hits),
+        }
@@ -5,8 +5,9 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
@@ -29,7 +30,7 @@ from .const import (
     PRIORITY_NORMAL,
 )
 from .coordinator import SmartRoomCoordinator
-from .entity import SmartRoomEntity
+from .entity import SmartRoomEntity, SmartRoomHouseEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -53,6 +54,10 @@ async def async_setup_entry(
         # v0.3.3 activity log sensor
         entities.append(SmartRoomActivitySensor(coordinator, room_manager.room_id))
 
+    # House heat demand (aggregated over the heated rooms)
+    if coordinator.heat_demand.enabled:
+        entities.append(SmartRoomHeatDemandSensor(coordinator))
+
     async_add_entities(entities)
 
 
@@ -125,6 +130,14 @@ class SmartRoomStateSensor(SmartRoomEntity, SensorEntity):
                 "target_temperature"
             )
 
+        # Predictive pre-heating (only when enabled)
+        if room_data.get("preheat"):
+            attributes.update(room_data["preheat"])
+
+        # Next schedule transition (only when the calendar events are known)
+        if room_data.get("schedule_lookahead"):
+            attributes.update(room_data["schedule_lookahead"])
+
         return attributes
 
     @callback
@@ -165,7 +178,7 @@ class SmartRoomCurrentPrioritySensor(SmartRoomEntity, SensorEntity):
         room_data = self.coordinator.data[self._room_id]
         climate_state = room_data.get("climate_state", {})
 
-        return {
+        attributes = {
             "description": self._get_priority_description(
                 climate_state.get(ATTR_CURRENT_PRIORITY, PRIORITY_NORMAL)
             ),
@@ -175,6 +188,11 @@ class SmartRoomCurrentPrioritySensor(SmartRoomEntity, SensorEntity):
             "pause_active": room_data.get("pause_active", False),
             "schedule_active": room_data.get("schedule_active", False),
         }
+        # Deciding rules and per-rule hit counters
+        attributes.update(room_data.get("rules", {}))
+        # Forced mode and its expiry (group services)
+        attributes.update(room_data.get("mode_override", {}))
+        return attributes
 
     def _get_priority_description(self, priority: str) -> str:
         """Get human-readable description of priority."""
@@ -183,7 +201,9 @@ class SmartRoomCurrentPrioritySensor(SmartRoomEntity, SensorEntity):
             "bypass": "Bypass activé (contrôle externe complet)",
             "windows_open": "Fenêtres ouvertes",
             "external_control": "Contrôle externe (Solar Optimizer, etc.)",
+            "override": "Mode forcé",
             "away": "Mode absent (alarme)",
+            "vacant": "Pièce vide (capteurs de présence)",
             "schedule": "Calendrier/planning actif",
             "normal": "Logique normale",
         }
@@ -240,6 +260,8 @@ class SmartRoomHysteresisSensor(SmartRoomEntity, SensorEntity):
             attrs["hysteresis_value"] = climate_state.get("hysteresis_value")
             attrs["lower_threshold"] = climate_state.get("hysteresis_lower_threshold")
             attrs["upper_threshold"] = climate_state.get("hysteresis_upper_threshold")
+            if climate_state.get("hysteresis_trend") is not None:
+                attrs["trend"] = climate_state.get("hysteresis_trend")
 
         return attrs
 
@@ -307,6 +329,21 @@ class SmartRoomActivitySensor(SmartRoomEntity, SensorEntity):
             return {"log": "Pas de données"}
 
         room_data = self.coordinator.data[self._room_id]
+
+        # The log is built synchronously on every state write
+        with self.coordinator.watchdog.measure(
+            room_data.get("room_name", self._room_id), "activity_log"
+        ):
+            attributes = self._build_activity_attributes(room_data)
+
+        # Event-loop watchdog statistics (only when enabled)
+        if room_data.get("loop_watchdog"):
+            attributes["loop_watchdog"] = room_data["loop_watchdog"]
+
+        return attributes
+
+    def _build_activity_attributes(self, room_data: dict[str, Any]) -> dict[str, Any]:
+        """Build the human-readable activity log attributes."""
         climate_state = room_data.get("climate_state", {})
 
         # Build human-readable log
@@ -393,3 +430,32 @@ class SmartRoomActivitySensor(SmartRoomEntity, SensorEntity):
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         self.async_write_ha_state()
+
+
+class SmartRoomHeatDemandSensor(SmartRoomHouseEntity, SensorEntity):
+    """Sensor showing the house heat demand (% of heated rooms asking heat)."""
+
+    def __init__(self, coordinator: SmartRoomCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_name = "Heat Demand"
+        self._attr_unique_id = f"smart_room_{coordinator.entry.entry_id}_heat_demand"
+        self._attr_icon = "mdi:fire"
+        self._attr_native_unit_of_measurement = PERCENTAGE
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the house heat demand."""
+        return self.coordinator.heat_demand.get_state()["heat_demand"]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the demanding rooms, zones and heat source state."""
+        attributes = self.coordinator.heat_demand.get_state()
+        attributes.pop("heat_demand")
+        # Load shedding of the Wire Pilot heaters (if a power budget is set)
+        attributes.update(self.coordinator.load_shedder.get_state())
+        # Rooms boosted with the solar surplus (if an export sensor is set)
+        attributes.update(self.coordinator.solar_surplus.get_state())
+        return attributes
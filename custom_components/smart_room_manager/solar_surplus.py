@@ -0,0 +1,281 @@
+"""Solar surplus boost for Smart Room Manager (native external control)."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, UnitOfPower
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import (
+    CLIMATE_TYPE_FIL_PILOTE,
+    CONF_ALLOW_EXTERNAL_IN_AWAY,
+    CONF_CLIMATE_ENTITY,
+    CONF_HEATER_POWER,
+    CONF_SOLAR_BOOST,
+    CONF_SOLAR_EXPORT_SENSOR,
+    DEFAULT_ALLOW_EXTERNAL_IN_AWAY,
+    DEFAULT_HEATER_POWER,
+    SOLAR_MIN_OFF,
+    SOLAR_MIN_ON,
+    SOLAR_SETTLE_TIME,
+    SOLAR_START_MARGIN,
+    SOLAR_STOP_IMPORT,
+)
+from .rules import RuleInputs
+
+if TYPE_CHECKING:
+    from .coordinator import SmartRoomCoordinator
+    from .room_manager import RoomManager
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SolarSurplusAllocator:
+    """Boost rooms with the power exported to the grid.
+
+    Replaces the external switch of a solar router (Solar Optimizer...):
+    rooms opted in with solar_boost and a rated heater power are put under
+    external control while the surplus covers their heater. Every reading
+    of the export sensor (W, negative while importing) updates the
+    allocation in place:
+
+    - exporting at least the heater power plus SOLAR_START_MARGIN starts
+      the largest heaters that fit, then those stopped the longest;
+    - importing more than SOLAR_STOP_IMPORT stops the latest boosts until
+      the import is covered.
+
+    A boosted room stays boosted for SOLAR_MIN_ON and a stopped room waits
+    SOLAR_MIN_OFF, so a passing cloud does not cycle the heaters. A heater
+    switched less than SOLAR_SETTLE_TIME before a reading is not on it yet:
+    its power is counted in advance so the surplus is not spent twice.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: SmartRoomCoordinator) -> None:
+        """Initialize the allocator."""
+        self.hass = hass
+        self.coordinator = coordinator
+
+        self._boosted: dict[str, datetime] = {}  # room_id -> boost start
+        self._stopped: dict[str, datetime] = {}  # room_id -> boost end
+        self._settling: list[tuple[datetime, float]] = []  # (switched, W change)
+        self._export: float | None = None  # last reading (W)
+        self._timer: CALLBACK_TYPE | None = None
+        self._timer_due: datetime | None = None
+        self._unsub_sensor: CALLBACK_TYPE | None = None
+
+    @property
+    def sensor(self) -> str | None:
+        """Return the grid export power sensor (global setting)."""
+        return self.coordinator.entry.data.get(CONF_SOLAR_EXPORT_SENSOR)
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if an export sensor is configured."""
+        return bool(self.sensor)
+
+    @callback
+    def async_setup(self) -> None:
+        """Follow the export sensor (re-allocates on every reading)."""
+        if not self.enabled:
+            return
+        self._unsub_sensor = async_track_state_change_event(
+            self.hass, self.sensor, self._async_sensor_changed
+        )
+        self._read_sensor()
+
+    @callback
+    def _async_sensor_changed(self, _event: Event) -> None:
+        """Re-allocate with the new export reading."""
+        if self._read_sensor():
+            now = self.coordinator.clock.now()
+            # Heaters switched long enough before this reading are on it
+            settle = timedelta(seconds=SOLAR_SETTLE_TIME)
+            self._settling = [item for item in self._settling if now - item[0] < settle]
+            self._allocate(now)
+
+    def _read_sensor(self) -> bool:
+        """Update the export power from the sensor, return True if valid."""
+        reading = self.coordinator.state_cache.get_float(self.sensor, "export power")
+        if reading is None:
+            return False
+        state = self.hass.states.get(self.sensor)
+        if state and state.attributes.get(ATTR_UNIT_OF_MEASUREMENT) == (
+            UnitOfPower.KILO_WATT
+        ):
+            reading *= 1000
+        self._export = reading
+        return True
+
+    @staticmethod
+    def _power(room_manager: RoomManager) -> float:
+        """Return the rated power of the heater of a room (W, 0 = unmanaged)."""
+        return float(
+            room_manager.room_config.get(CONF_HEATER_POWER, DEFAULT_HEATER_POWER) or 0
+        )
+
+    def _eligible(self, room_manager: RoomManager, now: datetime) -> bool:
+        """Check if external control would actually heat (or cool) the room."""
+        room_config = room_manager.room_config
+        if not room_config.get(CONF_SOLAR_BOOST) or self._power(room_manager) <= 0:
+            return False
+        climate_entity = room_config.get(CONF_CLIMATE_ENTITY)
+        if not climate_entity:
+            return False
+
+        # Rules above external control, and the presence setting of the room
+        inputs = RuleInputs(room_manager, now)
+        if (
+            inputs.paused
+            or inputs.bypass
+            or inputs.windows_open
+            or inputs.override is not None
+        ):
+            return False
+        allow_in_away = room_config.get(
+            CONF_ALLOW_EXTERNAL_IN_AWAY, DEFAULT_ALLOW_EXTERNAL_IN_AWAY
+        )
+        if allow_in_away and not inputs.away:
+            return False
+
+        # Summer: only reversible thermostats use the surplus (cooling)
+        climate_controller = room_manager.climate_controller
+        if climate_controller.is_summer_mode():
+            if climate_controller.climate_type == CLIMATE_TYPE_FIL_PILOTE:
+                return False
+            capabilities = self.coordinator.state_cache.get_capabilities(climate_entity)
+            return capabilities is not None and capabilities.reversible
+        return True
+
+    def _allocate(self, now: datetime) -> None:
+        """Start or stop boosts to follow the surplus."""
+        surplus = (self._export or 0.0) - sum(delta for _t, delta in self._settling)
+        changed: list[str] = []
+        due: list[datetime] = []
+
+        # Rooms that cannot use the boost anymore (window opened, mode
+        # forced...) give it back at once: their heater leaves the surplus
+        for room_id in list(self._boosted):
+            room_manager = self.coordinator.get_room_manager(room_id)
+            if room_manager is None or not self._eligible(room_manager, now):
+                self._stop(room_id, now)
+                if room_manager is not None:
+                    power = self._power(room_manager)
+                    self._settling.append((now, -power))
+                    surplus += power
+                changed.append(room_id)
+
+        if surplus < -SOLAR_STOP_IMPORT:
+            # Importing: stop the latest boosts first (past their minimum run)
+            for room_id, start in sorted(
+                self._boosted.items(), key=lambda item: item[1], reverse=True
+            ):
+                if surplus >= 0:
+                    break
+                if now - start < timedelta(seconds=SOLAR_MIN_ON):
+                    due.append(start + timedelta(seconds=SOLAR_MIN_ON))
+                    continue
+                room_manager = self.coordinator.get_room_manager(room_id)
+                power = self._power(room_manager)
+                self._stop(room_id, now)
+                self._settling.append((now, -power))
+                surplus += power
+                changed.append(room_id)
+        elif surplus >= SOLAR_START_MARGIN:
+            # Exporting: start the largest heaters that fit, then those
+            # stopped the longest
+            candidates: list[tuple[float, datetime | None, RoomManager]] = []
+            for room_manager in self.coordinator.get_all_room_managers():
+                room_id = room_manager.room_id
+                if room_id in self._boosted:
+                    continue
+                if not self._eligible(room_manager, now):
+                    continue
+                stopped = self._stopped.get(room_id)
+                if stopped and now - stopped < timedelta(seconds=SOLAR_MIN_OFF):
+                    due.append(stopped + timedelta(seconds=SOLAR_MIN_OFF))
+                    continue
+                candidates.append((self._power(room_manager), stopped, room_manager))
+            candidates.sort(
+                key=lambda item: (-item[0], item[1].timestamp() if item[1] else 0)
+            )
+            for power, _stopped, room_manager in candidates:
+                if power + SOLAR_START_MARGIN > surplus:
+                    continue
+                self._boosted[room_manager.room_id] = now
+                self._stopped.pop(room_manager.room_id, None)
+                self._settling.append((now, power))
+                surplus -= power
+                changed.append(room_manager.room_id)
+                _LOGGER.info(
+                    "🌞 Solar surplus - boosting %s (%d W)",
+                    room_manager.room_name,
+                    power,
+                )
+
+        self._arm(min(due) if due else None)
+
+        # Rooms entering or leaving external control must apply it now
+        for room_id in changed:
+            self.hass.async_create_task(self.coordinator.async_refresh_room(room_id))
+
+    def _stop(self, room_id: str, now: datetime) -> None:
+        """End the boost of a room."""
+        del self._boosted[room_id]
+        self._stopped[room_id] = now
+        _LOGGER.info("🌞 Solar surplus - boost of %s stopped", room_id)
+
+    def _arm(self, due: datetime | None) -> None:
+        """Arm the next allocation when a minimum run or off time ends."""
+        if due == self._timer_due and (due is None or self._timer):
+            return
+        if self._timer:
+            self._timer()
+            self._timer = None
+        self._timer_due = due
+        if due is not None:
+            self._timer = self.coordinator.clock.async_call_at(
+                self.hass, due, self._async_timer
+            )
+
+    async def _async_timer(self, _now: Any) -> None:
+        """Re-allocate once a room blocked by its minimum time is due."""
+        self._timer = None
+        self._timer_due = None
+        self._allocate(self.coordinator.clock.now())
+
+    @callback
+    def async_reallocate(self) -> None:
+        """Re-allocate now (rooms forced or released by a mode override)."""
+        if self.enabled:
+            self._allocate(self.coordinator.clock.now())
+
+    def is_boosted(self, room_id: str) -> bool:
+        """Return True if a room is under external control on the surplus."""
+        return room_id in self._boosted
+
+    def get_state(self) -> dict[str, Any]:
+        """Get the allocation for the heat demand sensor attributes."""
+        if not self.enabled:
+            return {}
+        return {
+            "solar_export": self._export,
+            "solar_boosted_rooms": [
+                room_manager.room_name
+                for room_id in self._boosted
+                if (room_manager := self.coordinator.get_room_manager(room_id))
+            ],
+        }
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Unsubscribe and cancel the pending allocation."""
+        if self._unsub_sensor:
+            self._unsub_sensor()
+            self._unsub_sensor = None
+        if self._timer:
+            self._timer()
+            self._timer = None
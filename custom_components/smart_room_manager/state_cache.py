@@ -0,0 +1,123 @@
+"""Shared entity state cache for Smart Room Manager."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.const import STATE_ON
+from homeassistant.core import HomeAssistant, State
+
+from .climate.capabilities import ClimateCapabilities, capability_key
+
+_LOGGER = logging.getLogger(__name__)
+
+_UNSET: Any = object()
+
+
+class _CachedState:
+    """Values parsed from one State object."""
+
+    __slots__ = ("state", "number", "capabilities")
+
+    def __init__(self, state: State) -> None:
+        """Initialize the entry."""
+        self.state = state
+        self.number: float | None = _UNSET
+        self.capabilities: ClimateCapabilities | None = None
+
+
+class EntityStateCache:
+    """Parse each referenced entity once per state change, for all rooms.
+
+    Large configurations read the same entities from many rooms (alarm
+    panel, season calendar, setpoint inputs, shared door sensors). Parsed
+    values are stored against the State object itself: Home Assistant
+    creates a new State on every change, so a value is parsed once per
+    change event and can never be stale. Parsing failures are cached too,
+    which logs an invalid sensor once instead of on every refresh.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self._entries: dict[str, _CachedState] = {}
+        # Climate profiles survive state changes until the capabilities change
+        self._profiles: dict[str, tuple[tuple[Any, ...], ClimateCapabilities]] = {}
+
+    def _entry(self, entity_id: str | None) -> _CachedState | None:
+        """Return the cache entry of the current state (None if missing)."""
+        if not entity_id:
+            return None
+        state = self.hass.states.get(entity_id)
+        if state is None:
+            self._entries.pop(entity_id, None)
+            self._profiles.pop(entity_id, None)
+            return None
+        entry = self._entries.get(entity_id)
+        if entry is None or entry.state is not state:
+            entry = self._entries[entity_id] = _CachedState(state)
+        return entry
+
+    def get_state(self, entity_id: str | None) -> str | None:
+        """Return the raw state string (None if the entity does not exist)."""
+        entry = self._entry(entity_id)
+        return entry.state.state if entry else None
+
+    def is_on(self, entity_id: str | None) -> bool:
+        """Return True if the entity exists and is on."""
+        entry = self._entry(entity_id)
+        return entry is not None and entry.state.state == STATE_ON
+
+    def any_on(self, entity_ids: list[str]) -> bool:
+        """Return True if any of the entities is on."""
+        return any(self.is_on(entity_id) for entity_id in entity_ids)
+
+    def get_float(self, entity_id: str | None, label: str = "sensor") -> float | None:
+        """Return the numeric state (None if missing or invalid).
+
+        Args:
+            entity_id: Entity to read
+            label: Value name used in the warning logged for invalid states
+        """
+        entry = self._entry(entity_id)
+        if entry is None:
+            return None
+        if entry.number is _UNSET:
+            try:
+                entry.number = float(entry.state.state)
+            except (ValueError, TypeError):
+                entry.number = None
+                _LOGGER.warning(
+                    "Invalid %s value from %s: %s",
+                    label,
+                    entity_id,
+                    entry.state.state,
+                )
+        return entry.number
+
+    def get_capabilities(self, entity_id: str | None) -> ClimateCapabilities | None:
+        """Return the capability profile of a climate (None if missing).
+
+        The profile is rebuilt only when one of its attributes changes, not
+        on every hvac_action/current_temperature update of the entity.
+        """
+        entry = self._entry(entity_id)
+        if entry is None:
+            return None
+        if entry.capabilities is None:
+            key = capability_key(entry.state)
+            cached = self._profiles.get(entity_id)
+            if cached is None or cached[0] != key:
+                cached = self._profiles[entity_id] = (
+                    key,
+                    ClimateCapabilities(entry.state),
+                )
+                if cached[1].preset_modes:
+                    _LOGGER.info(
+                        "Climate %s supports presets: %s",
+                        entity_id,
+                        cached[1].preset_modes,
+                    )
+            entry.capabilities = cached[1]
+        return entry.capabilities
@@ -10,8 +10,6 @@ from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_call_later
-from homeassistant.util import dt as dt_util
 
 from .const import (
     CONF_PAUSE_DURATION_MINUTES,
@@ -128,20 +126,52 @@ class SmartRoomPauseSwitch(SmartRoomEntity, SwitchEntity):
 
         if self._pause_until:
             attrs["pause_until"] = self._pause_until.isoformat()
-            remaining = (self._pause_until - dt_util.now()).total_seconds() / 60
+            remaining = (
+                self._pause_until - self.coordinator.clock.now()
+            ).total_seconds() / 60
             attrs["remaining_minutes"] = max(0, int(remaining))
 
         return attrs
 
+    async def async_added_to_hass(self) -> None:
+        """Register the switch for the group services."""
+        await super().async_added_to_hass()
+        self.coordinator.pause_switches[self._room_id] = self
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Unregister the switch and cancel the pause timer."""
+        self.coordinator.pause_switches.pop(self._room_id, None)
+        if self._pause_timer:
+            self._pause_timer()
+            self._pause_timer = None
+        await super().async_will_remove_from_hass()
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on pause - temporarily disable automation."""
+        if not self.start_pause():
+            return
+
+        # Request coordinator refresh to update climate control
+        await self.coordinator.async_request_refresh()
+
+    @callback
+    def start_pause(self, duration: int | None = None) -> bool:
+        """Start the pause without refreshing (False if the room is gone).
+
+        Args:
+            duration: Minutes (0 = no limit, None = room setting)
+        """
         room_manager = self.coordinator.get_room_manager(self._room_id)
         if not room_manager:
-            return
+            return False
 
         room_config = room_manager.room_config
-        duration = room_config.get(CONF_PAUSE_DURATION_MINUTES, DEFAULT_PAUSE_DURATION)
-        infinite = room_config.get(CONF_PAUSE_INFINITE, DEFAULT_PAUSE_INFINITE)
+        infinite = False
+        if duration is None:
+            duration = room_config.get(
+                CONF_PAUSE_DURATION_MINUTES, DEFAULT_PAUSE_DURATION
+            )
+            infinite = room_config.get(CONF_PAUSE_INFINITE, DEFAULT_PAUSE_INFINITE)
 
         # Cancel any existing timer
         if self._pause_timer:
@@ -158,8 +188,10 @@ class SmartRoomPauseSwitch(SmartRoomEntity, SwitchEntity):
             )
         else:
             # Timed pause - set auto-off
-            self._pause_until = dt_util.now() + timedelta(minutes=duration)
-            self._pause_timer = async_call_later(
+            self._pause_until = self.coordinator.clock.now() + timedelta(
+                minutes=duration
+            )
+            self._pause_timer = self.coordinator.clock.async_call_later(
                 self.hass,
                 duration * 60,
                 self._auto_turn_off,
@@ -173,15 +205,22 @@ class SmartRoomPauseSwitch(SmartRoomEntity, SwitchEntity):
 
         self._attr_is_on = True
         self.async_write_ha_state()
-
-        # Request coordinator refresh to update climate control
-        await self.coordinator.async_request_refresh()
+        return True
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off pause - resume automation."""
+        if not self.end_pause():
+            return
+
+        # Request coordinator refresh to resume climate control
+        await self.coordinator.async_request_refresh()
+
+    @callback
+    def end_pause(self) -> bool:
+        """End the pause without refreshing (False if the room is gone)."""
         room_manager = self.coordinator.get_room_manager(self._room_id)
         if not room_manager:
-            return
+            return False
 
         # Cancel timer if exists
         if self._pause_timer:
@@ -197,9 +236,7 @@ class SmartRoomPauseSwitch(SmartRoomEntity, SwitchEntity):
         )
 
         self.async_write_ha_state()
-
-        # Request coordinator refresh to resume climate control
-        await self.coordinator.async_request_refresh()
+        return True
 
     async def _auto_turn_off(self, _):
         """Auto-deactivate pause after duration expires."""
@@ -0,0 +1,124 @@
+"""Temperature sensor smoothing for Smart Room Manager."""
+
+from __future__ import annotations
+
+import logging
+import math
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import (
+    CONF_TEMPERATURE_SENSOR,
+    CONF_TEMPERATURE_SMOOTHING,
+    DEFAULT_TEMPERATURE_SMOOTHING,
+)
+
+if TYPE_CHECKING:
+    from .room_manager import RoomManager
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TemperatureFilter:
+    """Smooth the room temperature sensor and estimate its rate of change.
+
+    Exponential moving average in continuous time: each reading is held
+    until the next one, and the filtered value moves towards it with the
+    configured time constant. Irregular sensor reporting is handled exactly
+    and every sample costs O(1). The rate of change is the slope of the
+    filtered value, (last reading - filtered) / time constant, which is a
+    noise-free estimate of how fast the room is warming or cooling.
+
+    Samples come from the sensor state-change events; invalid readings are
+    skipped (the controller falls back to preset control for those).
+    """
+
+    def __init__(self, hass: HomeAssistant, room_manager: RoomManager) -> None:
+        """Initialize the filter."""
+        self.hass = hass
+        self.room_manager = room_manager
+
+        self._reading: float | None = None  # Last valid sensor reading
+        self._filtered: float | None = None  # Filtered value at _sampled_at
+        self._sampled_at: datetime | None = None
+        self._unsub_sensor: CALLBACK_TYPE | None = None
+
+    @property
+    def time_constant(self) -> float:
+        """Return the smoothing time constant (seconds, 0 = raw readings)."""
+        minutes = self.room_manager.room_config.get(
+            CONF_TEMPERATURE_SMOOTHING, DEFAULT_TEMPERATURE_SMOOTHING
+        )
+        return float(minutes or 0) * 60
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if a sensor is configured and smoothing is on."""
+        return (
+            self.room_manager.room_config.get(CONF_TEMPERATURE_SENSOR) is not None
+            and self.time_constant > 0
+        )
+
+    @callback
+    def async_setup(self) -> None:
+        """Listen to the temperature sensor and seed the filter."""
+        if not self.enabled:
+            return
+
+        sensor = self.room_manager.room_config[CONF_TEMPERATURE_SENSOR]
+        self._unsub_sensor = async_track_state_change_event(
+            self.hass, sensor, self._async_sensor_changed
+        )
+        state = self.hass.states.get(sensor)
+        if state:
+            self._add_state(state)
+
+    @callback
+    def _async_sensor_changed(self, event: Event) -> None:
+        """Feed a new sensor reading."""
+        new_state = event.data.get("new_state")
+        if new_state:
+            self._add_state(new_state)
+
+    def _add_state(self, state: State) -> None:
+        """Feed a sensor state (ignored if not numeric)."""
+        try:
+            value = float(state.state)
+        except (ValueError, TypeError):
+            return
+        if math.isnan(value):
+            return
+        self.add_sample(value, state.last_updated)
+
+    def add_sample(self, value: float, when: datetime) -> None:
+        """Add a reading taken at a given time."""
+        if self._sampled_at is None:
+            self._filtered = value
+        else:
+            self._filtered = self.value(when)
+        self._reading = value
+        self._sampled_at = when
+
+    def value(self, now: datetime) -> float | None:
+        """Return the filtered temperature at a given time (None if no reading)."""
+        if self._sampled_at is None:
+            return None
+        elapsed = max(0.0, (now - self._sampled_at).total_seconds())
+        decay = math.exp(-elapsed / self.time_constant)
+        return self._reading + (self._filtered - self._reading) * decay
+
+    def trend(self, now: datetime) -> float | None:
+        """Return the rate of change of the filtered temperature (°C/h)."""
+        filtered = self.value(now)
+        if filtered is None:
+            return None
+        return (self._reading - filtered) / self.time_constant * 3600
+
+    def async_shutdown(self) -> None:
+        """Unsubscribe from the sensor."""
+        if self._unsub_sensor:
+            self._unsub_sensor()
+            self._unsub_sensor = None
@@ -0,0 +1,209 @@
+"""House-wide VMC (ventilation) control for Smart Room Manager."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import SERVICE_TURN_OFF, SERVICE_TURN_ON
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import (
+    CONF_LIGHTS,
+    CONF_VMC_ENTITY,
+    CONF_VMC_TIMER,
+    DEFAULT_VMC_TIMER,
+    ROOM_TYPE_BATHROOM,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import SmartRoomCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class VmcArbiter:
+    """Drive the shared VMC high speed from all bathrooms.
+
+    Each bathroom with a light on holds a request; the fan runs at high speed
+    while at least one request is held. When the last request is released a
+    single timer stops the fan after the configured delay, and any new
+    request cancels it. Bathroom light state changes are handled as events,
+    so the fan starts as soon as someone switches the light on.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: SmartRoomCoordinator) -> None:
+        """Initialize the arbiter."""
+        self.hass = hass
+        self.coordinator = coordinator
+
+        self._requests: set[str] = set()  # room_ids requesting high speed
+        self._active: bool = False
+        self._stop_timer: CALLBACK_TYPE | None = None
+        self._stop_at: datetime | None = None
+        self._light_rooms: dict[str, list[str]] = {}  # light -> bathroom room_ids
+        self._unsub_lights: CALLBACK_TYPE | None = None
+
+    @property
+    def vmc_entity(self) -> str | None:
+        """Return the VMC entity (global setting)."""
+        return self.coordinator.entry.data.get(CONF_VMC_ENTITY)
+
+    @property
+    def vmc_timer(self) -> float:
+        """Return the delay before stopping high speed (seconds)."""
+        return self.coordinator.entry.data.get(CONF_VMC_TIMER, DEFAULT_VMC_TIMER)
+
+    @property
+    def active(self) -> bool:
+        """Return True if high speed is running."""
+        return self._active
+
+    async def async_setup(self) -> None:
+        """Subscribe to bathroom lights and apply their current state."""
+        if not self.vmc_entity:
+            return
+
+        self._light_rooms = {}
+        for room_manager in self.coordinator.get_all_room_managers():
+            if room_manager.room_type != ROOM_TYPE_BATHROOM:
+                continue
+            for light in room_manager.room_config.get(CONF_LIGHTS) or []:
+                self._light_rooms.setdefault(light, []).append(room_manager.room_id)
+
+        if not self._light_rooms:
+            return
+
+        self._unsub_lights = async_track_state_change_event(
+            self.hass, list(self._light_rooms), self._async_light_changed
+        )
+
+        for room_id in {r for rooms in self._light_rooms.values() for r in rooms}:
+            await self.async_update_request(room_id, self._any_light_on(room_id))
+
+    async def _async_light_changed(self, event: Event) -> None:
+        """Handle a bathroom light state change."""
+        for room_id in self._light_rooms.get(event.data["entity_id"], []):
+            room_manager = self.coordinator.get_room_manager(room_id)
+            if room_manager is None or room_manager.is_paused():
+                # Paused rooms are reconciled by their light controller on resume
+                continue
+            await self.async_update_request(room_id, self._any_light_on(room_id))
+
+    def _any_light_on(self, room_id: str) -> bool:
+        """Check if any light of a bathroom is on."""
+        room_manager = self.coordinator.get_room_manager(room_id)
+        if room_manager is None:
+            return False
+        return self.coordinator.state_cache.any_on(
+            room_manager.room_config.get(CONF_LIGHTS) or []
+        )
+
+    async def async_update_request(self, room_id: str, requested: bool) -> None:
+        """Set whether a bathroom requests high speed (idempotent)."""
+        if not self.vmc_entity:
+            return
+
+        room_manager = self.coordinator.get_room_manager(room_id)
+        room_name = room_manager.room_name if room_manager else room_id
+
+        if requested:
+            if room_id in self._requests:
+                return
+            self._requests.add(room_id)
+            self._cancel_stop_timer()
+            if not self._active:
+                _LOGGER.info(
+                    "💨 Bathroom light ON in %s - starting VMC high speed", room_name
+                )
+                self._active = True
+                await self._control_vmc(turn_on=True)
+            return
+
+        if room_id not in self._requests:
+            return
+        self._requests.discard(room_id)
+        if self._requests or not self._active:
+            _LOGGER.debug(
+                "💨 Bathroom light OFF in %s - VMC kept on for %d other bathroom(s)",
+                room_name,
+                len(self._requests),
+            )
+            return
+
+        _LOGGER.info(
+            "💨 Bathroom light OFF in %s - VMC will stop in %ds",
+            room_name,
+            self.vmc_timer,
+        )
+        clock = self.coordinator.clock
+        self._stop_at = clock.utcnow()
+        self._stop_timer = clock.async_call_later(
+            self.hass, self.vmc_timer, self._async_stop_timer_expired
+        )
+
+    async def _async_stop_timer_expired(self, _now: Any) -> None:
+        """Stop high speed once the delay after the last light off elapsed."""
+        self._stop_timer = None
+        self._stop_at = None
+        if self._requests or not self._active:
+            return
+
+        _LOGGER.info("💨 VMC timer expired - stopping high speed")
+        self._active = False
+        await self._control_vmc(turn_on=False)
+
+    def _cancel_stop_timer(self) -> None:
+        """Cancel a pending stop."""
+        if self._stop_timer:
+            _LOGGER.debug("Bathroom light back ON - canceling VMC shutdown timer")
+            self._stop_timer()
+            self._stop_timer = None
+            self._stop_at = None
+
+    async def _control_vmc(self, turn_on: bool) -> None:
+        """Turn the VMC high speed on or off."""
+        vmc_entity = self.vmc_entity
+        domain = vmc_entity.split(".")[0] if "." in vmc_entity else "switch"
+        try:
+            await self.hass.services.async_call(
+                domain,
+                SERVICE_TURN_ON if turn_on else SERVICE_TURN_OFF,
+                {"entity_id": vmc_entity},
+                blocking=True,
+            )
+        except Exception as err:
+            action = "on" if turn_on else "off"
+            _LOGGER.error("Error turning %s %s: %s", action, vmc_entity, err)
+
+    def get_room_state(self, room_id: str) -> dict[str, Any]:
+        """Get the VMC state seen from a bathroom.
+
+        time_remaining is -1 while this bathroom's light is on, the seconds
+        left before the shared fan stops when the timer runs, 0 otherwise.
+        """
+        if room_id in self._requests:
+            time_remaining = -1
+        elif self._stop_at is not None:
+            elapsed = (self.coordinator.clock.utcnow() - self._stop_at).total_seconds()
+            time_remaining = max(0, self.vmc_timer - elapsed)
+        else:
+            time_remaining = 0
+
+        return {
+            "vmc_active": self._active,
+            "vmc_time_remaining": int(time_remaining),
+            "vmc_requests": len(self._requests),
+        }
+
+    def async_shutdown(self) -> None:
+        """Unsubscribe and cancel the pending stop (VMC left as is)."""
+        if self._unsub_lights:
+            self._unsub_lights()
+            self._unsub_lights = None
+        if self._stop_timer:
+            self._stop_timer()
+            self._stop_timer = None
+            self._stop_at = None
@@ -0,0 +1,101 @@
+"""Event-loop blocking detector for Smart Room Manager."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .coordinator import SmartRoomCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of slow slices kept in memory (oldest dropped first)
+MAX_RECORDED_SLICES = 50
+
+
+class LoopWatchdog:
+    """Measure the synchronous slices of room evaluations.
+
+    Everything between two awaits runs on Home Assistant's shared event loop,
+    so each synchronous phase of a room evaluation (night period, mode
+    selection, state/activity log generation...) is timed and any slice
+    longer than the configured threshold is logged and recorded with the room
+    and phase name.
+    """
+
+    def __init__(self, coordinator: SmartRoomCoordinator, threshold_ms: float) -> None:
+        """Initialize the watchdog (threshold 0 = disabled)."""
+        self.coordinator = coordinator
+        self.threshold_ms = threshold_ms
+
+        self._slow_slices: deque[dict[str, Any]] = deque(maxlen=MAX_RECORDED_SLICES)
+        # Per room: worst slice seen and number of slices over threshold
+        self._room_stats: dict[str, dict[str, Any]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if the watchdog is enabled."""
+        return self.threshold_ms > 0
+
+    @contextmanager
+    def measure(self, room_name: str, phase: str) -> Iterator[None]:
+        """Time a synchronous phase (must not contain any await)."""
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(room_name, phase, (time.perf_counter() - start) * 1000)
+
+    def record(self, room_name: str, phase: str, duration_ms: float) -> None:
+        """Record a measured slice."""
+        stats = self._room_stats.setdefault(
+            room_name,
+            {"max_slice_ms": 0.0, "max_slice_phase": None, "slow_slices": 0},
+        )
+        if duration_ms > stats["max_slice_ms"]:
+            stats["max_slice_ms"] = round(duration_ms, 2)
+            stats["max_slice_phase"] = phase
+
+        if duration_ms <= self.threshold_ms:
+            return
+
+        stats["slow_slices"] += 1
+        self._slow_slices.append(
+            {
+                "room": room_name,
+                "phase": phase,
+                "duration_ms": round(duration_ms, 2),
+                "at": self.coordinator.clock.utcnow().isoformat(),
+            }
+        )
+        _LOGGER.warning(
+            "⏱️ %s blocked the event loop for %.1f ms in phase '%s' (threshold: %.1f ms)",
+            room_name,
+            duration_ms,
+            phase,
+            self.threshold_ms,
+        )
+
+    def get_room_stats(self, room_name: str) -> dict[str, Any]:
+        """Get watchdog statistics for a room (empty if disabled)."""
+        if not self.enabled:
+            return {}
+        return dict(
+            self._room_stats.get(
+                room_name,
+                {"max_slice_ms": 0.0, "max_slice_phase": None, "slow_slices": 0},
+            )
+        )
+
+    def get_slow_slices(self) -> list[dict[str, Any]]:
+        """Get the most recent slices over threshold (oldest first)."""
+        return list(self._slow_slices)
@@ -0,0 +1,165 @@
+"""Door/window state tracking for Smart Room Manager."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import STATE_ON
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import (
+    CONF_DOOR_WINDOW_SENSORS,
+    CONF_WINDOW_DELAY_CLOSE,
+    CONF_WINDOW_DELAY_OPEN,
+    DEFAULT_WINDOW_DELAY_CLOSE,
+    DEFAULT_WINDOW_DELAY_OPEN,
+)
+
+if TYPE_CHECKING:
+    from .room_manager import RoomManager
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WindowTracker:
+    """Track the open door/window sensors of a room with open/close delays.
+
+    Sensor state changes are handled as events: the set of open sensors is
+    updated immediately and the room opened/closed timestamps come from the
+    sensors' own last_changed. The delayed (debounced) state switches with
+    timers at the exact end of the open/close delay and the room is
+    re-evaluated at that moment, without waiting for the next refresh.
+    """
+
+    def __init__(self, hass: HomeAssistant, room_manager: RoomManager) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self.room_manager = room_manager
+
+        self._open_sensors: set[str] = set()
+        self._open_delayed: bool = False  # Debounced state used by the climate
+        self.opened_at: datetime | None = None  # First sensor opened
+        self.closed_at: datetime | None = None  # Last sensor closed
+        self._delay_timer: CALLBACK_TYPE | None = None
+        self._unsub_sensors: CALLBACK_TYPE | None = None
+
+    @property
+    def windows_open(self) -> bool:
+        """Return True if any door/window sensor is open."""
+        return bool(self._open_sensors)
+
+    @property
+    def open_delayed(self) -> bool:
+        """Return the debounced state (open for delay_open, closed for delay_close)."""
+        return self._open_delayed
+
+    @property
+    def _sensors(self) -> list[str]:
+        """Return the door/window sensors of the room."""
+        # Use 'or []' to handle None values (dict.get returns None if value is None)
+        return self.room_manager.room_config.get(CONF_DOOR_WINDOW_SENSORS) or []
+
+    @callback
+    def async_setup(self) -> None:
+        """Listen to the door/window sensors and apply their current state."""
+        sensors = self._sensors
+        if not sensors:
+            return
+
+        self._unsub_sensors = async_track_state_change_event(
+            self.hass, sensors, self._async_sensor_changed
+        )
+
+        for entity_id in sensors:
+            state = self.hass.states.get(entity_id)
+            if state and state.state == STATE_ON:
+                self._sensor_opened(entity_id, state.last_changed)
+
+    @callback
+    def _async_sensor_changed(self, event: Event) -> None:
+        """Handle a door/window sensor state change."""
+        entity_id = event.data["entity_id"]
+        new_state = event.data.get("new_state")
+        if new_state and new_state.state == STATE_ON:
+            self._sensor_opened(entity_id, new_state.last_changed)
+        elif entity_id in self._open_sensors:
+            changed_at = (
+                new_state.last_changed
+                if new_state
+                else self.room_manager.coordinator.clock.utcnow()
+            )
+            self._sensor_closed(entity_id, changed_at)
+
+    def _sensor_opened(self, entity_id: str, changed_at: datetime) -> None:
+        """Count an open sensor; the first one starts the open delay."""
+        if entity_id in self._open_sensors:
+            return
+        self._open_sensors.add(entity_id)
+        if len(self._open_sensors) > 1:
+            return
+
+        self.opened_at = changed_at
+        self.closed_at = None
+        if self._open_delayed:
+            # Reopened during the close delay: stays open
+            self._cancel_delay_timer()
+            return
+
+        delay_open = self.room_manager.room_config.get(
+            CONF_WINDOW_DELAY_OPEN, DEFAULT_WINDOW_DELAY_OPEN
+        )
+        self._start_delay_timer(changed_at + timedelta(minutes=delay_open))
+
+    def _sensor_closed(self, entity_id: str, changed_at: datetime) -> None:
+        """Uncount a sensor; the last one closed starts the close delay."""
+        self._open_sensors.discard(entity_id)
+        if self._open_sensors:
+            return
+
+        self.closed_at = changed_at
+        self.opened_at = None
+        if not self._open_delayed:
+            # Closed before the open delay elapsed: never considered open
+            self._cancel_delay_timer()
+            return
+
+        delay_close = self.room_manager.room_config.get(
+            CONF_WINDOW_DELAY_CLOSE, DEFAULT_WINDOW_DELAY_CLOSE
+        )
+        self._start_delay_timer(changed_at + timedelta(minutes=delay_close))
+
+    def _start_delay_timer(self, when: datetime) -> None:
+        """Schedule the delayed open/close transition."""
+        self._cancel_delay_timer()
+        self._delay_timer = self.room_manager.coordinator.clock.async_call_at(
+            self.hass, when, self._async_delay_elapsed
+        )
+
+    def _cancel_delay_timer(self) -> None:
+        """Cancel a pending delayed transition."""
+        if self._delay_timer:
+            self._delay_timer()
+            self._delay_timer = None
+
+    async def _async_delay_elapsed(self, _now: Any) -> None:
+        """Switch the debounced state and re-evaluate the room."""
+        self._delay_timer = None
+        self._open_delayed = self.windows_open
+        _LOGGER.info(
+            "🪟 Windows %s in %s (delay elapsed)",
+            "open" if self._open_delayed else "closed",
+            self.room_manager.room_name,
+        )
+        await self.room_manager.coordinator.async_refresh_room(
+            self.room_manager.room_id
+        )
+
+    def async_shutdown(self) -> None:
+        """Unsubscribe and cancel the pending transition."""
+        if self._unsub_sensors:
+            self._unsub_sensors()
+            self._unsub_sensors = None
+        self._cancel_delay_timer()
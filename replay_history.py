@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""Replay a recorded state history through Smart Room Manager offline.
+
+Feeds a recorded sequence of state changes (JSONL file or Home Assistant
+recorder database) through the real room managers and controllers, driven by
+a virtual clock, and writes the emitted service calls and room state changes
+as JSONL. A week of history replays in seconds, which makes it possible to
+regression-test logic changes against real data and to measure the
+throughput of the decision engine.
+
+The input is streamed: only the current state of the referenced entities is
+kept in memory, so multi-month histories are fine.
+
+JSONL input format (one state change per line, sorted by time):
+    {"entity_id": "light.sdb", "state": "on", "attributes": {...},
+     "last_changed": "2026-01-10T07:31:02+00:00"}
+
+Usage:
+    python3 replay_history.py --history home-assistant_v2.db
+    python3 replay_history.py --history states.jsonl --output calls.jsonl \\
+        --config-entries ~/config/.storage/core.config_entries \\
+        --start 2026-01-01 --end 2026-01-08
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sqlite3
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, TextIO
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent / "custom_components"))
+
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.core import Context, HomeAssistant, ServiceCall  # noqa: E402
+from homeassistant.util import dt as dt_util  # noqa: E402
+from smart_room_manager.clock import VirtualClock  # noqa: E402
+from smart_room_manager.const import (  # noqa: E402
+    CONF_ROOMS,
+    DOMAIN,
+    UPDATE_INTERVAL,
+)
+from smart_room_manager.coordinator import SmartRoomCoordinator  # noqa: E402
+
+_LOGGER = logging.getLogger("replay_history")
+
+DEFAULT_CONFIG_DIR = Path.home() / "config"
+
+# Services answered by the simulated devices
+SIMULATED_SERVICES: dict[str, list[str]] = {
+    "climate": ["set_preset_mode", "set_hvac_mode", "set_temperature"],
+    "light": ["turn_on", "turn_off"],
+    "switch": ["turn_on", "turn_off"],
+    "fan": ["turn_on", "turn_off"],
+    "input_boolean": ["turn_on", "turn_off"],
+    "persistent_notification": ["create"],
+}
+
+
+class HistoryEvent:
+    """A single recorded state change."""
+
+    __slots__ = ("entity_id", "state", "attributes", "when")
+
+    def __init__(
+        self, entity_id: str, state: str, attributes: dict[str, Any], when: datetime
+    ) -> None:
+        """Initialize the event."""
+        self.entity_id = entity_id
+        self.state = state
+        self.attributes = attributes
+        self.when = when
+
+
+def iter_jsonl_history(path: Path) -> Iterator[HistoryEvent]:
+    """Stream state changes from a JSONL file."""
+    with open(path, encoding="utf-8") as history:
+        for line_number, line in enumerate(history, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                when = dt_util.parse_datetime(
+                    record.get("last_updated")
+                    or record.get("last_changed")
+                    or record["time"]
+                )
+                yield HistoryEvent(
+                    record["entity_id"],
+                    str(record["state"]),
+                    record.get("attributes") or {},
+                    dt_util.as_utc(when),
+                )
+            except (KeyError, TypeError, ValueError) as err:
+                _LOGGER.warning("Skipping invalid line %d: %s", line_number, err)
+
+
+def iter_recorder_history(
+    path: Path,
+    entity_ids: set[str],
+    start: datetime | None,
+    end: datetime | None,
+) -> Iterator[HistoryEvent]:
+    """Stream state changes from a recorder database (read-only)."""
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        placeholders = ",".join("?" for _ in entity_ids)
+        query = (
+            "SELECT m.entity_id, s.state, a.shared_attrs, s.last_updated_ts "
+            "FROM states s "
+            "JOIN states_meta m ON s.metadata_id = m.metadata_id "
+            "LEFT JOIN state_attributes a ON s.attributes_id = a.attributes_id "
+            f"WHERE m.entity_id IN ({placeholders}) "
+            "AND s.last_updated_ts >= ? AND s.last_updated_ts < ? "
+            "ORDER BY s.last_updated_ts"
+        )
+        params = [
+            *sorted(entity_ids),
+            start.timestamp() if start else 0,
+            end.timestamp() if end else float("inf"),
+        ]
+        # The cursor is iterated lazily: rows are never all loaded at once
+        for entity_id, state, shared_attrs, updated_ts in connection.execute(
+            query, params
+        ):
+            if state is None:
+                continue
+            try:
+                attributes = json.loads(shared_attrs) if shared_attrs else {}
+            except ValueError:
+                attributes = {}
+            yield HistoryEvent(
+                entity_id, state, attributes, dt_util.utc_from_timestamp(updated_ts)
+            )
+    finally:
+        connection.close()
+
+
+def load_config_entry(path: Path) -> dict[str, Any]:
+    """Load the Smart Room Manager entry from core.config_entries (or a JSON export)."""
+    with open(path, encoding="utf-8") as config_file:
+        data = json.load(config_file)
+
+    # Plain export: {"data": {...}, "options": {...}}
+    if "options" in data and CONF_ROOMS in data["options"]:
+        return data
+
+    for entry in data.get("data", {}).get("entries", []):
+        if entry.get("domain") == DOMAIN:
+            return entry
+
+    raise SystemExit(f"❌ No {DOMAIN} entry found in {path}")
+
+
+def load_time_zone(config_entries_path: Path) -> str:
+    """Read the configured time zone from .storage/core.config if available."""
+    core_config = config_entries_path.parent / "core.config"
+    try:
+        with open(core_config, encoding="utf-8") as config_file:
+            return json.load(config_file)["data"]["time_zone"]
+    except (OSError, KeyError, ValueError):
+        return "UTC"
+
+
+def referenced_entities(entry: dict[str, Any]) -> set[str]:
+    """Collect every entity id referenced by the configuration."""
+    entity_ids: set[str] = set()
+
+    def collect(value: Any) -> None:
+        if isinstance(value, str) and "." in value and " " not in value:
+            domain = value.split(".", 1)[0]
+            if domain.isidentifier() and domain.islower():
+                entity_ids.add(value)
+        elif isinstance(value, list):
+            for item in value:
+                collect(item)
+
+    for value in entry.get("data", {}).values():
+        collect(value)
+    for room in entry.get("options", {}).get(CONF_ROOMS, []):
+        for value in room.values():
+            collect(value)
+        # Pause switch created by the integration itself
+        entity_ids.add(f"switch.smart_room_{room.get('room_id')}_pause")
+
+    return entity_ids
+
+
+class Replayer:
+    """Drive the coordinator with recorded states and a virtual clock."""
+
+    def __init__(
+        self,
+        entry: dict[str, Any],
+        output: TextIO,
+        tick: float,
+        apply_commands: bool,
+        all_ticks: bool,
+    ) -> None:
+        """Initialize the replayer."""
+        self.entry = entry
+        self.output = output
+        self.tick = timedelta(seconds=tick)
+        self.apply_commands = apply_commands
+        self.all_ticks = all_ticks
+
+        self.hass: HomeAssistant | None = None
+        self.coordinator: SmartRoomCoordinator | None = None
+        self.clock: VirtualClock | None = None
+
+        self._last_room_states: dict[str, dict[str, Any]] = {}
+        self.started_at: datetime | None = None
+        self.events = 0
+        self.ticks = 0
+        self.service_calls = 0
+
+    def _write(self, record: dict[str, Any]) -> None:
+        """Write an output record."""
+        self.output.write(json.dumps(record, default=str, ensure_ascii=False) + "\n")
+
+    async def _async_handle_service(self, call: ServiceCall) -> None:
+        """Record a service call and simulate the device reaction."""
+        self.service_calls += 1
+        self._write(
+            {
+                "type": "service_call",
+                "time": self.clock.utcnow().isoformat(),
+                "domain": call.domain,
+                "service": call.service,
+                "data": dict(call.data),
+            }
+        )
+        if not self.apply_commands:
+            return
+
+        entity_ids = call.data.get("entity_id") or []
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+
+        for entity_id in entity_ids:
+            state = self.hass.states.get(entity_id)
+            current = state.state if state else "unknown"
+            attributes = dict(state.attributes) if state else {}
+
+            if call.service == "turn_on":
+                current = "on"
+            elif call.service == "turn_off":
+                current = "off"
+            elif call.service == "set_preset_mode":
+                attributes["preset_mode"] = call.data["preset_mode"]
+            elif call.service == "set_hvac_mode":
+                current = str(call.data["hvac_mode"])
+            elif call.service == "set_temperature":
+                attributes["temperature"] = call.data["temperature"]
+
+            self.hass.states.async_set(
+                entity_id, current, attributes, context=Context()
+            )
+
+    async def _async_tick(self) -> None:
+        """Run one coordinator refresh at the current virtual time."""
+        await self.hass.async_block_till_done()
+        data = await self.coordinator._async_update_data()
+        self.ticks += 1
+
+        for room_id, room_state in data.items():
+            summary = {
+                "current_mode": room_state.get("current_mode"),
+                "current_priority": room_state.get("climate_state", {}).get(
+                    "current_priority"
+                ),
+                "windows_open": room_state.get("windows_open"),
+                "occupied": room_state.get("occupied"),
+                "pause_active": room_state.get("pause_active"),
+            }
+            if self.all_ticks or self._last_room_states.get(room_id) != summary:
+                self._last_room_states[room_id] = summary
+                self._write(
+                    {
+                        "type": "room_state",
+                        "time": self.clock.utcnow().isoformat(),
+                        "room_id": room_id,
+                        "room_name": room_state.get("room_name"),
+                        **summary,
+                    }
+                )
+
+    async def async_run(
+        self,
+        events: Iterator[HistoryEvent],
+        start: datetime | None,
+        end: datetime | None,
+    ) -> None:
+        """Replay the events."""
+        next_tick: datetime | None = None
+
+        for event in events:
+            if start and event.when < start:
+                # Before the window: only build up the initial state
+                if self.hass is not None:
+                    self._set_state(event)
+                    continue
+            if end and event.when >= end:
+                break
+
+            if self.hass is None:
+                await self._async_setup(start or event.when)
+                if start and event.when < start:
+                    self._set_state(event)
+                    continue
+
+            if next_tick is None:
+                next_tick = start or event.when
+
+            # Run every tick due before this state change
+            while next_tick < event.when:
+                await self.clock.async_advance_to(next_tick)
+                await self._async_tick()
+                next_tick += self.tick
+
+            await self.clock.async_advance_to(event.when)
+            self._set_state(event)
+            # Let the event listeners see the change before time moves on
+            await self.hass.async_block_till_done()
+            self.events += 1
+
+        if self.hass is None:
+            return
+
+        # Keep ticking until the end of the requested window
+        if end and next_tick is not None:
+            while next_tick < end:
+                await self.clock.async_advance_to(next_tick)
+                await self._async_tick()
+                next_tick += self.tick
+
+        await self.hass.async_block_till_done()
+        await self.coordinator.async_shutdown()
+        await self.hass.async_stop(force=True)
+
+    def _set_state(self, event: HistoryEvent) -> None:
+        """Apply a recorded state change (timestamped with the virtual clock)."""
+        self.hass.states.async_set(
+            event.entity_id, event.state, event.attributes, context=Context()
+        )
+
+    async def _async_setup(self, start: datetime) -> None:
+        """Create the Home Assistant core, services and coordinator."""
+        self.clock = VirtualClock(start)
+        self.started_at = start
+        self.hass = HomeAssistant(tempfile.mkdtemp(prefix="srm_replay_"))
+
+        for domain, services in SIMULATED_SERVICES.items():
+            for service in services:
+                self.hass.services.async_register(
+                    domain, service, self._async_handle_service
+                )
+
+        entry = ConfigEntry(
+            version=self.entry.get("version", 1),
+            minor_version=self.entry.get("minor_version", 1),
+            domain=DOMAIN,
+            title=self.entry.get("title", "Smart Room Manager"),
+            data=self.entry.get("data", {}),
+            source="user",
+            options=self.entry.get("options", {}),
+            entry_id=self.entry.get("entry_id"),
+        )
+        self.coordinator = SmartRoomCoordinator(self.hass, entry, clock=self.clock)
+        # Event-driven helpers react to the replayed state changes
+        await self.coordinator.async_setup()
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--history",
+        type=Path,
+        required=True,
+        help="JSONL state history or recorder database (.db)",
+    )
+    parser.add_argument(
+        "--config-entries",
+        type=Path,
+        default=DEFAULT_CONFIG_DIR / ".storage" / "core.config_entries",
+        help="core.config_entries file (or JSON export with data/options)",
+    )
+    parser.add_argument("--output", type=Path, help="Output JSONL (default: stdout)")
+    parser.add_argument("--start", help="Replay window start (ISO date/time)")
+    parser.add_argument("--end", help="Replay window end (ISO date/time)")
+    parser.add_argument("--time-zone", help="Time zone (default: from core.config)")
+    parser.add_argument(
+        "--tick",
+        type=float,
+        default=UPDATE_INTERVAL,
+        help=f"Refresh interval in virtual seconds (default: {UPDATE_INTERVAL})",
+    )
+    parser.add_argument(
+        "--no-apply-commands",
+        action="store_true",
+        help="Do not reflect service calls into the simulated entity states",
+    )
+    parser.add_argument(
+        "--all-ticks",
+        action="store_true",
+        help="Write room states at every tick, not only when they change",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Integration logs")
+    return parser.parse_args()
+
+
+def parse_bound(value: str | None) -> datetime | None:
+    """Parse a --start/--end value in the configured time zone."""
+    if not value:
+        return None
+    parsed = dt_util.parse_datetime(value)
+    if parsed is None:
+        parsed_date = dt_util.parse_date(value)
+        if parsed_date is None:
+            raise SystemExit(f"❌ Invalid date/time: {value}")
+        parsed = datetime.combine(parsed_date, datetime.min.time())
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return dt_util.as_utc(parsed)
+
+
+async def async_main(args: argparse.Namespace) -> None:
+    """Run the replay."""
+    entry = load_config_entry(args.config_entries)
+    time_zone = args.time_zone or load_time_zone(args.config_entries)
+    dt_util.set_default_time_zone(dt_util.get_time_zone(time_zone))
+
+    start = parse_bound(args.start)
+    end = parse_bound(args.end)
+
+    if args.history.suffix == ".db":
+        events = iter_recorder_history(
+            args.history, referenced_entities(entry), None, end
+        )
+    else:
+        events = iter_jsonl_history(args.history)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    replayer = Replayer(
+        entry,
+        output,
+        args.tick,
+        apply_commands=not args.no_apply_commands,
+        all_ticks=args.all_ticks,
+    )
+
+    wall_start = time.perf_counter()
+    # Home Assistant core and the integration read time through dt_util
+    with patch.object(dt_util, "utcnow", lambda: replayer.clock.utcnow()), patch.object(
+        dt_util,
+        "now",
+        lambda time_zone=None: replayer.clock.utcnow().astimezone(
+            time_zone or dt_util.DEFAULT_TIME_ZONE
+        ),
+    ):
+        await replayer.async_run(events, start, end)
+    wall = time.perf_counter() - wall_start
+
+    if args.output:
+        output.close()
+
+    if replayer.clock is None:
+        print("⚠️  No state change in the requested window", file=sys.stderr)
+        return
+
+    virtual = (replayer.clock.utcnow() - replayer.started_at).total_seconds()
+    print(
+        f"✅ Replayed {replayer.events} state changes, {replayer.ticks} ticks, "
+        f"{replayer.service_calls} service calls in {wall:.2f}s",
+        file=sys.stderr,
+    )
+    if wall > 0:
+        print(
+            f"   {replayer.ticks / wall:.0f} ticks/s"
+            + (f", {virtual / wall:.0f}x real time" if virtual > 0 else ""),
+            file=sys.stderr,
+        )
+
+
+def main() -> None:
+    """Entry point."""
+    args = parse_args()
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(levelname)s %(name)s: %(message)s",
+        stream=sys.stderr,
+    )
+    asyncio.run(async_main(args))
+
+
+if __name__ == "__main__":
+    main()